@@ -4,6 +4,8 @@ from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from app.models.address import Address
+from app.services import lead_index
+from app.services.search_cache import search_cache
 from app.schemas.address import AddressCreate, AddressUpdate
 
 
@@ -39,6 +41,11 @@ def update_address(db: Session, address_id: int, address_in: AddressUpdate):
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
+    affected_leads = lead_index.leads_for_address(db, address_id)
+    if "lat" in update_data or "long" in update_data:
+        lead_index.refresh_leads(db, affected_leads)
+    else:
+        search_cache.invalidate_leads(affected_leads)
     db.refresh(db_address)
     return db_address
 
@@ -48,6 +55,8 @@ def delete_address(db: Session, address_id: int):
     db_address = db.query(Address).filter(Address.address_id == address_id).first()
     if not db_address:
         return None
+    affected_leads = lead_index.leads_for_address(db, address_id)
     db.delete(db_address)
     db.commit()
+    lead_index.refresh_leads(db, affected_leads)
     return db_address
\ No newline at end of file
@@ -1,13 +1,25 @@
-from typing import List, Optional
+from typing import Optional
 
-from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from app import schemas
 from app.models.campaign import Campaign
-from app.models.lead import Lead
+from app.models.user import User
+from app.utils.pagination import KeysetPage, keyset_filter, keyset_page
 
 from app.models import CampaignLead
+from app.db.crud.campaign_lead import replace_campaign_leads
+
+# Everything CampaignPublic serializes, including the owner's contact and Gmail status.
+# Members are not loaded: campaigns carry counts, and get_campaign_leads pages them.
+CAMPAIGN_LOAD_OPTIONS = (
+    joinedload(Campaign.user).joinedload(User.contact),
+    joinedload(Campaign.user).joinedload(User.google_credentials),
+)
+CAMPAIGN_PAGE_KEYS = (Campaign.campaign_id,)
+CAMPAIGN_LEAD_PAGE_KEYS = (CampaignLead.lead_id,)
 
 
 def get_campaign(db: Session, campaign_id: int) -> Optional[Campaign]:
@@ -16,29 +28,66 @@ def get_campaign(db: Session, campaign_id: int) -> Optional[Campaign]:
     """
     return (
         db.query(Campaign)
-        .options(
-            joinedload(Campaign.user),
-            selectinload(Campaign.leads).joinedload(CampaignLead.lead)
-        )
+        .options(*CAMPAIGN_LOAD_OPTIONS)
         .filter(Campaign.campaign_id == campaign_id)
         .first()
     )
 
 
-def get_campaigns(db: Session, skip: int = 0, limit: int = 100) -> List[Campaign]:
+async def get_campaign_async(db: AsyncSession, campaign_id: int) -> Optional[Campaign]:
     """
-    List campaigns with pagination support.
+    Fetch a single campaign with its owner; members are paged separately.
     """
-    return (
-        db.query(Campaign)
-        .options(
-            joinedload(Campaign.user),
-            selectinload(Campaign.leads).joinedload(CampaignLead.lead)
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
+    result = await db.execute(
+        select(Campaign)
+        .options(*CAMPAIGN_LOAD_OPTIONS)
+        .where(Campaign.campaign_id == campaign_id)
     )
+    return result.unique().scalars().first()
+
+
+async def get_campaigns_async(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> KeysetPage:
+    """
+    List campaigns in id order, starting after `cursor`.
+    """
+    stmt = keyset_filter(
+        select(Campaign).options(*CAMPAIGN_LOAD_OPTIONS), CAMPAIGN_PAGE_KEYS, cursor, skip
+    )
+    result = await db.execute(stmt.limit(limit + 1))
+    return keyset_page(result.unique().scalars().all(), CAMPAIGN_PAGE_KEYS, limit)
+
+
+async def get_campaign_leads_async(
+    db: AsyncSession,
+    campaign_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    phone_contacted: Optional[bool] = None,
+    sms_contacted: Optional[bool] = None,
+    email_contacted: Optional[bool] = None,
+    cursor: Optional[str] = None,
+) -> KeysetPage:
+    """
+    A page of a campaign's memberships in lead id order, optionally filtered on the
+    contact flags.
+    """
+    stmt = (
+        select(CampaignLead)
+        .options(joinedload(CampaignLead.campaign), joinedload(CampaignLead.lead))
+        .where(CampaignLead.campaign_id == campaign_id)
+    )
+    for column, wanted in (
+        (CampaignLead.phone_contacted, phone_contacted),
+        (CampaignLead.sms_contacted, sms_contacted),
+        (CampaignLead.email_contacted, email_contacted),
+    ):
+        if wanted is not None:
+            stmt = stmt.where(column.is_(wanted))
+    stmt = keyset_filter(stmt, CAMPAIGN_LEAD_PAGE_KEYS, cursor, skip)
+    result = await db.execute(stmt.limit(limit + 1))
+    return keyset_page(result.scalars().all(), CAMPAIGN_LEAD_PAGE_KEYS, limit)
 
 
 def create_campaign(db: Session, campaign_in: schemas.CampaignCreate) -> Campaign:
@@ -47,43 +96,25 @@ def create_campaign(db: Session, campaign_in: schemas.CampaignCreate) -> Campaig
     """
 
     payload = campaign_in.model_dump()
-    lead_ids = list(dict.fromkeys(payload.pop("lead_ids", [])))
+    lead_ids = payload.pop("lead_ids", [])
 
     db_campaign = Campaign(**payload)
-
+    db.add(db_campaign)
+    db.flush()
     if lead_ids:
-        leads = db.query(Lead).filter(Lead.lead_id.in_(lead_ids)).all()
-        found_ids = {lead.lead_id for lead in leads}
-        missing = sorted(set(lead_ids) - found_ids)
-        if missing:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lead IDs not found: {missing}",
-            )
-
-        for lead in leads:
-            association = CampaignLead(
-                lead=lead
-            )
-            db_campaign.leads.append(association)
+        replace_campaign_leads(db, db_campaign.campaign_id, lead_ids)
 
-    db.add(db_campaign)
     db.commit()
-    db.refresh(db_campaign)
-    return db_campaign
+    return get_campaign(db, db_campaign.campaign_id)
 
 
 def update_campaign(db: Session, campaign_id: int, campaign_in: schemas.CampaignUpdate) -> Optional[Campaign]:
     """
-    Update mutable fields on a campaign.
+    Update mutable fields on a campaign. A new `lead_ids` replaces the membership by
+    diff: only removed and added leads are written.
     """
 
-    db_campaign = (
-        db.query(Campaign)
-        .options(selectinload(Campaign.leads))
-        .filter(Campaign.campaign_id == campaign_id)
-        .first()
-    )
+    db_campaign = db.query(Campaign).filter(Campaign.campaign_id == campaign_id).first()
     if not db_campaign:
         return None
 
@@ -94,27 +125,11 @@ def update_campaign(db: Session, campaign_id: int, campaign_in: schemas.Campaign
         setattr(db_campaign, field, value)
 
     if lead_ids is not None:
-        db_campaign.leads.clear()   # clear cascade old leads (delete from campaign_leads)
-
-        deduped_ids = list(dict.fromkeys(lead_ids))
-        if deduped_ids:
-            leads = db.query(Lead).filter(Lead.lead_id.in_(deduped_ids)).all()
-            found_ids = {lead.lead_id for lead in leads}
-            missing = sorted(set(deduped_ids) - found_ids)
-            if missing:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Lead IDs not found: {missing}",
-                )
-
-            for lead in leads:
-                association = CampaignLead(lead=lead)
-                db_campaign.leads.append(association)
+        replace_campaign_leads(db, campaign_id, lead_ids)
 
     db.add(db_campaign)
     db.commit()
-    db.refresh(db_campaign)
-    return db_campaign
+    return get_campaign(db, campaign_id)
 
 
 def delete_campaign(db: Session, campaign_id: int) -> bool:
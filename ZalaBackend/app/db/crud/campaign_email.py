@@ -1,24 +1,33 @@
 import json
+from datetime import date
 from typing import List, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from app import schemas
 from app.db.crud import campaign as campaign_crud
+from app.db.crud.campaign import CAMPAIGN_LOAD_OPTIONS
+from app.db.crud.lead import LEAD_LOAD_OPTIONS
 from app.models.campaign import Campaign
-from app.models.campaign_email import CampaignEmail
+from app.models.campaign_email import CampaignEmail, CampaignMessageDailyStats
 from app.models.campaign_lead import CampaignLead
 from app.models.lead import Lead
 from app.services.gmail import send_gmail_message
+from app.utils.pagination import KeysetPage, keyset_filter, keyset_page
 
 
-def _base_query(db: Session):
-    return db.query(CampaignEmail).options(
-        joinedload(CampaignEmail.campaign).joinedload(Campaign.user),
-        joinedload(CampaignEmail.campaign).selectinload(Campaign.leads),
-        joinedload(CampaignEmail.lead),
-    )
+# Everything CampaignEmailPublic serializes: the hydrated campaign and lead.
+MESSAGE_LOAD_OPTIONS = (
+    joinedload(CampaignEmail.campaign).options(*CAMPAIGN_LOAD_OPTIONS),
+    joinedload(CampaignEmail.lead).options(*LEAD_LOAD_OPTIONS),
+)
+
+
+# Message history pages in send order.
+MESSAGE_PAGE_KEYS = (CampaignEmail.timestamp, CampaignEmail.message_id)
 
 
 def _normalize_error_detail(detail) -> str:
@@ -32,51 +41,73 @@ def _normalize_error_detail(detail) -> str:
         return str(detail)
 
 
-def get_campaign_email(db: Session, message_id: int) -> Optional[CampaignEmail]:
-    """
-    Fetch a single campaign message.
-    """
-    return _base_query(db).filter(CampaignEmail.message_id == message_id).first()
-
-
-def get_campaign_emails(
-    db: Session, skip: int = 0, limit: int = 100
-) -> List[CampaignEmail]:
+def get_campaign_message_stats(
+    db: Session,
+    campaign_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Optional[schemas.CampaignMessageStats]:
     """
-    Fetch multiple campaign messages.
+    Daily and total message counts for a campaign between `start` and `end` (inclusive,
+    UTC days), read from the rollup table rather than the messages themselves. Archived
+    months are still counted. Returns None if the campaign does not exist.
     """
-    return _base_query(db).offset(skip).limit(limit).all()
+    if db.query(Campaign.campaign_id).filter(Campaign.campaign_id == campaign_id).first() is None:
+        return None
+    query = db.query(CampaignMessageDailyStats).filter(
+        CampaignMessageDailyStats.campaign_id == campaign_id
+    )
+    if start is not None:
+        query = query.filter(CampaignMessageDailyStats.day >= start)
+    if end is not None:
+        query = query.filter(CampaignMessageDailyStats.day <= end)
+    days = [
+        schemas.CampaignMessageDailyStats.model_validate(row)
+        for row in query.order_by(CampaignMessageDailyStats.day).all()
+        if row.total_count
+    ]
+    return schemas.CampaignMessageStats(
+        campaign_id=campaign_id,
+        total_count=sum(day.total_count for day in days),
+        sent_count=sum(day.sent_count for day in days),
+        failed_count=sum(day.failed_count for day in days),
+        days=days,
+    )
 
 
-def get_campaign_emails_for_campaign(
-    db: Session,
-    campaign_id: int,
-    skip: int = 0,
-    limit: int = 100,
-) -> List[CampaignEmail]:
+async def get_campaign_email_async(
+    db: AsyncSession, message_id: int
+) -> Optional[CampaignEmail]:
     """
-    Fetch messages for a given campaign.
+    Fetch a single campaign message with its campaign and lead.
     """
-    query = _base_query(db).filter(CampaignEmail.campaign_id == campaign_id)
-
-    return query.offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(CampaignEmail)
+        .options(*MESSAGE_LOAD_OPTIONS)
+        .where(CampaignEmail.message_id == message_id)
+    )
+    return result.unique().scalars().first()
 
 
-def get_campaign_emails_by_lead(
-    db: Session,
-    campaign_id: int,
-    lead_id: int,
+async def get_campaign_emails_async(
+    db: AsyncSession,
+    campaign_id: Optional[int] = None,
+    lead_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-) -> List[CampaignEmail]:
+    cursor: Optional[str] = None,
+) -> KeysetPage:
     """
-    Fetch emails for a given campaign and lead.
+    Page of campaign messages in send order, optionally filtered by campaign and lead.
     """
-    query = _base_query(db).filter(
-        CampaignEmail.campaign_id == campaign_id, CampaignEmail.lead_id == lead_id
-    )
-
-    return query.offset(skip).limit(limit).all()
+    stmt = select(CampaignEmail).options(*MESSAGE_LOAD_OPTIONS)
+    if campaign_id is not None:
+        stmt = stmt.where(CampaignEmail.campaign_id == campaign_id)
+    if lead_id is not None:
+        stmt = stmt.where(CampaignEmail.lead_id == lead_id)
+    stmt = keyset_filter(stmt, MESSAGE_PAGE_KEYS, cursor, skip)
+    result = await db.execute(stmt.limit(limit + 1))
+    return keyset_page(result.unique().scalars().all(), MESSAGE_PAGE_KEYS, limit)
 
 
 def create_campaign_email(
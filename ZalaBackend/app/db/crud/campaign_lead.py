@@ -1,11 +1,16 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy import ARRAY, Integer, any_, bindparam, delete, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app import schemas
+from app.models.address import Address
 from app.models.campaign import Campaign
 from app.models.campaign_lead import CampaignLead
+from app.models.property import Property
+from app.utils.distance import bounding_box, haversine_sql
 
 from app.models import Lead
 
@@ -81,4 +86,127 @@ def delete_lead_from_campaign(db: Session, campaign_id: int, lead_id: int) -> bo
 
     db.delete(db_link)
     db.commit()
-    return True
\ No newline at end of file
+    return True
+
+"""BULK MEMBERSHIP"""
+
+
+def _id_array(name: str, ids: Sequence[int]):
+    """
+    The ids as a single array parameter, so 50k ids are one bind instead of 50k.
+    """
+    return bindparam(name, list(ids), type_=ARRAY(Integer))
+
+
+def missing_lead_ids(db: Session, lead_ids: Sequence[int]) -> List[int]:
+    """
+    The given ids that have no lead, in one query.
+    SQL: SELECT unnest({lead_ids}) EXCEPT SELECT lead_id FROM leads
+    """
+    if not lead_ids:
+        return []
+    requested = select(func.unnest(_id_array("requested_ids", lead_ids)).label("lead_id")).subquery()
+    rows = db.execute(
+        select(requested.c.lead_id)
+        .outerjoin(Lead, Lead.lead_id == requested.c.lead_id)
+        .where(Lead.lead_id.is_(None))
+    )
+    return sorted({row[0] for row in rows})
+
+
+def replace_campaign_leads(db: Session, campaign_id: int, lead_ids: Sequence[int]) -> None:
+    """
+    Make `lead_ids` the campaign's exact membership by deleting and inserting only the
+    difference, so kept leads keep their contact status. Raises 404 for unknown leads.
+    Does not commit.
+    """
+    lead_ids = list(dict.fromkeys(lead_ids))
+    missing = missing_lead_ids(db, lead_ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Lead IDs not found: {missing}",
+        )
+
+    removed = delete(CampaignLead).where(CampaignLead.campaign_id == campaign_id)
+    if lead_ids:
+        removed = removed.where(CampaignLead.lead_id != func.all(_id_array("kept_ids", lead_ids)))
+    db.execute(removed)
+
+    if lead_ids:
+        added = select(
+            literal(campaign_id, Integer),
+            func.unnest(_id_array("added_ids", lead_ids)),
+        )
+        db.execute(
+            pg_insert(CampaignLead)
+            .from_select(["campaign_id", "lead_id"], added)
+            .on_conflict_do_nothing()
+        )
+
+
+def leads_within_radius(lat: float, lon: float, radius_miles: float):
+    """
+    SELECT of the ids of leads with a point (own address or a property's address)
+    within `radius_miles` of (lat, lon), the same points the spatial index searches.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_miles)
+    in_box = (
+        Address.lat.between(lat_min, lat_max),
+        Address.long.between(lon_min, lon_max),
+    )
+    points = union_all(
+        select(Lead.lead_id.label("lead_id"), Address.lat, Address.long)
+        .join(Address, Lead.address_id == Address.address_id)
+        .where(*in_box),
+        select(Property.lead_id.label("lead_id"), Address.lat, Address.long)
+        .join(Address, Property.address_id == Address.address_id)
+        .where(Property.lead_id.isnot(None), *in_box),
+    ).subquery()
+    return select(points.c.lead_id).where(
+        haversine_sql(points.c.lat, points.c.long, lat, lon) <= radius_miles
+    )
+
+
+def add_campaign_leads(
+    db: Session,
+    campaign_id: int,
+    lead_ids: Optional[Sequence[int]] = None,
+    within: Optional[Tuple[float, float, float]] = None,
+) -> Tuple[int, int]:
+    """
+    Add every lead matching all given filters (an id list, and/or (lat, lon,
+    radius_miles)) to the campaign with a single INSERT ... SELECT; leads already in it
+    are left alone. Returns (matched, added). Commits.
+    """
+    if not db.query(Campaign.campaign_id).filter(Campaign.campaign_id == campaign_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+
+    if lead_ids is None and within is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No lead filter given")
+
+    conditions = []
+    if lead_ids is not None:
+        conditions.append(Lead.lead_id == any_(_id_array("lead_ids", list(dict.fromkeys(lead_ids)))))
+    if within is not None:
+        conditions.append(Lead.lead_id.in_(leads_within_radius(*within)))
+
+    matched = select(Lead.lead_id).where(*conditions).cte("matched")
+    inserted = (
+        pg_insert(CampaignLead)
+        .from_select(
+            ["campaign_id", "lead_id"],
+            select(literal(campaign_id, Integer), matched.c.lead_id),
+        )
+        .on_conflict_do_nothing()
+        .returning(CampaignLead.lead_id)
+        .cte("inserted")
+    )
+    counts = db.execute(
+        select(
+            select(func.count()).select_from(matched).scalar_subquery(),
+            select(func.count()).select_from(inserted).scalar_subquery(),
+        )
+    ).one()
+    db.commit()
+    return counts[0], counts[1]
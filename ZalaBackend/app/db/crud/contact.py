@@ -3,9 +3,19 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 
 from app.models.contact import Contact
+from app.models.lead import Lead
+from app.services.search_cache import search_cache
+from app.utils.pagination import KeysetPage, keyset_filter, keyset_page
 from app import schemas
 
 
+def _invalidate_contact_leads(db: Session, contact_id: int) -> None:
+    """Drop cached searches that serialize this contact."""
+    search_cache.invalidate_leads(
+        [row[0] for row in db.query(Lead.lead_id).filter(Lead.contact_id == contact_id)]
+    )
+
+
 """GET FUNCTIONS"""
 
 
@@ -17,12 +27,16 @@ def get_contact_by_id(db: Session, contact_id: int) -> Optional[Contact]:
     return db.query(Contact).filter(Contact.contact_id == contact_id).first()
 
 
-def get_contacts(db: Session, skip: int = 0, limit: int = 100) -> List[Contact]:
+def get_contacts(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> KeysetPage:
     """
-    Get a list of contacts with pagination
-    SQL: SELECT * FROM contacts OFFSET {skip} LIMIT {limit}
+    Get a page of contacts in id order, starting after `cursor`
+    SQL: SELECT * FROM contacts WHERE contact_id > {cursor} ORDER BY contact_id LIMIT {limit + 1}
     """
-    return db.query(Contact).offset(skip).limit(limit).all()
+    keys = (Contact.contact_id,)
+    query = keyset_filter(db.query(Contact), keys, cursor, skip)
+    return keyset_page(query.limit(limit + 1).all(), keys, limit)
 
 
 """CREATE FUNCTION"""
@@ -99,6 +113,7 @@ def update_contact(db: Session, contact_id: int, contact_in: schemas.ContactUpda
     db_contact.phone = contact_in.phone
 
     db.commit()
+    _invalidate_contact_leads(db, contact_id)
     db.refresh(db_contact)
     return db_contact
 
@@ -115,6 +130,8 @@ def delete_contact(db: Session, contact_id: int) -> bool:
     if not db_contact:
         return False
 
+    affected_leads = [row[0] for row in db.query(Lead.lead_id).filter(Lead.contact_id == contact_id)]
     db.delete(db_contact)
     db.commit()
+    search_cache.invalidate_leads(affected_leads)
     return True
\ No newline at end of file
@@ -1,5 +1,8 @@
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload, selectinload
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.models.lead import Lead
 from app.models.property import Property
@@ -7,44 +10,95 @@ from app.models.user import User
 from app.models.address import Address
 from app.models.contact import Contact
 from app import schemas
+from app.services import lead_index
+from app.services.search_cache import search_cache
+from app.utils.pagination import KeysetPage, keyset_filter, keyset_page
 from fastapi import HTTPException, status
 
 from app.models import CampaignLead
 
+# Everything LeadPublic serializes. Async sessions cannot lazy-load, so the async
+# readers depend on this being complete.
+LEAD_LOAD_OPTIONS = (
+    selectinload(Lead.properties).joinedload(Property.address),
+    selectinload(Lead.properties).selectinload(Property.units),
+    selectinload(Lead.properties).joinedload(Property.users),
+    joinedload(Lead.created_by_user),
+    joinedload(Lead.contact),
+    joinedload(Lead.address),
+    selectinload(Lead.campaigns).joinedload(CampaignLead.campaign),
+)
+LEAD_PAGE_KEYS = (Lead.lead_id,)
+
 
 def get_lead_by_id(db: Session, lead_id: int) -> Optional[Lead]:
-    return (
-        db.query(Lead)
-        .options(
-            selectinload(Lead.properties).joinedload(Property.address),
-            selectinload(Lead.properties).selectinload(Property.units),
-            selectinload(Lead.properties).joinedload(Property.users),
-            joinedload(Lead.created_by_user),
-            joinedload(Lead.contact),
-            joinedload(Lead.address),
-            selectinload(Lead.campaigns).joinedload(CampaignLead.campaign)
-        )
-        .filter(Lead.lead_id == lead_id)
-        .first()
+    return db.query(Lead).options(*LEAD_LOAD_OPTIONS).filter(Lead.lead_id == lead_id).first()
+
+
+async def get_lead_by_id_async(db: AsyncSession, lead_id: int) -> Optional[Lead]:
+    """
+    Fetch a single lead with everything LeadPublic serializes.
+    """
+    result = await db.execute(
+        select(Lead).options(*LEAD_LOAD_OPTIONS).where(Lead.lead_id == lead_id)
     )
+    return result.unique().scalars().first()
+
 
+async def get_leads_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    lead_ids: Optional[List[int]] = None,
+    cursor: Optional[str] = None,
+) -> KeysetPage:
+    """
+    Page of fully loaded leads in id order, optionally restricted to `lead_ids`.
+    """
+    stmt = select(Lead).options(*LEAD_LOAD_OPTIONS)
+    if lead_ids:
+        stmt = stmt.where(Lead.lead_id.in_(lead_ids))
+    stmt = keyset_filter(stmt, LEAD_PAGE_KEYS, cursor, skip)
+    result = await db.execute(stmt.limit(limit + 1))
+    return keyset_page(result.unique().scalars().all(), LEAD_PAGE_KEYS, limit)
 
-def get_leads(db: Session, skip: int = 0, limit: int = 100, lead_ids: Optional[List[int]] = None) -> List[Lead]:
-    query = (
-        db.query(Lead)
-        .options(
-            selectinload(Lead.properties).joinedload(Property.address),
-            selectinload(Lead.properties).selectinload(Property.units),
-            selectinload(Lead.properties).joinedload(Property.users),
-            joinedload(Lead.created_by_user),
-            joinedload(Lead.contact),
-            joinedload(Lead.address),
-            selectinload(Lead.campaigns).joinedload(CampaignLead.campaign)
+
+async def get_lead_summaries_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    lead_ids: Optional[List[int]] = None,
+    cursor: Optional[str] = None,
+) -> KeysetPage:
+    """
+    Page of flat LeadListItem rows: one column-only SELECT with the contact and
+    address joined in, and no relationship loaders.
+    """
+    stmt = (
+        select(
+            Lead.lead_id,
+            Lead.person_type,
+            Lead.business,
+            Lead.website,
+            Lead.created_by,
+            Lead.contact_id,
+            Contact.first_name,
+            Contact.last_name,
+            Contact.email,
+            Contact.phone,
+            Lead.address_id,
+            Address.city,
+            Address.state,
+            Address.zipcode,
         )
+        .outerjoin(Contact, Lead.contact_id == Contact.contact_id)
+        .outerjoin(Address, Lead.address_id == Address.address_id)
     )
     if lead_ids:
-        query = query.filter(Lead.lead_id.in_(lead_ids))
-    return query.offset(skip).limit(limit).all()
+        stmt = stmt.where(Lead.lead_id.in_(lead_ids))
+    stmt = keyset_filter(stmt, LEAD_PAGE_KEYS, cursor, skip)
+    result = await db.execute(stmt.limit(limit + 1))
+    return keyset_page(result.all(), LEAD_PAGE_KEYS, limit)
 
 
 def create_lead(db: Session, lead_in: schemas.LeadCreate) -> Lead:
@@ -61,6 +115,135 @@ def create_lead(db: Session, lead_in: schemas.LeadCreate) -> Lead:
     return db_lead
 
 
+def _creator_contacts(db: Session, leads_in: List[schemas.LeadCompositeCreate]) -> Dict[int, Optional[int]]:
+    """
+    user_id -> contact_id of every creator named in the payload; 404 if one is missing.
+    """
+    creator_ids = {lead_in.created_by for lead_in in leads_in if lead_in.created_by is not None}
+    if not creator_ids:
+        return {}
+    creators = dict(db.query(User.user_id, User.contact_id).filter(User.user_id.in_(creator_ids)).all())
+    missing = sorted(creator_ids - creators.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User not found: {', '.join(str(user_id) for user_id in missing)}",
+        )
+    return creators
+
+
+def _check_new_contacts(db: Session, leads_in: List[schemas.LeadCompositeCreate]) -> None:
+    """
+    Same duplicate checks as create_contact, for every new contact in the payload at
+    once: against each other and against the stored contacts.
+    """
+    contacts = [lead_in.contact for lead_in in leads_in if lead_in.contact is not None]
+    emails = [contact.email for contact in contacts if contact.email]
+    phones = [contact.phone for contact in contacts if contact.phone]
+    if not emails and not phones:
+        return
+    existing = db.query(Contact.email, Contact.phone).filter(
+        or_(Contact.email.in_(emails), Contact.phone.in_(phones))
+    ).all()
+    if len(set(emails)) != len(emails) or set(emails) & {row.email for row in existing}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A contact with this email already exists."
+        )
+    if len(set(phones)) != len(phones) or set(phones) & {row.phone for row in existing}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A contact with this phone already exists."
+        )
+
+
+def _check_creator_contacts(
+    db: Session, leads_in: List[schemas.LeadCompositeCreate], creator_contacts: Dict[int, Optional[int]]
+) -> None:
+    """
+    A lead without its own contact takes its creator's, and leads.contact_id is unique:
+    each creator's contact can go to at most one such lead, and only if no stored lead
+    has it yet.
+    """
+    borrowed = [
+        creator_contacts[lead_in.created_by]
+        for lead_in in leads_in
+        if lead_in.contact is None
+        and lead_in.created_by is not None
+        and creator_contacts.get(lead_in.created_by) is not None
+    ]
+    if not borrowed:
+        return
+    if len(set(borrowed)) != len(borrowed) or db.query(Lead.lead_id).filter(
+        Lead.contact_id.in_(borrowed)
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "The creator's contact is already linked to another lead; "
+                "provide a contact for each lead."
+            ),
+        )
+
+
+def create_leads_composite(db: Session, leads_in: List[schemas.LeadCompositeCreate]) -> List[Lead]:
+    """
+    Create leads with their new contacts and addresses and link their creators, all in
+    one transaction, and return them fully loaded in payload order.
+    Inserts of each table are batched into one statement, so the statement count does
+    not grow with the number of leads.
+    """
+    creator_contacts = _creator_contacts(db, leads_in)
+    _check_new_contacts(db, leads_in)
+    _check_creator_contacts(db, leads_in, creator_contacts)
+
+    contacts = [
+        Contact(**lead_in.contact.model_dump()) if lead_in.contact is not None else None
+        for lead_in in leads_in
+    ]
+    addresses = [
+        Address(**lead_in.address.model_dump()) if lead_in.address is not None else None
+        for lead_in in leads_in
+    ]
+    try:
+        db.add_all([row for row in contacts + addresses if row is not None])
+        db.flush()
+        db_leads = []
+        for lead_in, contact, address in zip(leads_in, contacts, addresses):
+            # like link_user_to_lead: a lead without its own contact takes its creator's
+            contact_id = contact.contact_id if contact is not None else creator_contacts.get(lead_in.created_by)
+            db_leads.append(
+                Lead(
+                    person_type=lead_in.person_type,
+                    business=lead_in.business,
+                    website=lead_in.website,
+                    license_num=lead_in.license_num,
+                    notes=lead_in.notes,
+                    created_by=lead_in.created_by,
+                    contact_id=contact_id,
+                    address_id=address.address_id if address is not None else None,
+                )
+            )
+        db.add_all(db_leads)
+        db.flush()
+        lead_ids = [lead.lead_id for lead in db_leads]
+        db.commit()
+    except IntegrityError as exc:
+        # A concurrent request took an email, phone or contact after the checks above.
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create leads: a contact is already in use.",
+        ) from exc
+
+    lead_index.refresh_leads(db, lead_ids)
+    loaded = {
+        lead.lead_id: lead
+        for lead in db.query(Lead).options(*LEAD_LOAD_OPTIONS).filter(Lead.lead_id.in_(lead_ids))
+    }
+    return [loaded[lead_id] for lead_id in lead_ids]
+
+
 def update_lead(db: Session, lead_id: int, lead_in: schemas.LeadUpdate) -> Optional[Lead]:
     db_lead = db.query(Lead).filter(Lead.lead_id == lead_id).first()
     if not db_lead:
@@ -71,6 +254,7 @@ def update_lead(db: Session, lead_id: int, lead_in: schemas.LeadUpdate) -> Optio
         setattr(db_lead, k, v)
 
     db.commit()
+    search_cache.invalidate_leads([lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -85,6 +269,8 @@ def delete_lead(db: Session, lead_id: int) -> bool:
         db.add(prop)
     db.delete(db_lead)
     db.commit()
+    lead_index.lead_index.remove_lead(lead_id)
+    search_cache.invalidate_leads([lead_id])
     return True
 
 
@@ -95,9 +281,11 @@ def link_property_to_lead(db: Session, lead_id: int, property_id: int) -> Option
     prop = db.query(Property).filter(Property.property_id == property_id).first()
     if not prop:
         return None
+    previous_lead_id = prop.lead_id
     prop.lead_id = lead_id
     db.add(prop)
     db.commit()
+    lead_index.refresh_leads(db, [lead_id, previous_lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -114,6 +302,7 @@ def unlink_property_from_lead(db: Session, lead_id: int, property_id: int) -> Op
     prop.lead_id = None
     db.add(prop)
     db.commit()
+    lead_index.refresh_leads(db, [lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -136,6 +325,7 @@ def link_user_to_lead(db: Session, lead_id: int, user_id: int) -> Optional[Lead]
         db_lead.contact_id = contact_id
     db.add(db_lead)
     db.commit()
+    search_cache.invalidate_leads([lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -151,6 +341,7 @@ def unlink_user_from_lead(db: Session, lead_id: int, user_id: int) -> Optional[L
     db_lead.contact_id = None
     db.add(db_lead)
     db.commit()
+    search_cache.invalidate_leads([lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -169,6 +360,7 @@ def link_contact_to_lead(db: Session, lead_id: int, contact_id: int) -> Optional
     db_lead.contact_id = contact_id
     db.add(db_lead)
     db.commit()
+    search_cache.invalidate_leads([lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -182,6 +374,7 @@ def unlink_contact_from_lead(db: Session, lead_id: int, contact_id: int) -> Opti
     db_lead.contact_id = None
     db.add(db_lead)
     db.commit()
+    search_cache.invalidate_leads([lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -200,6 +393,7 @@ def link_address_to_lead(db: Session, lead_id: int, address_id: int) -> Optional
     db_lead.address_id = address_id
     db.add(db_lead)
     db.commit()
+    lead_index.refresh_leads(db, [lead_id])
     db.refresh(db_lead)
     return db_lead
 
@@ -213,5 +407,6 @@ def unlink_address_from_lead(db: Session, lead_id: int, address_id: int) -> Opti
     db_lead.address_id = None
     db.add(db_lead)
     db.commit()
+    lead_index.refresh_leads(db, [lead_id])
     db.refresh(db_lead)
     return db_lead
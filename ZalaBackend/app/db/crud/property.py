@@ -6,6 +6,8 @@ from fastapi import HTTPException, status
 
 from app.models.property import Property
 from app.models.address import Address
+from app.services import lead_index
+from app.services.search_cache import search_cache
 from app.schemas.property import PropertyCreate, PropertyUpdate
 
 
@@ -60,6 +62,7 @@ def update_property(db: Session, address_id: int, property_id: int, property_in:
         return None
 
     # Address association is managed by the path; do not change address_id here
+    previous_lead_id = db_property.lead_id
 
     if property_in.property_name is not None:
         db_property.property_name = property_in.property_name
@@ -76,6 +79,10 @@ def update_property(db: Session, address_id: int, property_id: int, property_in:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
 
+    if db_property.lead_id != previous_lead_id:
+        lead_index.refresh_leads(db, [previous_lead_id, db_property.lead_id])
+    else:
+        search_cache.invalidate_leads([db_property.lead_id])
     db.refresh(db_property)
     return db_property
 
@@ -85,6 +92,8 @@ def delete_property(db: Session, address_id: int, property_id: int):
     db_property = db.query(Property).filter(Property.property_id == property_id, Property.address_id == address_id).first()
     if not db_property:
         return None
+    lead_id = db_property.lead_id
     db.delete(db_property)
     db.commit()
+    lead_index.refresh_leads(db, [lead_id])
     return db_property
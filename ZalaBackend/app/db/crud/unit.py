@@ -6,9 +6,16 @@ from fastapi import HTTPException, status
 
 from app.models.unit import Unit
 from app.models.property import Property
+from app.services.search_cache import search_cache
 from app.schemas.unit import UnitCreate, UnitUpdate
 
 
+def _invalidate_property_lead(db: Session, property_id: int) -> None:
+    """Drop cached searches that serialize this property's units."""
+    lead_id = db.query(Property.lead_id).filter(Property.property_id == property_id).scalar()
+    search_cache.invalidate_leads([lead_id])
+
+
 def create_unit(db: Session, unit_in: UnitCreate, property_id: int) -> Unit:
     """Create a unit for a specific property (property_id is authoritative).
 
@@ -34,6 +41,7 @@ def create_unit(db: Session, unit_in: UnitCreate, property_id: int) -> Unit:
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
+    search_cache.invalidate_leads([prop.lead_id])
     db.refresh(db_unit)
     return db_unit
 
@@ -65,6 +73,7 @@ def update_unit(db: Session, property_id: int, unit_id: int, unit_in: UnitUpdate
         setattr(db_unit, key, value)
 
     db.commit()
+    _invalidate_property_lead(db, property_id)
     db.refresh(db_unit)
     return db_unit
 
@@ -75,4 +84,5 @@ def delete_unit(db: Session, property_id: int, unit_id: int) -> Optional[Unit]:
         return None
     db.delete(db_unit)
     db.commit()
+    _invalidate_property_lead(db, property_id)
     return db_unit
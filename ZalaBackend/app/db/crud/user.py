@@ -13,6 +13,7 @@ from app import schemas
 
 from app.models.user_authentication import UserAuthentication
 from app.utils import security
+from app.utils.pagination import KeysetPage, keyset_filter, keyset_page
 from app.db.crud import contact as contact_crud
 
 """GET FUNCTIONS"""
@@ -69,22 +70,21 @@ def get_user_by_username(db: Session, username: str):
     )
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> KeysetPage:
     """
-    Get a list of users with limits
-    SELECT * FROM users OFFSET {skip} LIMIT {limit};
+    Get a page of users in id order, starting after `cursor`
+    SELECT * FROM users WHERE user_id > {cursor} ORDER BY user_id LIMIT {limit + 1};
     """
-    return (
-        db.query(User)
-        .options(
-            joinedload(User.contact),
-            joinedload(User.google_credentials),
-            joinedload(User.authentication),
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
+    keys = (User.user_id,)
+    query = db.query(User).options(
+        joinedload(User.contact),
+        joinedload(User.google_credentials),
+        joinedload(User.authentication),
     )
+    query = keyset_filter(query, keys, cursor, skip)
+    return keyset_page(query.limit(limit + 1).all(), keys, limit)
 
 
 def get_users_by_ids(db: Session, user_ids: Sequence[int]) -> List[User]:
@@ -0,0 +1,155 @@
+-- Baseline: the schema as created by Base.metadata.create_all before versioned
+-- migrations existed. Every statement is idempotent so databases created by the old
+-- init_db are adopted without changes.
+
+CREATE TABLE IF NOT EXISTS addresses (
+    address_id SERIAL NOT NULL,
+    street_1 VARCHAR NOT NULL,
+    street_2 VARCHAR,
+    city VARCHAR NOT NULL,
+    state VARCHAR NOT NULL,
+    zipcode VARCHAR(10) NOT NULL,
+    lat NUMERIC(9, 6),
+    long NUMERIC(9, 6),
+    PRIMARY KEY (address_id)
+);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    contact_id SERIAL NOT NULL,
+    first_name VARCHAR NOT NULL,
+    last_name VARCHAR,
+    email VARCHAR(255),
+    phone VARCHAR(20),
+    PRIMARY KEY (contact_id),
+    CONSTRAINT uq_contact_email UNIQUE (email),
+    CONSTRAINT uq_contact_phone UNIQUE (phone)
+);
+
+CREATE INDEX IF NOT EXISTS ix_contacts_contact_id ON contacts (contact_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_contacts_email ON contacts (email);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_contacts_phone ON contacts (phone);
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id SERIAL NOT NULL,
+    contact_id INTEGER,
+    username VARCHAR(15) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    profile_pic VARCHAR,
+    xp INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (user_id),
+    UNIQUE (contact_id),
+    FOREIGN KEY(contact_id) REFERENCES contacts (contact_id),
+    UNIQUE (username)
+);
+
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id SERIAL NOT NULL,
+    campaign_name VARCHAR NOT NULL,
+    user_id INTEGER,
+    PRIMARY KEY (campaign_id),
+    FOREIGN KEY(user_id) REFERENCES users (user_id)
+);
+
+CREATE TABLE IF NOT EXISTS leads (
+    lead_id SERIAL NOT NULL,
+    created_by INTEGER,
+    contact_id INTEGER,
+    address_id INTEGER,
+    person_type VARCHAR,
+    business VARCHAR,
+    website VARCHAR,
+    license_num VARCHAR,
+    notes VARCHAR,
+    PRIMARY KEY (lead_id),
+    FOREIGN KEY(created_by) REFERENCES users (user_id) ON DELETE SET NULL,
+    UNIQUE (contact_id),
+    FOREIGN KEY(contact_id) REFERENCES contacts (contact_id),
+    UNIQUE (address_id),
+    FOREIGN KEY(address_id) REFERENCES addresses (address_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_authentication (
+    user_id INTEGER NOT NULL,
+    password_hash VARCHAR,
+    auth_provider VARCHAR(50) NOT NULL,
+    provider_subject VARCHAR(255),
+    provider_email VARCHAR(255),
+    PRIMARY KEY (user_id),
+    FOREIGN KEY(user_id) REFERENCES users (user_id),
+    UNIQUE (provider_subject)
+);
+
+CREATE TABLE IF NOT EXISTS user_google_credentials (
+    user_id INTEGER NOT NULL,
+    access_token_encrypted VARCHAR,
+    refresh_token_encrypted VARCHAR,
+    token_expiry TIMESTAMP WITH TIME ZONE,
+    scope TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    PRIMARY KEY (user_id),
+    FOREIGN KEY(user_id) REFERENCES users (user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS campaign_leads (
+    campaign_id INTEGER NOT NULL,
+    lead_id INTEGER NOT NULL,
+    phone_contacted BOOLEAN NOT NULL,
+    sms_contacted BOOLEAN NOT NULL,
+    email_contacted BOOLEAN NOT NULL,
+    PRIMARY KEY (campaign_id, lead_id),
+    FOREIGN KEY(campaign_id) REFERENCES campaigns (campaign_id),
+    FOREIGN KEY(lead_id) REFERENCES leads (lead_id)
+);
+
+CREATE TABLE IF NOT EXISTS campaign_messages (
+    message_id SERIAL NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    lead_id INTEGER,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    message_subject VARCHAR NOT NULL,
+    message_body VARCHAR NOT NULL,
+    from_name VARCHAR(128),
+    to_email VARCHAR(320),
+    gmail_message_id VARCHAR(255),
+    gmail_thread_id VARCHAR(255),
+    send_status VARCHAR(16) NOT NULL,
+    error_detail TEXT,
+    PRIMARY KEY (message_id),
+    FOREIGN KEY(campaign_id) REFERENCES campaigns (campaign_id),
+    FOREIGN KEY(lead_id) REFERENCES leads (lead_id)
+);
+
+CREATE TABLE IF NOT EXISTS properties (
+    property_id SERIAL NOT NULL,
+    property_name VARCHAR NOT NULL,
+    address_id INTEGER NOT NULL,
+    mls_number VARCHAR,
+    lead_id INTEGER,
+    notes VARCHAR,
+    PRIMARY KEY (property_id),
+    UNIQUE (address_id),
+    FOREIGN KEY(address_id) REFERENCES addresses (address_id),
+    FOREIGN KEY(lead_id) REFERENCES leads (lead_id)
+);
+
+CREATE TABLE IF NOT EXISTS units (
+    unit_id SERIAL NOT NULL,
+    property_id INTEGER NOT NULL,
+    apt_num VARCHAR,
+    bedrooms INTEGER,
+    bath NUMERIC(3, 1),
+    sqft INTEGER,
+    notes VARCHAR,
+    PRIMARY KEY (unit_id),
+    FOREIGN KEY(property_id) REFERENCES properties (property_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_properties (
+    user_id INTEGER NOT NULL,
+    property_id INTEGER NOT NULL,
+    PRIMARY KEY (user_id, property_id),
+    FOREIGN KEY(user_id) REFERENCES users (user_id),
+    FOREIGN KEY(property_id) REFERENCES properties (property_id)
+);
@@ -0,0 +1,10 @@
+-- Normalized contact keys for dedupe lookups. Postgres computes stored generated
+-- columns for every existing row while adding them.
+
+ALTER TABLE contacts ADD COLUMN IF NOT EXISTS email_normalized VARCHAR(255)
+    GENERATED ALWAYS AS (lower(email)) STORED;
+ALTER TABLE contacts ADD COLUMN IF NOT EXISTS phone_digits VARCHAR(20)
+    GENERATED ALWAYS AS (regexp_replace(phone, '\D', '', 'g')) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_contacts_email_normalized ON contacts (email_normalized);
+CREATE INDEX IF NOT EXISTS ix_contacts_phone_digits ON contacts (phone_digits);
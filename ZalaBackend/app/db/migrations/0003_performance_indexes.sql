@@ -0,0 +1,16 @@
+-- migrate: no-transaction
+-- Secondary indexes for the columns search, lead hydration and campaign views filter
+-- on. Built CONCURRENTLY so existing tables stay writable while they are created.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_addresses_lat_long ON addresses (lat, long);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_properties_lead_id ON properties (lead_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_leads_created_by ON leads (created_by);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaign_leads_lead_id ON campaign_leads (lead_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaign_messages_campaign_id_lead_id
+    ON campaign_messages (campaign_id, lead_id);
+
+ANALYZE addresses;
+ANALYZE properties;
+ANALYZE leads;
+ANALYZE campaign_leads;
+ANALYZE campaign_messages;
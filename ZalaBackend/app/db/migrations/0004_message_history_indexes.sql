@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- Campaign message listings page by (timestamp, message_id); these indexes let a
+-- deep page start directly at its cursor instead of sorting the whole history.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaign_messages_timestamp_message_id
+    ON campaign_messages (timestamp, message_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaign_messages_campaign_id_timestamp
+    ON campaign_messages (campaign_id, timestamp, message_id);
@@ -0,0 +1,129 @@
+-- Range-partition campaign_messages by month on timestamp, and keep per-campaign daily
+-- send counts in campaign_message_daily_stats so analytics never scan the raw messages.
+--
+-- Partitions are named campaign_messages_YYYY_MM and cover whole UTC months; rows outside
+-- every monthly partition land in campaign_messages_default. app.db.partitions creates
+-- future months and archives old ones (scripts/maintain_campaign_messages.py).
+-- The primary key must include the partition key, so it becomes (message_id, timestamp);
+-- message_id still comes from the same sequence and stays unique in practice.
+
+ALTER TABLE campaign_messages RENAME TO campaign_messages_unpartitioned;
+ALTER TABLE campaign_messages_unpartitioned DROP CONSTRAINT campaign_messages_pkey;
+DROP INDEX IF EXISTS ix_campaign_messages_campaign_id_lead_id;
+DROP INDEX IF EXISTS ix_campaign_messages_timestamp_message_id;
+DROP INDEX IF EXISTS ix_campaign_messages_campaign_id_timestamp;
+ALTER SEQUENCE campaign_messages_message_id_seq OWNED BY NONE;
+
+CREATE TABLE campaign_messages (
+    message_id INTEGER DEFAULT nextval('campaign_messages_message_id_seq') NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    lead_id INTEGER,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    message_subject VARCHAR NOT NULL,
+    message_body VARCHAR NOT NULL,
+    from_name VARCHAR(128),
+    to_email VARCHAR(320),
+    gmail_message_id VARCHAR(255),
+    gmail_thread_id VARCHAR(255),
+    send_status VARCHAR(16) NOT NULL,
+    error_detail TEXT,
+    PRIMARY KEY (message_id, timestamp),
+    FOREIGN KEY(campaign_id) REFERENCES campaigns (campaign_id),
+    FOREIGN KEY(lead_id) REFERENCES leads (lead_id)
+) PARTITION BY RANGE (timestamp);
+
+ALTER SEQUENCE campaign_messages_message_id_seq OWNED BY campaign_messages.message_id;
+
+CREATE TABLE campaign_messages_default PARTITION OF campaign_messages DEFAULT;
+
+-- One partition per month from the oldest message through three months ahead.
+DO $$
+DECLARE
+    month_start TIMESTAMP := date_trunc(
+        'month',
+        COALESCE((SELECT min(timestamp) FROM campaign_messages_unpartitioned), now()) AT TIME ZONE 'UTC'
+    );
+    last_month TIMESTAMP := date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '3 months';
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE 'CREATE TABLE ' || quote_ident('campaign_messages_' || to_char(month_start, 'YYYY_MM'))
+            || ' PARTITION OF campaign_messages FOR VALUES FROM ('
+            || quote_literal(to_char(month_start, 'YYYY-MM-DD') || ' 00:00:00+00') || ') TO ('
+            || quote_literal(to_char(month_start + INTERVAL '1 month', 'YYYY-MM-DD') || ' 00:00:00+00') || ')';
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO campaign_messages (
+    message_id, campaign_id, lead_id, timestamp, message_subject, message_body, from_name,
+    to_email, gmail_message_id, gmail_thread_id, send_status, error_detail
+)
+SELECT
+    message_id, campaign_id, lead_id, timestamp, message_subject, message_body, from_name,
+    to_email, gmail_message_id, gmail_thread_id, send_status, error_detail
+FROM campaign_messages_unpartitioned;
+
+DROP TABLE campaign_messages_unpartitioned;
+
+CREATE INDEX ix_campaign_messages_campaign_id_lead_id ON campaign_messages (campaign_id, lead_id);
+CREATE INDEX ix_campaign_messages_timestamp_message_id ON campaign_messages (timestamp, message_id);
+CREATE INDEX ix_campaign_messages_campaign_id_timestamp ON campaign_messages (campaign_id, timestamp, message_id);
+
+-- Daily rollups, kept current by a trigger. Archiving a partition detaches it without
+-- firing the trigger, so the counts of archived months are preserved.
+CREATE TABLE campaign_message_daily_stats (
+    campaign_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    total_count INTEGER DEFAULT 0 NOT NULL,
+    sent_count INTEGER DEFAULT 0 NOT NULL,
+    failed_count INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (campaign_id, day),
+    FOREIGN KEY(campaign_id) REFERENCES campaigns (campaign_id) ON DELETE CASCADE
+);
+
+INSERT INTO campaign_message_daily_stats (campaign_id, day, total_count, sent_count, failed_count)
+SELECT
+    campaign_id,
+    (timestamp AT TIME ZONE 'UTC')::date,
+    count(*),
+    count(*) FILTER (WHERE send_status = 'sent'),
+    count(*) FILTER (WHERE send_status = 'failed')
+FROM campaign_messages
+GROUP BY 1, 2;
+
+CREATE FUNCTION campaign_message_stats_add(
+    stat_campaign_id INTEGER, stat_day DATE, stat_status VARCHAR, delta INTEGER
+) RETURNS void AS $$
+    INSERT INTO campaign_message_daily_stats AS stats (campaign_id, day, total_count, sent_count, failed_count)
+    VALUES (
+        stat_campaign_id,
+        stat_day,
+        delta,
+        CASE WHEN stat_status = 'sent' THEN delta ELSE 0 END,
+        CASE WHEN stat_status = 'failed' THEN delta ELSE 0 END
+    )
+    ON CONFLICT (campaign_id, day) DO UPDATE SET
+        total_count = stats.total_count + EXCLUDED.total_count,
+        sent_count = stats.sent_count + EXCLUDED.sent_count,
+        failed_count = stats.failed_count + EXCLUDED.failed_count;
+$$ LANGUAGE sql;
+
+CREATE FUNCTION campaign_messages_track_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM campaign_message_stats_add(
+            OLD.campaign_id, (OLD.timestamp AT TIME ZONE 'UTC')::date, OLD.send_status, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM campaign_message_stats_add(
+            NEW.campaign_id, (NEW.timestamp AT TIME ZONE 'UTC')::date, NEW.send_status, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER campaign_messages_track_stats
+    AFTER INSERT OR DELETE OR UPDATE OF campaign_id, timestamp, send_status ON campaign_messages
+    FOR EACH ROW EXECUTE FUNCTION campaign_messages_track_stats();
@@ -0,0 +1,88 @@
+-- Membership counts on campaigns, so campaign responses carry totals instead of every
+-- campaign_leads row. Statement-level triggers with transition tables keep them current:
+-- a bulk INSERT ... SELECT of 50k leads updates the campaign row once, not 50k times.
+
+ALTER TABLE campaigns
+    ADD COLUMN lead_count INTEGER DEFAULT 0 NOT NULL,
+    ADD COLUMN contacted_count INTEGER DEFAULT 0 NOT NULL,
+    ADD COLUMN email_contacted_count INTEGER DEFAULT 0 NOT NULL,
+    ADD COLUMN phone_contacted_count INTEGER DEFAULT 0 NOT NULL,
+    ADD COLUMN sms_contacted_count INTEGER DEFAULT 0 NOT NULL;
+
+UPDATE campaigns SET
+    lead_count = counts.lead_count,
+    contacted_count = counts.contacted_count,
+    email_contacted_count = counts.email_contacted_count,
+    phone_contacted_count = counts.phone_contacted_count,
+    sms_contacted_count = counts.sms_contacted_count
+FROM (
+    SELECT
+        campaign_id,
+        count(*) AS lead_count,
+        count(*) FILTER (WHERE email_contacted OR phone_contacted OR sms_contacted) AS contacted_count,
+        count(*) FILTER (WHERE email_contacted) AS email_contacted_count,
+        count(*) FILTER (WHERE phone_contacted) AS phone_contacted_count,
+        count(*) FILTER (WHERE sms_contacted) AS sms_contacted_count
+    FROM campaign_leads
+    GROUP BY campaign_id
+) AS counts
+WHERE campaigns.campaign_id = counts.campaign_id;
+
+CREATE FUNCTION campaign_leads_track_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE campaigns SET
+            lead_count = campaigns.lead_count - changes.lead_count,
+            contacted_count = campaigns.contacted_count - changes.contacted_count,
+            email_contacted_count = campaigns.email_contacted_count - changes.email_contacted_count,
+            phone_contacted_count = campaigns.phone_contacted_count - changes.phone_contacted_count,
+            sms_contacted_count = campaigns.sms_contacted_count - changes.sms_contacted_count
+        FROM (
+            SELECT
+                campaign_id,
+                count(*) AS lead_count,
+                count(*) FILTER (WHERE email_contacted OR phone_contacted OR sms_contacted) AS contacted_count,
+                count(*) FILTER (WHERE email_contacted) AS email_contacted_count,
+                count(*) FILTER (WHERE phone_contacted) AS phone_contacted_count,
+                count(*) FILTER (WHERE sms_contacted) AS sms_contacted_count
+            FROM old_rows
+            GROUP BY campaign_id
+        ) AS changes
+        WHERE campaigns.campaign_id = changes.campaign_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE campaigns SET
+            lead_count = campaigns.lead_count + changes.lead_count,
+            contacted_count = campaigns.contacted_count + changes.contacted_count,
+            email_contacted_count = campaigns.email_contacted_count + changes.email_contacted_count,
+            phone_contacted_count = campaigns.phone_contacted_count + changes.phone_contacted_count,
+            sms_contacted_count = campaigns.sms_contacted_count + changes.sms_contacted_count
+        FROM (
+            SELECT
+                campaign_id,
+                count(*) AS lead_count,
+                count(*) FILTER (WHERE email_contacted OR phone_contacted OR sms_contacted) AS contacted_count,
+                count(*) FILTER (WHERE email_contacted) AS email_contacted_count,
+                count(*) FILTER (WHERE phone_contacted) AS phone_contacted_count,
+                count(*) FILTER (WHERE sms_contacted) AS sms_contacted_count
+            FROM new_rows
+            GROUP BY campaign_id
+        ) AS changes
+        WHERE campaigns.campaign_id = changes.campaign_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER campaign_leads_count_inserts
+    AFTER INSERT ON campaign_leads REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION campaign_leads_track_counts();
+
+CREATE TRIGGER campaign_leads_count_updates
+    AFTER UPDATE ON campaign_leads REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION campaign_leads_track_counts();
+
+CREATE TRIGGER campaign_leads_count_deletes
+    AFTER DELETE ON campaign_leads REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION campaign_leads_track_counts();
+
@@ -0,0 +1,134 @@
+"""
+Versioned, forward-only schema migrations.
+
+Migrations are the numbered `NNNN_name.sql` files in this directory. Each one is
+applied once, in order, inside its own transaction and recorded in
+`schema_migrations`. A file whose first line is `-- migrate: no-transaction` is run
+statement by statement in autocommit mode instead, which `CREATE INDEX CONCURRENTLY`
+requires; such files must be idempotent (`IF NOT EXISTS`) so a partial run can be
+retried. Migrations never drop or rewrite data.
+"""
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+# Arbitrary constant shared by every process that runs migrations.
+_ADVISORY_LOCK_KEY = 7_305_112_019
+
+_FILENAME_RE = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def label(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+
+def discover_migrations() -> List[Migration]:
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if match is None:
+            raise ValueError(f"Unexpected migration file name: {path.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Duplicate migration version numbers")
+    return migrations
+
+
+def _split_statements(sql: str) -> List[str]:
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def _ensure_version_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL DEFAULT now())"
+        )
+    )
+
+
+def applied_versions(connection: Connection) -> Set[int]:
+    _ensure_version_table(connection)
+    return set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name},
+    )
+
+
+def _apply(engine: Engine, migration: Migration) -> None:
+    # Index builds and backfills may legitimately outlast DB_STATEMENT_TIMEOUT_MS.
+    if migration.transactional:
+        with engine.begin() as connection:
+            connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+            connection.exec_driver_sql(migration.sql)
+            _record(connection, migration)
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("SET statement_timeout = 0")
+        try:
+            for statement in _split_statements(migration.sql):
+                connection.exec_driver_sql(statement)
+            _record(connection, migration)
+        finally:
+            connection.exec_driver_sql("RESET statement_timeout")
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+    return [migration for migration in discover_migrations() if migration.version not in applied]
+
+
+def migrate(engine: Engine) -> List[Migration]:
+    """
+    Apply every pending migration in version order and return the ones applied.
+    A session-level advisory lock keeps concurrent deploys from racing each other.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_connection:
+        # Waiting behind another deploy's migrations must not trip the statement timeout.
+        lock_connection.exec_driver_sql("SET statement_timeout = 0")
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        try:
+            applied = []
+            for migration in pending_migrations(engine):
+                print(f"Applying migration {migration.label}...")
+                _apply(engine, migration)
+                applied.append(migration)
+            if not applied:
+                print("Database schema is up to date.")
+            return applied
+        finally:
+            lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            )
+            lock_connection.exec_driver_sql("RESET statement_timeout")
@@ -0,0 +1,184 @@
+"""
+Maintenance of the monthly `campaign_messages` partitions.
+
+`ensure_message_partitions` creates the partitions for the coming months; rows that were
+already written to `campaign_messages_default` for such a month are moved into the new
+partition first, since Postgres refuses to attach a range the default partition holds
+rows for. `archive_message_partitions` moves whole months older than the retention
+window out of the live table into the `campaign_messages_archive` schema, where they stay
+queryable as plain tables but no longer slow down message listings. The daily rollups in
+`campaign_message_daily_stats` are unaffected by archiving.
+
+Every uvicorn worker runs `ensure_message_partitions` at startup, so each maintenance
+transaction first takes a transaction-level advisory lock and only then reads which
+partitions exist.
+"""
+import os
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+PARENT_TABLE = "campaign_messages"
+DEFAULT_PARTITION = "campaign_messages_default"
+ARCHIVE_SCHEMA = "campaign_messages_archive"
+
+MONTHS_AHEAD = int(os.getenv("MESSAGE_PARTITION_MONTHS_AHEAD", "3"))
+RETENTION_MONTHS = int(os.getenv("MESSAGE_RETENTION_MONTHS", "12"))
+# Optional tablespace on cheaper storage for archived months.
+ARCHIVE_TABLESPACE = os.getenv("MESSAGE_ARCHIVE_TABLESPACE") or None
+
+# Distinct from the migrations lock so partition upkeep never waits behind a deploy.
+_ADVISORY_LOCK_KEY = 7_305_112_020
+
+_PARTITION_RE = re.compile(r"^campaign_messages_(\d{4})_(\d{2})$")
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    return f"{month:%Y-%m-%d} 00:00:00+00"
+
+
+def _lock_partitions(connection: Connection) -> None:
+    """
+    Serialize partition maintenance across workers until the transaction ends.
+    """
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+
+def _current_month(connection: Connection) -> date:
+    return connection.execute(
+        text("SELECT date_trunc('month', now() AT TIME ZONE 'UTC')::date")
+    ).scalar()
+
+
+def monthly_partitions(connection: Connection) -> List[Tuple[date, str]]:
+    """
+    (month, table name) of every monthly partition attached to campaign_messages.
+    """
+    names = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions.append((date(int(match.group(1)), int(match.group(2)), 1), name))
+    return sorted(partitions)
+
+
+def _create_partition(connection: Connection, month: date) -> None:
+    name = _partition_name(month)
+    start, end = _bound(month), _bound(_add_months(month, 1))
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    in_range = f"\"timestamp\" >= '{start}' AND \"timestamp\" < '{end}'"
+    stranded = connection.exec_driver_sql(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"
+    ).scalar()
+    if not stranded:
+        connection.exec_driver_sql(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}")
+        return
+
+    # Move the month's rows out of the default partition, then attach the filled table.
+    # The DELETE fires the rollup trigger, so the moved rows are counted back in after.
+    connection.exec_driver_sql(
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    connection.exec_driver_sql(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}")
+    connection.exec_driver_sql(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}")
+    connection.exec_driver_sql(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {bounds}")
+    connection.exec_driver_sql(
+        "SELECT campaign_message_stats_add(campaign_id, day, send_status, count(*)::integer) "
+        f"FROM (SELECT campaign_id, (\"timestamp\" AT TIME ZONE 'UTC')::date AS day, send_status "
+        f"FROM {name}) AS moved GROUP BY campaign_id, day, send_status"
+    )
+
+
+def ensure_message_partitions(engine: Engine, months_ahead: int = MONTHS_AHEAD) -> List[str]:
+    """
+    Create any missing monthly partitions from the current month through `months_ahead`
+    months ahead, and return the names created.
+    """
+    created = []
+    with engine.begin() as connection:
+        connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+        # Read the partitions only once the lock is held; another worker may have just
+        # created them.
+        _lock_partitions(connection)
+        current = _current_month(connection)
+        existing = {month for month, _ in monthly_partitions(connection)}
+        for offset in range(months_ahead + 1):
+            month = _add_months(current, offset)
+            if month not in existing:
+                _create_partition(connection, month)
+                created.append(_partition_name(month))
+    for name in created:
+        print(f"Created message partition {name}")
+    return created
+
+
+def archive_message_partitions(
+    engine: Engine,
+    retention_months: int = RETENTION_MONTHS,
+    tablespace: Optional[str] = ARCHIVE_TABLESPACE,
+) -> List[str]:
+    """
+    Detach every monthly partition that ended more than `retention_months` months ago and
+    move it to the archive schema; return the archived table names.
+    """
+    with engine.begin() as connection:
+        cutoff = _add_months(_current_month(connection), -retention_months)
+        expired = [name for month, name in monthly_partitions(connection) if month < cutoff]
+
+    archived = []
+    for name in expired:
+        # One transaction per month keeps each ACCESS EXCLUSIVE lock short.
+        with engine.begin() as connection:
+            connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+            _lock_partitions(connection)
+            if name not in {attached for _, attached in monthly_partitions(connection)}:
+                continue
+            connection.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}")
+            connection.exec_driver_sql(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+            # Archived rows must not block deleting the campaigns and leads they refer to.
+            foreign_keys = connection.execute(
+                text(
+                    "SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+                ),
+                {"table": name},
+            ).scalars().all()
+            for constraint in foreign_keys:
+                connection.exec_driver_sql(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"')
+            connection.exec_driver_sql(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}")
+            if tablespace:
+                connection.exec_driver_sql(
+                    f'ALTER TABLE {ARCHIVE_SCHEMA}.{name} SET TABLESPACE "{tablespace}"'
+                )
+        archived.append(f"{ARCHIVE_SCHEMA}.{name}")
+        print(f"Archived message partition {name} to {ARCHIVE_SCHEMA}")
+    return archived
+
+
+def maintain_message_partitions(engine: Engine) -> None:
+    """
+    Create the upcoming partitions and archive the expired ones.
+    """
+    ensure_message_partitions(engine)
+    archive_message_partitions(engine)
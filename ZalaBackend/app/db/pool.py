@@ -0,0 +1,116 @@
+"""
+Connection pool that records how long callers wait to check out a connection.
+
+Waits are bucketed into a fixed histogram so the pool can be sized against the number
+of uvicorn workers and provider threads: a pool that is too small shows up as checkouts
+landing in the higher buckets (or timing out) while `checked_out` sits at the limit.
+"""
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds, in milliseconds, of the checkout wait buckets; the last bucket is open.
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class WaitHistogram:
+    """
+    Thread-safe fixed-bucket histogram of wait times.
+    """
+
+    def __init__(self, bounds_ms: List[float] = WAIT_BUCKETS_MS):
+        self.bounds_ms = list(bounds_ms)
+        self._counts = [0] * (len(self.bounds_ms) + 1)
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = Lock()
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.bounds_ms, wait_ms)] += 1
+            self._total_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            total_ms = self._total_ms
+            max_ms = self._max_ms
+        observed = sum(counts)
+        labels = [f"le_{bound:g}ms" for bound in self.bounds_ms]
+        labels.append(f"gt_{self.bounds_ms[-1]:g}ms")
+        return {
+            "count": observed,
+            "mean_ms": round(total_ms / observed, 3) if observed else None,
+            "max_ms": round(max_ms, 3),
+            "buckets": dict(zip(labels, counts)),
+        }
+
+
+class _CheckoutMetricsMixin:
+    """
+    Times every checkout of a queue pool and counts timeouts and peak usage.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_metrics()
+
+    def _init_metrics(self) -> None:
+        self.checkout_waits = WaitHistogram()
+        self._metrics_lock = Lock()
+        self._counters = {"checkouts": 0, "timeouts": 0, "invalidations": 0, "peak_checked_out": 0}
+        event.listen(self, "invalidate", self._on_invalidate)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._metrics_lock:
+            self._counters["invalidations"] += 1
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_waits.observe((time.perf_counter() - started) * 1000)
+            with self._metrics_lock:
+                self._counters["timeouts"] += 1
+            raise
+        self.checkout_waits.observe((time.perf_counter() - started) * 1000)
+        with self._metrics_lock:
+            self._counters["checkouts"] += 1
+            self._counters["peak_checked_out"] = max(
+                self._counters["peak_checked_out"], self.checkedout()
+            )
+        return connection
+
+    def stats(self) -> Dict[str, object]:
+        with self._metrics_lock:
+            counters = dict(self._counters)
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self._timeout,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # Negative while the pool has not yet opened `pool_size` connections.
+            "overflow": self.overflow(),
+            **counters,
+            "checkout_wait": self.checkout_waits.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_CheckoutMetricsMixin, QueuePool):
+    """
+    QueuePool for the sync engine, with checkout metrics.
+    """
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutMetricsMixin, AsyncAdaptedQueuePool):
+    """
+    Pool for the asyncpg engine, with checkout metrics.
+    """
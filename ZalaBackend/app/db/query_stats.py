@@ -0,0 +1,162 @@
+"""
+Per-request SQL accounting.
+
+Engine event hooks count every statement a request runs, its total DB time and how many
+times each statement shape (the SQL with parameters stripped) repeats. The middleware
+reports the totals in `X-DB-*` response headers and logs requests that look like N+1
+loops or exceed their statement budget.
+
+A route declares its budget with `@sql_budget(n)` under its router decorator; routes
+without one fall back to SQL_STATEMENT_BUDGET (0 = no budget). With SQL_BUDGET_ENFORCE
+on, as in tests, a request over budget fails with a 500 naming the repeated statements
+instead of returning its response.
+"""
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+STATEMENT_BUDGET = int(os.getenv("SQL_STATEMENT_BUDGET", "0"))
+BUDGET_ENFORCE = os.getenv("SQL_BUDGET_ENFORCE", "false").strip().lower() in ("1", "true", "yes", "on")
+# A shape repeated this many times within one request is reported as a likely N+1.
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+STATEMENTS_HEADER = "X-DB-Statements"
+TIME_HEADER = "X-DB-Time-Ms"
+REPEATED_HEADER = "X-DB-Max-Repeats"
+STATS_HEADERS = [STATEMENTS_HEADER, TIME_HEADER, REPEATED_HEADER]
+
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|\$\d+|%s")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    SQL text with parameters and IN-list lengths erased, so the same query issued in a
+    loop always has the same shape.
+    """
+    shape = _PLACEHOLDER_RE.sub("?", statement)
+    shape = _PLACEHOLDER_LIST_RE.sub("(?...)", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    """
+    Statements run on behalf of one request. Shared with the threads the request's
+    context is copied into, hence the lock.
+    """
+
+    def __init__(self, request: Optional[Request] = None):
+        self.request = request
+        self.statements = 0
+        self.db_ms = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = Lock()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.statements += 1
+            self.db_ms += elapsed_ms
+            self.shapes[shape] += 1
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        with self._lock:
+            return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    @property
+    def max_repeats(self) -> int:
+        with self._lock:
+            return max(self.shapes.values(), default=0)
+
+    @property
+    def route(self) -> Optional[str]:
+        return _route_label(self.request) if self.request is not None else None
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Also read by the slow query log, which times statements outside requests too.
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = getattr(context, "query_started_at", None)
+    if stats is None or started is None:
+        return
+    stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def sql_budget(max_statements: int) -> Callable:
+    """
+    Declare how many statements a route may run per request.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.sql_statement_budget = max_statements
+        return endpoint
+
+    return decorator
+
+
+def _route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {getattr(route, 'path', request.url.path)}"
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """
+    Count the SQL each request runs and report it in headers and logs.
+    """
+    stats = RequestQueryStats(request)
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    endpoint = request.scope.get("endpoint")
+    budget = getattr(endpoint, "sql_statement_budget", STATEMENT_BUDGET)
+    over_budget = budget > 0 and stats.statements > budget
+    repeated = stats.repeated(N_PLUS_ONE_THRESHOLD)
+
+    if over_budget or repeated:
+        label = _route_label(request)
+        print(
+            f"SQL {label}: {stats.statements} statements in {stats.db_ms:.1f}ms"
+            + (f" (budget {budget})" if over_budget else "")
+        )
+        for shape, count in repeated:
+            print(f"  repeated x{count}: {shape[:200]}")
+        if over_budget and BUDGET_ENFORCE:
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={
+                    "detail": f"{label} ran {stats.statements} SQL statements, budget is {budget}",
+                    "repeated": [{"statement": shape, "count": count} for shape, count in stats.repeated()],
+                },
+            )
+
+    response.headers[STATEMENTS_HEADER] = str(stats.statements)
+    response.headers[TIME_HEADER] = f"{stats.db_ms:.1f}"
+    response.headers[REPEATED_HEADER] = str(stats.max_repeats)
+    return response
@@ -0,0 +1,111 @@
+"""
+Read-your-writes stickiness for replica routing.
+
+Read endpoints are served from a replica when one is configured, but a replica can lag
+the primary. After a client makes a successful write, its reads go to the primary for
+DB_READ_YOUR_WRITES_SECONDS so it never sees its own change missing. A client is
+remembered by address in this worker, and by a cookie so that other workers behind the
+same load balancer honour the window too when the browser sends cookies.
+"""
+import os
+import time
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Optional
+
+from fastapi import Request
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+STICKY_COOKIE = "zala_primary_until"
+
+_SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+# POST endpoints that only read on behalf of the caller: the searches persist provider
+# leads, but re-read them from the primary themselves.
+_READ_ONLY_POSTS = frozenset(("/api/searchLeads", "/api/searchLeads/stream"))
+
+_reads_on_primary: ContextVar[bool] = ContextVar("reads_on_primary", default=False)
+
+
+def reads_use_primary() -> bool:
+    """
+    Whether the current request must read from the primary.
+    """
+    return _reads_on_primary.get()
+
+
+class _RecentWriters:
+    """
+    Client address -> wall-clock time until which its reads stay on the primary.
+    """
+
+    def __init__(self, max_clients: int = 10000):
+        self.max_clients = max_clients
+        self._until: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def mark(self, client: str, until: float) -> None:
+        with self._lock:
+            if len(self._until) >= self.max_clients:
+                now = time.time()
+                self._until = {key: value for key, value in self._until.items() if value > now}
+                if len(self._until) >= self.max_clients:
+                    self._until.pop(next(iter(self._until)))
+            self._until[client] = until
+
+    def is_sticky(self, client: str) -> bool:
+        with self._lock:
+            until = self._until.get(client)
+            if until is None:
+                return False
+            if until <= time.time():
+                del self._until[client]
+                return False
+            return True
+
+
+recent_writers = _RecentWriters()
+
+
+def _client_key(request: Request) -> Optional[str]:
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+def _cookie_is_sticky(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def _is_write(request: Request) -> bool:
+    return request.method not in _SAFE_METHODS and request.url.path not in _READ_ONLY_POSTS
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    Pin the reads of clients that wrote recently to the primary, and start the window
+    after every successful write.
+    """
+    client = _client_key(request)
+    sticky = _cookie_is_sticky(request) or (client is not None and recent_writers.is_sticky(client))
+    token = _reads_on_primary.set(sticky)
+    try:
+        response = await call_next(request)
+    finally:
+        _reads_on_primary.reset(token)
+
+    if READ_YOUR_WRITES_SECONDS > 0 and _is_write(request) and response.status_code < 400:
+        until = time.time() + READ_YOUR_WRITES_SECONDS
+        if client is not None:
+            recent_writers.mark(client, until)
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{until:.3f}",
+            max_age=max(1, int(READ_YOUR_WRITES_SECONDS + 0.999)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -1,9 +1,15 @@
-from sqlalchemy import URL, create_engine, text
+from itertools import cycle
+
+from sqlalchemy import URL, create_engine, make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from dotenv import load_dotenv, find_dotenv
 import os
 
+from .pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from .routing import reads_use_primary
+
 load_dotenv(find_dotenv())
 
 url = URL.create(
@@ -15,8 +21,97 @@ url = URL.create(
     port=os.getenv("SQL_PORT"),
 )
 
-engine = create_engine(url)
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Pool sizing is per process: each uvicorn worker holds up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections, shared by request handlers and the
+# provider fan-out threads that persist external leads.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", True)
+# 0 disables the server-side limit.
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+# The async engine used by the async read routes has its own pool.
+ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", str(POOL_SIZE)))
+ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", str(MAX_OVERFLOW)))
+
+# Optional read replicas, as comma-separated SQLAlchemy/libpq URLs. Read endpoints are
+# spread across them round-robin; everything else, and reads inside a client's
+# read-your-writes window, use the primary.
+REPLICA_URLS = [
+    make_url(value.strip()) for value in os.getenv("SQL_REPLICA_URLS", "").split(",") if value.strip()
+]
+REPLICA_POOL_SIZE = int(os.getenv("DB_REPLICA_POOL_SIZE", str(POOL_SIZE)))
+REPLICA_MAX_OVERFLOW = int(os.getenv("DB_REPLICA_MAX_OVERFLOW", str(MAX_OVERFLOW)))
+
+
+def _make_engine(db_url: URL, pool_size: int, max_overflow: int, read_only: bool = False):
+    options = f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+    if read_only:
+        options += " -c default_transaction_read_only=on"
+    return create_engine(
+        db_url.set(drivername="postgresql"),
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=POOL_TIMEOUT_SECONDS,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+        pool_pre_ping=POOL_PRE_PING,
+        connect_args={"options": options},
+    )
+
+
+def _make_async_engine(db_url: URL, pool_size: int, max_overflow: int, read_only: bool = False):
+    server_settings = {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    return create_async_engine(
+        db_url.set(drivername="postgresql+asyncpg"),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=POOL_TIMEOUT_SECONDS,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+        pool_pre_ping=POOL_PRE_PING,
+        connect_args={"server_settings": server_settings},
+    )
+
+
+engine = _make_engine(url, POOL_SIZE, MAX_OVERFLOW)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = _make_async_engine(url, ASYNC_POOL_SIZE, ASYNC_MAX_OVERFLOW)
+# expire_on_commit=False: responses are serialized after the session is gone, and
+# async sessions cannot lazy-load, so routes must eager-load everything they return.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Replica connections are opened read-only, so a write routed there by mistake fails
+# loudly instead of diverging from the primary.
+replica_engines = [
+    _make_engine(replica_url, REPLICA_POOL_SIZE, REPLICA_MAX_OVERFLOW, read_only=True)
+    for replica_url in REPLICA_URLS
+]
+async_replica_engines = [
+    _make_async_engine(replica_url, REPLICA_POOL_SIZE, REPLICA_MAX_OVERFLOW, read_only=True)
+    for replica_url in REPLICA_URLS
+]
+_replica_sessions = cycle(
+    [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in replica_engines] or [None]
+)
+_async_replica_sessions = cycle(
+    [
+        async_sessionmaker(e, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        for e in async_replica_engines
+    ]
+    or [None]
+)
 Base = declarative_base()
 
 
@@ -31,31 +126,67 @@ def get_db():
         db.close()
 
 
-def init_db():
+async def get_async_db():
     """
-    Drops all tables and recreates them from the current models.
+    Gets async database session to API endpoint
     """
-    # Import all your models so Base knows about them
-    from ..models import (
-        user,
-        property,
-        contact,
-        lead,
-        address,
-        unit,
-        user_authentication,
-        campaign,
-        campaign_email,
-        campaign_lead
-    )
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def read_session_factory():
+    """
+    Session factory for a read-only endpoint: the next replica, or the primary when no
+    replica is configured or the client is inside its read-your-writes window.
+    """
+    factory = next(_replica_sessions)
+    if factory is None or reads_use_primary():
+        return SessionLocal
+    return factory
+
+
+def async_read_session_factory():
+    """
+    Async counterpart of `read_session_factory`.
+    """
+    factory = next(_async_replica_sessions)
+    if factory is None or reads_use_primary():
+        return AsyncSessionLocal
+    return factory
+
+
+def get_read_db():
+    """
+    Gets database session for a read-only API endpoint
+    """
+    db = read_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """
+    Gets async database session for a read-only API endpoint
+    """
+    async with async_read_session_factory()() as db:
+        yield db
+
+
+def init_db(reset: bool = False):
+    """
+    Brings the database schema up to date by applying pending migrations.
+    With `reset=True` the public schema is dropped first, deleting all data.
+    """
+    from .migrations import migrate
 
-    print("Dropping all database tables...")
-    with engine.begin() as connection:
-        connection.execute(text("DROP SCHEMA IF EXISTS public CASCADE;"))
-        connection.execute(text("CREATE SCHEMA public;"))
-        connection.execute(text("SET search_path TO public;"))
+    if reset:
+        print("Dropping all database tables...")
+        with engine.begin() as connection:
+            connection.execute(text("DROP SCHEMA IF EXISTS public CASCADE;"))
+            connection.execute(text("CREATE SCHEMA public;"))
+            connection.execute(text("SET search_path TO public;"))
 
-    print("Creating all database tables...")
-    with engine.begin() as connection:
-        connection.execute(text("SET search_path TO public"))
-        Base.metadata.create_all(bind=connection)
+    print("Applying database migrations...")
+    migrate(engine)
@@ -0,0 +1,235 @@
+"""
+Slow query log with EXPLAIN capture.
+
+Any statement slower than SLOW_QUERY_MS, on any engine, is logged with the route that
+issued it and the types of its parameters (the values themselves only with
+SLOW_QUERY_LOG_PARAMS), and recorded in a ring buffer served by
+`GET /api/metrics/slow-queries`. For SELECTs a background thread then asks for the
+statement's plan with `EXPLAIN` on a separate sync connection to the same database and
+attaches it to the entry, so the request that hit the slow query never waits for it.
+Plain `EXPLAIN` does not run the statement. `EXPLAIN (ANALYZE, BUFFERS)` does, so it is
+opt-in via SLOW_QUERY_EXPLAIN_ANALYZE. Statements that call side-effecting functions
+(`nextval`, advisory locks, ...) are never explained. A statement shape is explained at
+most once per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS.
+"""
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .query_stats import current_query_stats, statement_shape
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").strip().lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "false").strip().lower() in (
+    "1", "true", "yes", "on"
+)
+SLOW_QUERY_LOG_PARAMS = os.getenv("SLOW_QUERY_LOG_PARAMS", "false").strip().lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "60"))
+
+_MAX_PARAMS_CHARS = 1000
+_ASYNCPG_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+_READ_ONLY_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_MODIFYING_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(UPDATE|SHARE)\b", re.IGNORECASE)
+# Functions with side effects or that wait: the statement must not be re-run for a plan.
+_SIDE_EFFECT_FUNCTION_RE = re.compile(
+    r"\b(nextval|setval|pg_(try_)?advisory_\w*|pg_sleep\w*|pg_notify|pg_cancel_backend|pg_terminate_backend"
+    r"|set_config|lo_\w+|dblink\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+# Set in the explain thread so the EXPLAIN runs are not themselves logged as slow.
+_explaining: ContextVar[bool] = ContextVar("explaining_slow_query", default=False)
+
+
+def _redact(parameters):
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(value) for value in parameters]
+    return type(parameters).__name__
+
+
+def _format_params(parameters) -> Optional[str]:
+    """
+    Bound parameters as logged: their values with SLOW_QUERY_LOG_PARAMS, otherwise only
+    their types, since they routinely hold emails, phone numbers, message bodies and tokens.
+    """
+    if parameters is None:
+        return None
+    rendered = repr(parameters if SLOW_QUERY_LOG_PARAMS else _redact(parameters))
+    if len(rendered) > _MAX_PARAMS_CHARS:
+        rendered = rendered[:_MAX_PARAMS_CHARS] + "..."
+    return rendered
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of slow statements plus the queue of plans still to capture.
+    """
+
+    def __init__(self, max_entries: int = 100, explain_interval_seconds: float = 60):
+        self.explain_interval_seconds = explain_interval_seconds
+        self._entries: deque = deque(maxlen=max_entries)
+        self._ids = count(1)
+        self._last_explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=20)
+        self._worker: Optional[threading.Thread] = None
+        self._counters = {"slow_queries": 0, "explained": 0, "explain_failures": 0, "explains_dropped": 0}
+
+    def record(self, conn, statement: str, parameters, duration_ms: float, executemany: bool) -> None:
+        stats = current_query_stats()
+        route = stats.route if stats is not None else None
+        shape = statement_shape(statement)
+        entry = {
+            "id": next(self._ids),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 1),
+            "route": route,
+            "database": conn.engine.url.render_as_string(hide_password=True),
+            "statement": statement,
+            "parameters": _format_params(parameters),
+            "plan": None,
+            "plan_status": "skipped",
+        }
+        print(
+            f"Slow query {duration_ms:.0f}ms [{route or 'no request'}]: "
+            f"{' '.join(statement.split())[:500]}"
+            + (f" params={entry['parameters']}" if entry["parameters"] else "")
+        )
+
+        explain = (
+            SLOW_QUERY_EXPLAIN
+            and not executemany
+            and _READ_ONLY_RE.match(statement) is not None
+            and _MODIFYING_RE.search(statement) is None
+            and _SIDE_EFFECT_FUNCTION_RE.search(statement) is None
+        )
+        now = time.monotonic()
+        with self._lock:
+            self._counters["slow_queries"] += 1
+            if explain and now - self._last_explained.get(shape, float("-inf")) < self.explain_interval_seconds:
+                explain = False
+            if explain:
+                self._last_explained[shape] = now
+                entry["plan_status"] = "pending"
+            self._entries.append(entry)
+        if explain:
+            self._enqueue(entry, conn.engine.url, conn.dialect.driver, statement, parameters)
+
+    def _enqueue(self, entry, db_url, driver: str, statement: str, parameters) -> None:
+        try:
+            self._queue.put_nowait((entry, db_url, driver, statement, parameters))
+        except queue.Full:
+            with self._lock:
+                self._counters["explains_dropped"] += 1
+                entry["plan_status"] = "dropped"
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _explain_loop(self) -> None:
+        _explaining.set(True)
+        while True:
+            entry, db_url, driver, statement, parameters = self._queue.get()
+            try:
+                plan = _explain(db_url, driver, statement, parameters)
+            except Exception as exc:
+                with self._lock:
+                    self._counters["explain_failures"] += 1
+                    entry["plan_status"] = "failed"
+                    entry["plan"] = f"{type(exc).__name__}: {exc}"
+            else:
+                with self._lock:
+                    self._counters["explained"] += 1
+                    entry["plan_status"] = "captured"
+                    entry["plan"] = plan
+            finally:
+                self._queue.task_done()
+
+    def entries(self) -> List[Dict[str, object]]:
+        """
+        Buffered slow queries, newest first.
+        """
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries)]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._counters,
+                "threshold_ms": SLOW_QUERY_MS,
+                "buffered": len(self._entries),
+                "max_entries": self._entries.maxlen,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._last_explained.clear()
+
+
+def _psycopg2_statement(driver: str, statement: str, parameters) -> Tuple[str, object]:
+    """
+    Rewrite an asyncpg statement ($1, $2, ...) into psycopg2's positional style so the
+    sync engine can explain it.
+    """
+    if driver != "asyncpg":
+        return statement, parameters
+    values = list(parameters or ())
+    ordered = []
+
+    def placeholder(match):
+        ordered.append(values[int(match.group(1)) - 1])
+        return "%s"
+
+    rewritten = _ASYNCPG_PLACEHOLDER_RE.sub(placeholder, statement.replace("%", "%%"))
+    return rewritten, tuple(ordered)
+
+
+def _sync_engine_for(db_url):
+    from .session import engine, replica_engines
+
+    target = db_url.set(drivername="postgresql")
+    for candidate in [engine, *replica_engines]:
+        if candidate.url.set(drivername="postgresql") == target:
+            return candidate
+    return engine
+
+
+def _explain(db_url, driver: str, statement: str, parameters):
+    statement, parameters = _psycopg2_statement(driver, statement, parameters)
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if SLOW_QUERY_EXPLAIN_ANALYZE else "FORMAT JSON"
+    with _sync_engine_for(db_url).connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters).scalar()
+        connection.rollback()
+    return plan
+
+
+slow_query_log = SlowQueryLog(
+    max_entries=SLOW_QUERY_BUFFER_SIZE,
+    explain_interval_seconds=SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started_at", None)
+    if SLOW_QUERY_MS <= 0 or started is None or _explaining.get():
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    if duration_ms >= SLOW_QUERY_MS:
+        slow_query_log.record(conn, statement, parameters, duration_ms, executemany)
@@ -3,6 +3,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 from . import GOOGLE_API_KEY
 from .to_leads import gplaces_to_leads
+from app.utils import gazetteer
+from app.utils.geocode_cache import cache_key, geocode_cache
 
 GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 PLACES_NEARBY_URL = "https://places.googleapis.com/v1/places:searchNearby"
@@ -14,6 +16,17 @@ class GeocodeError(RuntimeError): ...
 class PlacesError(RuntimeError): ...
 
 def geocode(query: str):
+    offline = gazetteer.resolve(query)
+    if offline:
+        return offline["latitude"], offline["longitude"]
+
+    key = cache_key("places", query)
+    found, cached = geocode_cache.lookup(key)
+    if found:
+        if cached is None:
+            raise GeocodeError(f"Geocoding recently failed for '{query}'")
+        return cached[0], cached[1]
+
     params = {"key": GOOGLE_API_KEY}
     if ZIP_RE.match(query):
         params.update({"components": f"postal_code:{query},country:US"})
@@ -23,8 +36,12 @@ def geocode(query: str):
     r.raise_for_status()
     data = r.json()
     if data.get("status") != "OK":
+        # Only a definite "no such place" is cached; quota and auth errors are retried.
+        if data.get("status") == "ZERO_RESULTS":
+            geocode_cache.store(key, None)
         raise GeocodeError(data.get("error_message") or f"Geocoding status={data.get('status')}")
     loc = data["results"][0]["geometry"]["location"]
+    geocode_cache.store(key, [loc["lat"], loc["lng"]])
     return loc["lat"], loc["lng"]
 
 def get_place_contact(place_id: str) -> dict:
@@ -1,5 +1,9 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from dotenv import load_dotenv
 
@@ -20,9 +24,39 @@ from app.routes import (
     campaign_leads,
     campaign_emails,
     google_mail,
+    metrics,
 )
+from app.db.partitions import ensure_message_partitions
+from app.db.query_stats import STATS_HEADERS, query_stats_middleware
+from app.db.routing import read_your_writes_middleware
+from app.db.session import engine
+from app.services.lead_index import warm_lead_index
+from app.utils.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bulk-load the lead spatial index so the first search doesn't pay for it.
+    try:
+        await run_in_threadpool(warm_lead_index)
+    except Exception as exc:
+        print(f"Lead index warm-up failed, it will load on first search: {exc}")
+    # Keep next months' message partitions ready; rows would otherwise pile up in the
+    # default partition.
+    try:
+        await run_in_threadpool(ensure_message_partitions, engine)
+    except Exception as exc:
+        print(f"Message partition maintenance failed: {exc}")
+    yield
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Keeps a client's reads on the primary for a short window after it writes, so replica
+# lag never hides its own changes.
+app.middleware("http")(read_your_writes_middleware)
+# Counts each request's SQL statements into X-DB-* headers and flags N+1 patterns.
+app.middleware("http")(query_stats_middleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,9 +64,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers read the keyset pagination cursor of list endpoints and the
+    # per-request SQL stats.
+    expose_headers=[NEXT_CURSOR_HEADER, *STATS_HEADERS],
 )
 
 
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
 @app.get("/", tags=["Root"], include_in_schema=False)
 def read_root():
     return {"message": "Zala API is running"}
@@ -63,3 +105,4 @@ app.include_router(properties.router, prefix="/api", include_in_schema=False)
 app.include_router(units.router, prefix="/api", include_in_schema=False)
 app.include_router(contacts.router, prefix="/api", include_in_schema=True)
 app.include_router(csv_intake.router, prefix="/api", include_in_schema=False)
+app.include_router(metrics.router, prefix="/api", include_in_schema=False)
@@ -10,7 +10,7 @@ from .user_google_credentials import UserGoogleCredential
 from .property import Property
 from .unit import Unit
 from .campaign import Campaign
-from .campaign_email import CampaignEmail
+from .campaign_email import CampaignEmail, CampaignMessageDailyStats
 from .lead import Lead
 
 
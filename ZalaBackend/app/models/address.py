@@ -1,6 +1,6 @@
 from decimal import Decimal
 
-from sqlalchemy import Column, Integer, String, Numeric
+from sqlalchemy import Column, Index, Integer, String, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.session import Base
@@ -11,6 +11,7 @@ class Address(Base):
     SQLAlchemy model for Address (addresses)
     """
     __tablename__ = "addresses"
+    __table_args__ = (Index("ix_addresses_lat_long", "lat", "long"),)
 
     address_id: Mapped[int] = mapped_column(primary_key=True)
     street_1: Mapped[str] = mapped_column(nullable=False)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.session import Base
@@ -16,6 +16,13 @@ class Campaign(Base):
     campaign_name: Mapped[str] = mapped_column(nullable=False)
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.user_id"), nullable=True)
 
+    # Membership counts, maintained by triggers on campaign_leads; never written here.
+    lead_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    contacted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    email_contacted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    phone_contacted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    sms_contacted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+
     user: Mapped[Optional["User"]] = relationship("User", back_populates="campaigns")
     campaign_emails: Mapped[List["CampaignEmails"]] = relationship(
         "CampaignEmail", back_populates="campaign", cascade="all, delete-orphan"
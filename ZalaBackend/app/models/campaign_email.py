@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.session import Base
@@ -11,13 +11,27 @@ from ..db.session import Base
 class CampaignEmail(Base):
     """
     SQLAlchemy model for Contact history
+
+    The table is range-partitioned by month on `timestamp` (see app/db/partitions.py),
+    which Postgres requires to be part of the primary key; rows are still identified by
+    `message_id` alone.
     """
     __tablename__ = "campaign_messages"
+    __table_args__ = (
+        Index("ix_campaign_messages_campaign_id_lead_id", "campaign_id", "lead_id"),
+        Index("ix_campaign_messages_timestamp_message_id", "timestamp", "message_id"),
+        Index(
+            "ix_campaign_messages_campaign_id_timestamp", "campaign_id", "timestamp", "message_id"
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
-    message_id: Mapped[int] = mapped_column(primary_key=True)
+    message_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     campaign_id: Mapped[int] = mapped_column(ForeignKey("campaigns.campaign_id"), nullable=False)
     lead_id: Mapped[int] = mapped_column(ForeignKey("leads.lead_id"), nullable=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
     message_subject: Mapped[str] = mapped_column(nullable=False)
     message_body: Mapped[str] = mapped_column(nullable=False)
     from_name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
@@ -30,3 +44,21 @@ class CampaignEmail(Base):
     campaign: Mapped["Campaign"] = relationship("Campaign", back_populates="campaign_emails")
     lead: Mapped["Lead"] = relationship("Lead", back_populates="campaign_emails")
 
+    __mapper_args__ = {"primary_key": [message_id]}
+
+
+class CampaignMessageDailyStats(Base):
+    """
+    Per-campaign, per-day (UTC) message counts, maintained by a trigger on
+    campaign_messages
+    """
+    __tablename__ = "campaign_message_daily_stats"
+
+    campaign_id: Mapped[int] = mapped_column(
+        ForeignKey("campaigns.campaign_id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    sent_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+
@@ -13,7 +13,7 @@ class CampaignLead(Base):
     __tablename__ = "campaign_leads"
 
     campaign_id: Mapped[int] = mapped_column(ForeignKey("campaigns.campaign_id"), nullable=False, primary_key=True)
-    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.lead_id"), nullable=False, primary_key=True)
+    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.lead_id"), nullable=False, primary_key=True, index=True)
     phone_contacted: Mapped[bool] = mapped_column(default=False)
     sms_contacted: Mapped[bool] = mapped_column(default=False)
     email_contacted: Mapped[bool] = mapped_column(default=False)
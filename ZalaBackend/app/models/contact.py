@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, func, UniqueConstraint
+from sqlalchemy import Computed, String, DateTime, func, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.session import Base
 
@@ -11,6 +11,16 @@ class Contact(Base):
     last_name: Mapped[str] = mapped_column(nullable=True)
     email: Mapped[str] = mapped_column(String(255), nullable=True, unique=True, index=True)
     phone: Mapped[str] = mapped_column(String(20), nullable=True, unique=True, index=True)
+    # Maintained by Postgres on every write; used for dedupe lookups.
+    email_normalized: Mapped[str] = mapped_column(
+        String(255), Computed("lower(email)", persisted=True), nullable=True, index=True
+    )
+    phone_digits: Mapped[str] = mapped_column(
+        String(20),
+        Computed("regexp_replace(phone, '\\D', '', 'g')", persisted=True),
+        nullable=True,
+        index=True,
+    )
 
     __table_args__ = (
         UniqueConstraint("email", name="uq_contact_email"),
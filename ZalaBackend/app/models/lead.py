@@ -13,7 +13,7 @@ class Lead(Base):
     __tablename__ = "leads"
 
     lead_id: Mapped[int] = mapped_column(primary_key=True)
-    created_by: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True)
+    created_by: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True, index=True)
     contact_id: Mapped[int] = mapped_column(ForeignKey("contacts.contact_id"), unique=True, nullable=True)
     address_id: Mapped[int] = mapped_column(ForeignKey("addresses.address_id"), unique=True, nullable=True)
     person_type: Mapped[str] = mapped_column(nullable=True)
@@ -17,7 +17,7 @@ class Property(Base):
     property_name: Mapped[str] = mapped_column(nullable=False)
     address_id: Mapped[int] = mapped_column(ForeignKey("addresses.address_id"), unique=True)
     mls_number: Mapped[str] = mapped_column(nullable=True)
-    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.lead_id"), nullable=True)
+    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.lead_id"), nullable=True, index=True)
     notes: Mapped[str] = mapped_column(nullable=True)
 
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.db.crud import address as address_crud
 from app.schemas.address import AddressCreate, AddressPublic, AddressUpdate
 
@@ -15,12 +15,12 @@ def create_address(address_in: AddressCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[AddressPublic])
-def read_addresses(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_addresses(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     return address_crud.get_addresses(db=db, skip=skip, limit=limit)
 
 
 @router.get("/{address_id}", response_model=AddressPublic)
-def read_address(address_id: int, db: Session = Depends(get_db)):
+def read_address(address_id: int, db: Session = Depends(get_read_db)):
     db_address = address_crud.get_address(db=db, address_id=address_id)
     if not db_address:
         raise HTTPException(status_code=404, detail="Address not found")
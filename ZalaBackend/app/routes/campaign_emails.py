@@ -1,11 +1,14 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.db.crud import campaign_email as campaign_email_crud
-from app.db.session import get_db
+from app.db.session import get_async_read_db, get_db
+from app.db.query_stats import sql_budget
+from app.utils.pagination import CURSOR_DESCRIPTION, page_response
 
 router = APIRouter(prefix="/campaign-emails", tags=["Campaign Emails"])
 send_router = APIRouter(prefix="/campaign-emails", tags=["Send Campaign Email"])
@@ -37,50 +40,59 @@ def send_campaign_email(
 
 
 @router.get("/", summary="Get All Campaign Emails", response_model=List[schemas.CampaignEmailPublic])
-def list_campaign_emails(
+@sql_budget(6)
+async def list_campaign_emails(
+        response: Response,
         skip: int = 0,
         limit: int = 100,
         campaign_id: Optional[int] = None,
-        db: Session = Depends(get_db),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+        db: AsyncSession = Depends(get_async_read_db),
 ):
     """
-    List campaign emails, optionally filtered by campaign_id.
+    List campaign emails in send order, optionally filtered by campaign_id. The next
+    page's cursor is in the X-Next-Cursor header.
     """
-    if campaign_id is not None:
-        return campaign_email_crud.get_campaign_emails_for_campaign(
-            db, campaign_id=campaign_id, skip=skip, limit=limit
-        )
-    return campaign_email_crud.get_campaign_emails(db, skip=skip, limit=limit)
+    page = await campaign_email_crud.get_campaign_emails_async(
+        db, campaign_id=campaign_id, skip=skip, limit=limit, cursor=cursor
+    )
+    return page_response(response, page)
 
 
 @router.get("/campaign/{campaign_id}/lead/{lead_id}", summary="Get Campaign Emails For Campaign By Lead ID",
             response_model=List[schemas.CampaignEmailPublic])
-def list_campaign_emails_by_lead(
+@sql_budget(6)
+async def list_campaign_emails_by_lead(
+        response: Response,
         campaign_id: int,
         lead_id: int,
         skip: int = 0,
         limit: int = 100,
-        db: Session = Depends(get_db),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+        db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     List campaign emails for a specific campaign, filtered by lead
     """
 
-    return campaign_email_crud.get_campaign_emails_by_lead(
+    page = await campaign_email_crud.get_campaign_emails_async(
         db,
         campaign_id=campaign_id,
         lead_id=lead_id,
         skip=skip,
         limit=limit,
+        cursor=cursor,
     )
+    return page_response(response, page)
 
 
 @router.get("/{message_id}", summary="Get Campaign Email by id", response_model=schemas.CampaignEmailPublic)
-def get_campaign_email(message_id: int, db: Session = Depends(get_db)):
+@sql_budget(6)
+async def get_campaign_email(message_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a campaign email by ID.
     """
-    message = campaign_email_crud.get_campaign_email(db, message_id)
+    message = await campaign_email_crud.get_campaign_email_async(db, message_id)
     if not message:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign email not found")
     return message
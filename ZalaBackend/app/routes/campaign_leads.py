@@ -9,7 +9,10 @@ from app.db.crud import (
     campaign_lead as campaign_lead_crud,
     lead as lead_crud,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.query_stats import sql_budget
+from app.utils import gazetteer
+from app.utils.geocode import geocode_location
 
 router = APIRouter(prefix="/campaign-leads", tags=["CampaignLeads"])
 
@@ -20,7 +23,7 @@ def create_campaign_lead(campaign_id: int, lead_id: int, db: Session = Depends(g
     If the link already exists, returns the existing link.
     """
     try:
-        db_campaign_lead = campaign_lead_crud.link_lead_to_campaign(
+        db_campaign_lead = campaign_lead_crud.create_lead_to_campaign(
             db, campaign_id=campaign_id, lead_id=lead_id
         )
         return db_campaign_lead
@@ -30,12 +33,40 @@ def create_campaign_lead(campaign_id: int, lead_id: int, db: Session = Depends(g
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/{campaign_id}/leads",
+    response_model=schemas.CampaignLeadsBulkResult,
+    summary="Add many leads to a campaign by id list and/or radius",
+)
+@sql_budget(2)
+def add_campaign_leads_bulk(campaign_id: int, bulk_in: schemas.CampaignLeadsBulkAdd, db: Session = Depends(get_db)):
+    """
+    Add every lead matching the filters to a campaign in one INSERT ... SELECT.
+    Leads already in the campaign keep their contact status.
+    """
+    within = None
+    if bulk_in.within is not None:
+        lat, lon = bulk_in.within.lat, bulk_in.within.lon
+        if lat is None or lon is None:
+            location_text = bulk_in.within.location_text.strip()
+            geocoded = gazetteer.resolve(location_text) or geocode_location(location_text)
+            if not geocoded:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Geocoding failed")
+            lat, lon = float(geocoded["latitude"]), float(geocoded["longitude"])
+        within = (lat, lon, bulk_in.within.radius_miles)
+
+    matched, added = campaign_lead_crud.add_campaign_leads(
+        db, campaign_id, lead_ids=bulk_in.lead_ids, within=within
+    )
+    return schemas.CampaignLeadsBulkResult(campaign_id=campaign_id, matched=matched, added=added)
+
+
 @router.get(
     "/campaign/{campaign_id}/lead/{lead_id}",
     summary="Get Campaign and Lead By Ids",
     response_model=schemas.CampaignLeadDetailedPublic,
 )
-def get_campaign_lead(campaign_id: int, lead_id: int, db: Session = Depends(get_db)):
+def get_campaign_lead(campaign_id: int, lead_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve a campaign lead link and hydrate it with full campaign and lead details.
     """
@@ -86,7 +117,7 @@ def delete_lead_from_campaign_route(campaign_id: int, lead_id: int, db: Session
     """
     Unlink lead from campaign
     """
-    success = campaign_lead_crud.unlink_lead_from_campaign(
+    success = campaign_lead_crud.delete_lead_from_campaign(
         db, campaign_id=campaign_id, lead_id=lead_id
     )
 
@@ -1,12 +1,17 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.db.crud import campaign as campaign_crud
+from app.db.crud import campaign_email as campaign_email_crud
 from app.db.crud import campaign_lead as campaign_lead_crud
-from app.db.session import get_db
+from app.db.session import get_async_read_db, get_db, get_read_db
+from app.db.query_stats import sql_budget
+from app.utils.pagination import CURSOR_DESCRIPTION, page_response
 
 
 router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
@@ -21,24 +26,90 @@ def create_campaign(campaign_in: schemas.CampaignCreate, db: Session = Depends(g
 
 
 @router.get("/", summary="Get All Campaigns", response_model=List[schemas.CampaignPublic])
-def list_campaigns(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@sql_budget(1)
+async def list_campaigns(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
-    List campaigns with optional pagination.
+    List campaigns in id order. The next page's cursor is in the X-Next-Cursor header.
     """
-    return campaign_crud.get_campaigns(db, skip=skip, limit=limit)
+    page = await campaign_crud.get_campaigns_async(db, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page)
 
 
 @router.get("/{campaign_id}", summary="Get Campaign By Id", response_model=schemas.CampaignPublic)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
+@sql_budget(1)
+async def get_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a single campaign by ID.
     """
-    campaign = campaign_crud.get_campaign(db, campaign_id)
+    campaign = await campaign_crud.get_campaign_async(db, campaign_id)
     if not campaign:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
     return campaign
 
 
+@router.get(
+    "/{campaign_id}/leads",
+    summary="Get Campaign Leads",
+    response_model=List[schemas.CampaignLeadPublic],
+)
+@sql_budget(2)
+async def list_campaign_leads(
+    campaign_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    phone_contacted: Optional[bool] = None,
+    sms_contacted: Optional[bool] = None,
+    email_contacted: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Page through a campaign's leads in lead id order, optionally filtered on the
+    contact flags. The next page's cursor is in the X-Next-Cursor header.
+    """
+    page = await campaign_crud.get_campaign_leads_async(
+        db,
+        campaign_id,
+        skip=skip,
+        limit=limit,
+        phone_contacted=phone_contacted,
+        sms_contacted=sms_contacted,
+        email_contacted=email_contacted,
+        cursor=cursor,
+    )
+    if not page.items and not await campaign_crud.get_campaign_async(db, campaign_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return page_response(response, page)
+
+
+@router.get(
+    "/{campaign_id}/message-stats",
+    summary="Get Campaign Message Stats",
+    response_model=schemas.CampaignMessageStats,
+)
+@sql_budget(2)
+def get_campaign_message_stats(
+    campaign_id: int,
+    start: Optional[date] = Query(None, description="First UTC day to include."),
+    end: Optional[date] = Query(None, description="Last UTC day to include."),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Sent, failed and total message counts per day for a campaign.
+    """
+    stats = campaign_email_crud.get_campaign_message_stats(db, campaign_id, start=start, end=end)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return stats
+
+
 @router.put("/{campaign_id}", response_model=schemas.CampaignPublic)
 def update_campaign(
     campaign_id: int, campaign_in: schemas.CampaignUpdate, db: Session = Depends(get_db)
@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, Response
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.query_stats import sql_budget
 from app.db.crud import contact as contact_crud
 from app import schemas
+from app.utils.pagination import CURSOR_DESCRIPTION, page_response
 
 router = APIRouter(
     prefix="/contacts",
@@ -21,15 +23,23 @@ def create_new_contact(contact_in: schemas.ContactCreate, db: Session = Depends(
 
 
 @router.get("/", response_model=List[schemas.ContactPublic])
-def read_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@sql_budget(2)
+def read_contacts(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+):
     """
-    Get a list of contacts
+    Get a list of contacts in id order; the next page's cursor is in X-Next-Cursor
     """
-    return contact_crud.get_contacts(db, skip=skip, limit=limit)
+    page = contact_crud.get_contacts(db, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page)
 
 
 @router.get("/{contact_id}", response_model=schemas.ContactPublic)
-def get_contact_by_id(contact_id: int, db: Session = Depends(get_db)):
+def get_contact_by_id(contact_id: int, db: Session = Depends(get_read_db)):
     """
     Get a contact by ID
     """
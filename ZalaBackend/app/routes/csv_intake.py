@@ -1,23 +1,26 @@
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import io
+import os
 
 import pandas as pd
 from fastapi import APIRouter, Depends, File, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
+from sqlalchemy import Integer, String, column, insert, select, update, values
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.contact import Contact
 from app.models.lead import Lead
+from app.utils.spreadsheet_rows import iter_row_batches
 
+# Rows parsed and held in memory at a time; peak memory does not grow with the file.
+IMPORT_BATCH_ROWS = int(os.getenv("CSV_IMPORT_BATCH_ROWS", "1000"))
 
-router = APIRouter(tags=["Import CSV"])
-
+CONTACT_FIELDS = ("first_name", "last_name", "email", "phone")
+LEAD_FIELDS = ("person_type", "business", "website", "license_num", "notes")
 
-def _normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
-    df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
-    return df
+router = APIRouter(tags=["Import CSV"])
 
 
 def _get_cell(row: Dict[str, Any], key: str) -> Optional[str]:
@@ -125,38 +128,298 @@ def _get_or_create_lead(
     return lead, "created"
 
 
-@router.post("/import-csv/", tags=["Import CSV"])
-async def import_csv(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-):
-    allowed_types = {
-        "text/csv",
-        "application/vnd.ms-excel",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+def _row_values(
+    row: Dict[str, Any],
+) -> Optional[Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]]]:
+    first_name = _get_cell(row, "first_name")
+    if not first_name:
+        return None
+
+    contact_data = {
+        "first_name": first_name,
+        "last_name": _get_cell(row, "last_name"),
+        "email": _get_cell(row, "email"),
+        "phone": _get_cell(row, "phone_number") or _get_cell(row, "phone"),
     }
-    if file.content_type not in allowed_types:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"error": "Unsupported file type"},
-        )
 
-    contents = await file.read()
+    lead_data = {
+        "person_type": _get_person_type(row),
+        "business": _get_cell(row, "business"),
+        "website": _get_cell(row, "website"),
+        "license_num": _get_cell(row, "license_num"),
+        "notes": _get_cell(row, "notes"),
+    }
+    return contact_data, lead_data
+
+
+def _record(
+    results: Dict[str, list],
+    contact_status: str,
+    contact_id: int,
+    lead_status: str,
+    lead_id: int,
+) -> None:
+    results[f"contacts_{contact_status}"].append(contact_id)
+    results[f"leads_{lead_status}"].append(lead_id)
+
+
+def _import_row(db: Session, index: int, row: Dict[str, Any], results: Dict[str, list]) -> None:
+    row_values = _row_values(row)
+    if row_values is None:
+        results["skipped"].append({"row": index, "reason": "Missing first_name"})
+        return
+    contact_data, lead_data = row_values
 
     try:
-        if file.filename.lower().endswith(".xlsx"):
-            df = pd.read_excel(io.BytesIO(contents))
-        else:
-            df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
+        contact, contact_status = _get_or_create_contact(db, contact_data)
+        lead, lead_status = _get_or_create_lead(db, contact.contact_id, lead_data)
+        db.commit()
+        _record(results, contact_status, contact.contact_id, lead_status, lead.lead_id)
     except Exception as exc:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"error": f"Failed to parse file: {exc}"},
+        db.rollback()
+        results["errors"].append({"row": index, "error": str(exc)})
+
+
+def _load_contacts(
+    db: Session,
+    rows: List[Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]]],
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[Tuple[str, str], Dict[str, Any]]]:
+    """
+    Contacts matching the rows' emails and phones, with their leads: one query each.
+    """
+    contacts: Dict[int, Dict[str, Any]] = {}
+    for key_column, field in ((Contact.email, "email"), (Contact.phone, "phone")):
+        keys = {contact_data[field] for contact_data, _ in rows if contact_data[field]}
+        if not keys:
+            continue
+        matches = db.execute(
+            select(Contact.contact_id, *[getattr(Contact, name) for name in CONTACT_FIELDS]).where(
+                key_column.in_(keys)
+            )
+        ).mappings()
+        for match in matches:
+            contacts.setdefault(
+                match["contact_id"],
+                {
+                    "contact_id": match["contact_id"],
+                    "values": {name: match[name] for name in CONTACT_FIELDS},
+                    "new": False,
+                    "dirty": False,
+                    "lead": None,
+                },
+            )
+
+    if contacts:
+        leads = db.execute(
+            select(Lead.lead_id, Lead.contact_id, *[getattr(Lead, name) for name in LEAD_FIELDS]).where(
+                Lead.contact_id.in_(list(contacts))
+            )
+        ).mappings()
+        for match in leads:
+            contacts[match["contact_id"]]["lead"] = {
+                "lead_id": match["lead_id"],
+                "values": {name: match[name] for name in LEAD_FIELDS},
+                "dirty": False,
+            }
+
+    by_email = {entry["values"]["email"]: entry for entry in contacts.values() if entry["values"]["email"]}
+    by_phone = {entry["values"]["phone"]: entry for entry in contacts.values() if entry["values"]["phone"]}
+    # Keys existing contacts give up during the batch; see _plan_row.
+    released: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    return by_email, by_phone, released
+
+
+def _plan_row(
+    state: Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[Tuple[str, str], Dict[str, Any]]],
+    contact_data: Dict[str, Optional[str]],
+    lead_data: Dict[str, Optional[str]],
+) -> Optional[Tuple[Dict[str, Any], str, Dict[str, Any], str]]:
+    """
+    Apply one row to the in-memory contacts the way _get_or_create_contact and
+    _get_or_create_lead would. Returns None, leaving the state untouched, when the
+    row's writes could fail so it has to go through the row-at-a-time path.
+    """
+    by_email, by_phone, released = state
+    keys_by_field = (("email", by_email), ("phone", by_phone))
+    for field, _ in keys_by_field:
+        value = contact_data[field]
+        if value and len(value) > Contact.__table__.c[field].type.length:
+            return None
+
+    email, phone = contact_data["email"], contact_data["phone"]
+    entry = by_email.get(email) if email else None
+    if entry is None and phone:
+        entry = by_phone.get(phone)
+
+    if entry is None:
+        entry = {"contact_id": None, "values": dict(contact_data), "new": True, "dirty": True, "lead": None}
+        contact_status = "created"
+    else:
+        changes = {
+            field: value
+            for field, value in contact_data.items()
+            if value and entry["values"][field] != value
+        }
+        for field, keys in keys_by_field:
+            value = changes.get(field)
+            if not value:
+                continue
+            if keys.get(value, entry) is not entry:
+                return None
+            # One UPDATE statement writes every contact, so an existing contact may
+            # not take a key another existing contact only gives up in this batch.
+            if not entry["new"] and released.get((field, value), entry) is not entry:
+                return None
+        for field, keys in keys_by_field:
+            previous = entry["values"][field]
+            if field in changes and previous:
+                keys.pop(previous, None)
+                if not entry["new"]:
+                    released[(field, previous)] = entry
+        entry["values"].update(changes)
+        entry["dirty"] = entry["dirty"] or bool(changes)
+        contact_status = "updated" if changes else "unchanged"
+
+    for field, keys in keys_by_field:
+        if entry["values"][field]:
+            keys[entry["values"][field]] = entry
+
+    lead = entry["lead"]
+    if lead is None:
+        lead = {"lead_id": None, "values": dict(lead_data), "dirty": True}
+        entry["lead"] = lead
+        lead_status = "created"
+    else:
+        changes = {
+            field: value
+            for field, value in lead_data.items()
+            if value is not None and lead["values"][field] != value
+        }
+        lead["values"].update(changes)
+        lead["dirty"] = lead["dirty"] or bool(changes)
+        lead_status = "updated" if changes else "unchanged"
+
+    return entry, contact_status, lead, lead_status
+
+
+def _update_from_values(
+    db: Session,
+    model: Any,
+    key: Any,
+    fields: Tuple[str, ...],
+    entries: List[Dict[str, Any]],
+) -> None:
+    """
+    UPDATE ... FROM (VALUES ...) writing every entry's values in one statement.
+    """
+    if not entries:
+        return
+    changes = values(
+        column(key.key, Integer),
+        *[column(name, String) for name in fields],
+        name="changes",
+    ).data([(entry[key.key], *[entry["values"][name] for name in fields]) for entry in entries])
+    db.execute(
+        update(model)
+        .where(key == changes.c[key.key])
+        .values({name: changes.c[name] for name in fields})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _write_planned(db: Session, planned: List[Tuple[Any, ...]], results: Dict[str, list]) -> None:
+    """
+    Write the planned rows with one statement per kind of change and a single commit.
+    """
+    if not planned:
+        return
+    contacts = list({id(plan[2]): plan[2] for plan in planned}.values())
+    try:
+        _update_from_values(
+            db,
+            Contact,
+            Contact.contact_id,
+            CONTACT_FIELDS,
+            [entry for entry in contacts if entry["dirty"] and not entry["new"]],
+        )
+        created = [entry for entry in contacts if entry["new"]]
+        if created:
+            contact_ids = db.execute(
+                insert(Contact).returning(Contact.contact_id, sort_by_parameter_order=True),
+                [entry["values"] for entry in created],
+            ).scalars()
+            for entry, contact_id in zip(created, contact_ids):
+                entry["contact_id"] = contact_id
+
+        leads = [entry["lead"] for entry in contacts if entry["lead"]["dirty"]]
+        _update_from_values(
+            db, Lead, Lead.lead_id, LEAD_FIELDS, [lead for lead in leads if lead["lead_id"]]
         )
+        with_new_leads = [entry for entry in contacts if entry["lead"]["lead_id"] is None]
+        if with_new_leads:
+            lead_ids = db.execute(
+                insert(Lead).returning(Lead.lead_id, sort_by_parameter_order=True),
+                [
+                    {"contact_id": entry["contact_id"], **entry["lead"]["values"]}
+                    for entry in with_new_leads
+                ],
+            ).scalars()
+            for entry, lead_id in zip(with_new_leads, lead_ids):
+                entry["lead"]["lead_id"] = lead_id
+
+        db.commit()
+    except Exception:
+        # Something the plan could not foresee, such as a concurrent import taking
+        # the same email: redo these rows one at a time so each gets its own status.
+        db.rollback()
+        for index, row, *_ in planned:
+            _import_row(db, index, row, results)
+        return
+
+    for entry in contacts:
+        entry["new"] = entry["dirty"] = entry["lead"]["dirty"] = False
+    for _, _, entry, contact_status, lead, lead_status in planned:
+        _record(results, contact_status, entry["contact_id"], lead_status, lead["lead_id"])
+
+
+def _import_batch(db: Session, start: int, batch: List[Dict[str, Any]], results: Dict[str, list]) -> None:
+    """
+    Import one parsed batch: three lookups, bulk writes and one commit, instead of
+    queries and a commit per row. Statuses match the row-at-a-time path.
+    """
+    rows = []
+    for index, row in enumerate(batch, start=start):
+        row_values = _row_values(row)
+        if row_values is None:
+            results["skipped"].append({"row": index, "reason": "Missing first_name"})
+        else:
+            rows.append((index, row, row_values))
+
+    state = None
+    planned: List[Tuple[Any, ...]] = []
+    for position, (index, row, (contact_data, lead_data)) in enumerate(rows):
+        if state is None:
+            state = _load_contacts(db, [row_values for _, _, row_values in rows[position:]])
+        plan = _plan_row(state, contact_data, lead_data)
+        if plan is not None:
+            planned.append((index, row, *plan))
+            continue
+        # Earlier rows must land first; the lookups are redone once this row is in.
+        _write_planned(db, planned, results)
+        planned = []
+        _import_row(db, index, row, results)
+        state = None
+    _write_planned(db, planned, results)
 
-    df = _normalize_headers(df)
-    rows = df.to_dict(orient="records")
 
+def _import_batches(
+    db: Session,
+    first_batch: List[Dict[str, Any]],
+    batches: Iterator[List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    Import the rows one batch at a time as the parser produces them.
+    """
     results = {
         "contacts_created": [],
         "contacts_updated": [],
@@ -168,51 +431,20 @@ async def import_csv(
         "errors": [],
     }
 
-    for index, row in enumerate(rows, start=1):
-        first_name = _get_cell(row, "first_name")
-        if not first_name:
-            results["skipped"].append({"row": index, "reason": "Missing first_name"})
-            continue
-
-        contact_data = {
-            "first_name": first_name,
-            "last_name": _get_cell(row, "last_name"),
-            "email": _get_cell(row, "email"),
-            "phone": _get_cell(row, "phone_number") or _get_cell(row, "phone"),
-        }
-
-        lead_data = {
-            "person_type": _get_person_type(row),
-            "business": _get_cell(row, "business"),
-            "website": _get_cell(row, "website"),
-            "license_num": _get_cell(row, "license_num"),
-            "notes": _get_cell(row, "notes"),
-        }
-
+    processed = 0
+    batch = first_batch
+    while batch:
+        _import_batch(db, processed + 1, batch, results)
+        processed += len(batch)
         try:
-            contact, contact_status = _get_or_create_contact(db, contact_data)
-            lead, lead_status = _get_or_create_lead(db, contact.contact_id, lead_data)
-            db.commit()
-
-            if contact_status == "created":
-                results["contacts_created"].append(contact.contact_id)
-            elif contact_status == "updated":
-                results["contacts_updated"].append(contact.contact_id)
-            else:
-                results["contacts_unchanged"].append(contact.contact_id)
-
-            if lead_status == "created":
-                results["leads_created"].append(lead.lead_id)
-            elif lead_status == "updated":
-                results["leads_updated"].append(lead.lead_id)
-            else:
-                results["leads_unchanged"].append(lead.lead_id)
+            batch = next(batches, None)
         except Exception as exc:
-            db.rollback()
-            results["errors"].append({"row": index, "error": str(exc)})
+            # Rows before the bad part of the file are already imported.
+            results["errors"].append({"row": processed + 1, "error": f"Failed to parse file: {exc}"})
+            break
 
     summary = {
-        "message": f"Processed {len(rows)} rows",
+        "message": f"Processed {processed} rows",
         "contacts_created_count": len(results["contacts_created"]),
         "contacts_updated_count": len(results["contacts_updated"]),
         "leads_created_count": len(results["leads_created"]),
@@ -222,3 +454,32 @@ async def import_csv(
     }
 
     return {**summary, **results}
+
+
+@router.post("/import-csv/", tags=["Import CSV"])
+async def import_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    allowed_types = {
+        "text/csv",
+        "application/vnd.ms-excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    }
+    if file.content_type not in allowed_types:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": "Unsupported file type"},
+        )
+
+    # Parse straight from the spooled upload instead of reading it into memory.
+    batches = iter_row_batches(file.file, file.filename, IMPORT_BATCH_ROWS)
+    try:
+        first_batch = await run_in_threadpool(next, batches, [])
+    except Exception as exc:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": f"Failed to parse file: {exc}"},
+        )
+
+    return await run_in_threadpool(_import_batches, db, first_batch, batches)
@@ -1,11 +1,14 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_async_read_db, get_db
+from app.db.query_stats import sql_budget
 from app.db.crud import lead as lead_crud
 from app import schemas
 from app.models.lead import Lead
+from app.utils.pagination import CURSOR_DESCRIPTION, page_response
 
 router = APIRouter(prefix="/leads")
 
@@ -116,23 +119,62 @@ def create_lead(lead_in: schemas.LeadCreate, db: Session = Depends(get_db)):
     return lead_crud.create_lead(db, lead_in)
 
 
+@router.post(
+    "/composite",
+    tags=["Leads"],
+    summary="Create Lead With Contact, Address And Creator",
+    response_model=schemas.LeadPublic,
+    status_code=status.HTTP_201_CREATED,
+)
+@sql_budget(9)
+def create_lead_composite(lead_in: schemas.LeadCompositeCreate, db: Session = Depends(get_db)):
+    return lead_crud.create_leads_composite(db, [lead_in])[0]
+
+
+@router.post(
+    "/batch",
+    tags=["Leads"],
+    summary="Create Many Composite Leads",
+    response_model=List[schemas.LeadPublic],
+    status_code=status.HTTP_201_CREATED,
+)
+@sql_budget(9)
+def create_leads_batch(batch_in: schemas.LeadBatchCreate, db: Session = Depends(get_db)):
+    return lead_crud.create_leads_composite(db, batch_in.leads)
+
+
 @router.get(
     "/",
     tags=["Leads"],
     summary="Get All Leads",
-    response_model=List[schemas.LeadPublic],
+    response_model=Union[List[schemas.LeadPublic], List[schemas.LeadListItem]],
 )
-def list_leads(
+@sql_budget(6)
+async def list_leads(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     lead_ids: Optional[List[int]] = Query(
         None, description="Optional list of lead ids to filter by"
     ),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    view: schemas.LeadView = Query(
+        schemas.LeadView.full,
+        description="`summary` returns flat LeadListItem rows without nested relationships",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    leads = lead_crud.get_leads(db, skip=skip, limit=limit, lead_ids=lead_ids)
-    # return [_serialize_lead(lead) for lead in leads]
-    return leads
+    if view == schemas.LeadView.summary:
+        page = await lead_crud.get_lead_summaries_async(
+            db, skip=skip, limit=limit, lead_ids=lead_ids, cursor=cursor
+        )
+        return [schemas.LeadListItem.model_validate(row) for row in page_response(response, page)]
+
+    page = await lead_crud.get_leads_async(
+        db, skip=skip, limit=limit, lead_ids=lead_ids, cursor=cursor
+    )
+    # Validate here so the response union matches on model type, not field overlap.
+    return [schemas.LeadPublic.model_validate(lead) for lead in page_response(response, page)]
 
 
 @router.get(
@@ -141,7 +183,20 @@ def list_leads(
     summary="Read Lead By Id",
     response_model=schemas.LeadPublic,
 )
-def read_lead(lead_id: int, db: Session = Depends(get_db)):
+@sql_budget(4)
+async def read_lead(lead_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    lead = await lead_crud.get_lead_by_id_async(db, lead_id=lead_id)
+    if not lead:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found"
+        )
+    return lead
+
+
+def _read_lead(lead_id: int, db: Session):
+    """
+    Reload a lead after a link/unlink on the sync session that made the change.
+    """
     lead = lead_crud.get_lead_by_id(db, lead_id=lead_id)
     if not lead:
         raise HTTPException(
@@ -191,7 +246,7 @@ def link_property(lead_id: int, property_id: int, db: Session = Depends(get_db))
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found after update"
         )
     # reuse read_lead serialization
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.delete(
@@ -207,7 +262,7 @@ def unlink_property(lead_id: int, property_id: int, db: Session = Depends(get_db
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or Property not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.post(
@@ -221,7 +276,7 @@ def link_user(lead_id: int, user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or User not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.delete(
@@ -235,7 +290,7 @@ def unlink_user(lead_id: int, user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or User not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.post(
@@ -249,7 +304,7 @@ def link_contact(lead_id: int, contact_id: int, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or Contact not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.delete(
@@ -265,7 +320,7 @@ def unlink_contact(lead_id: int, contact_id: int, db: Session = Depends(get_db))
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or Contact not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.post(
@@ -279,7 +334,7 @@ def link_address(lead_id: int, address_id: int, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or Address not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
 
 
 @router.delete(
@@ -295,4 +350,4 @@ def unlink_address(lead_id: int, address_id: int, db: Session = Depends(get_db))
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead or Address not found"
         )
-    return read_lead(lead_id, db)
+    return _read_lead(lead_id, db)
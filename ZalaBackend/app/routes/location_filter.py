@@ -1,22 +1,49 @@
+from bisect import bisect_right
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import json
+import os
 import re
 from decimal import Decimal, InvalidOperation
-from math import atan2, cos, radians, sin, sqrt
 
-from fastapi import APIRouter, BackgroundTasks, Depends
-from sqlalchemy import func
-from sqlalchemy.exc import IntegrityError
+import numpy as np
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.db.session import SessionLocal, get_db
+from app.db.session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_read_session_factory,
+    get_async_read_db,
+)
 from app.models.address import Address
 from app.models.contact import Contact
 from app.models.lead import Lead
 from app.models.property import Property
 from app.schemas.location import DataSource, LeadSearchRequest, LocationFilter
+from app.services.lead_index import ensure_lead_index_async, lead_index
+from app.services.provider_fanout import (
+    COMPLETED,
+    ProviderOutcome,
+    fan_out,
+    fan_out_as_completed,
+)
+from app.services.search_cache import search_cache, search_key
+from app.utils import gazetteer
+from app.utils.distance import rank_by_distance
 from app.utils.geocode import geocode_location
+from app.utils.geocode_cache import normalize_query
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.single_flight import SingleFlight
 from app.external_api import google_places, openai_api, rapidapi
 
 
@@ -29,12 +56,30 @@ _ALLOWED_EXTERNAL_SOURCES = {
     DataSource.google_places,
 }
 
+# Upper bound on how many leads each provider is asked for per search.
+_PROVIDER_MAX_RESULTS = int(os.getenv("SEARCH_PROVIDER_MAX_RESULTS", "50"))
+
 _DEFAULT_EXTERNAL_SOURCES: List[DataSource] = [
     DataSource.google_places,
     DataSource.rapidapi,
     DataSource.gpt,
 ]
 
+# Blocking providers share one per-request deadline; each also has its own budget.
+# Providers that miss it keep running and persist their leads in the background.
+_SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", "8"))
+_PROVIDER_BUDGET_SECONDS: Dict[str, float] = {
+    DataSource.google_places.value: float(
+        os.getenv("SEARCH_BUDGET_GOOGLE_PLACES_SECONDS", "8")
+    ),
+    DataSource.rapidapi.value: float(os.getenv("SEARCH_BUDGET_RAPIDAPI_SECONDS", "6")),
+    DataSource.gpt.value: float(os.getenv("SEARCH_BUDGET_GPT_SECONDS", "8")),
+}
+
+# Identical concurrent provider fetches (same location and source) run once and share
+# the persistence result, so parallel searches don't pay for or insert leads twice.
+external_search_flight = SingleFlight("external_search")
+
 
 class LocationResolutionError(RuntimeError):
     """Raised when input data is insufficient to resolve a usable location."""
@@ -52,19 +97,6 @@ class ExternalProviderError(RuntimeError):
         self.message = message
 
 
-def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Compute miles between two lat/long pairs."""
-    R = 3958.8  # miles
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = (
-        sin(dlat / 2) ** 2
-        + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
-    )
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
-
-
 def _build_location_query(filter: LocationFilter) -> Optional[str]:
     location_text = (filter.location_text or "").strip()
     if not location_text:
@@ -77,16 +109,41 @@ def _build_location_query(filter: LocationFilter) -> Optional[str]:
     return location_text
 
 
+def _required_location_query(filter: LocationFilter) -> str:
+    location_query = _build_location_query(filter)
+    if not location_query:
+        raise LocationResolutionError("No valid location input provided")
+    return location_query
+
+
 def _resolve_location(
     filter: LocationFilter,
     source_label: Optional[str] = None,
 ) -> Tuple[float, float, Dict[str, object], str]:
-    location_query = _build_location_query(filter)
+    location_query = _required_location_query(filter)
+
+    # ZIPs and "City, ST" resolve from the bundled gazetteer; only free-form text
+    # goes out to the network geocoder.
+    geocoded = gazetteer.resolve(location_query) or geocode_location(location_query)
+    return _geocoded_location(geocoded, location_query, source_label)
 
-    if not location_query:
-        raise LocationResolutionError("No valid location input provided")
 
-    geocoded = geocode_location(location_query)
+async def _resolve_location_async(
+    filter: LocationFilter,
+    source_label: Optional[str] = None,
+) -> Tuple[float, float, Dict[str, object], str]:
+    location_query = _required_location_query(filter)
+    geocoded = gazetteer.resolve(location_query) or await run_in_threadpool(
+        geocode_location, location_query
+    )
+    return _geocoded_location(geocoded, location_query, source_label)
+
+
+def _geocoded_location(
+    geocoded: Optional[Dict[str, object]],
+    location_query: str,
+    source_label: Optional[str],
+) -> Tuple[float, float, Dict[str, object], str]:
     if not geocoded:
         raise LocationResolutionError("Geocoding failed")
 
@@ -372,7 +429,7 @@ def _find_existing_lead(db: Session, candidate: Dict[str, object]) -> Optional[L
             existing = (
                 db.query(Lead)
                 .join(Contact, Lead.contact_id == Contact.contact_id)
-                .filter(func.lower(Contact.email) == email_norm)
+                .filter(Contact.email_normalized == email_norm)
                 .first()
             )
             if existing:
@@ -383,9 +440,7 @@ def _find_existing_lead(db: Session, candidate: Dict[str, object]) -> Optional[L
             existing = (
                 db.query(Lead)
                 .join(Contact, Lead.contact_id == Contact.contact_id)
-                .filter(
-                    func.regexp_replace(Contact.phone, r"\D", "", "g") == phone_digits
-                )
+                .filter(Contact.phone_digits == phone_digits)
                 .first()
             )
             if existing:
@@ -417,9 +472,7 @@ def _find_existing_lead(db: Session, candidate: Dict[str, object]) -> Optional[L
     return None
 
 
-def _create_contact_from_payload(
-    db: Session, payload: Dict[str, object]
-) -> Optional[Contact]:
+def _contact_values(payload: Dict[str, object]) -> Optional[Dict[str, object]]:
     contact_data = _extract_contact_dict(payload)
     if not contact_data:
         return None
@@ -431,35 +484,77 @@ def _create_contact_from_payload(
     if not meaningful:
         return None
 
-    email_norm = _normalize_str(contact_data.get("email"))
-    phone_digits = _normalize_phone(contact_data.get("phone"))
+    first_name = (
+        contact_data.get("first_name")
+        or contact_data.get("last_name")
+        or payload.get("business")
+        or "Unknown"
+    )
+    return {
+        "first_name": first_name,
+        "last_name": contact_data.get("last_name"),
+        "email": contact_data.get("email"),
+        "phone": contact_data.get("phone"),
+    }
+
+
+def _address_values(payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+    address_data = _as_address_dict(payload.get("address"))
+    if not address_data:
+        return None
+
+    street_1 = (
+        address_data.get("street_1")
+        or address_data.get("city")
+        or payload.get("business")
+        or "Unknown"
+    )
+    return {
+        "street_1": street_1,
+        "street_2": address_data.get("street_2"),
+        "city": address_data.get("city") or street_1 or "Unknown",
+        "state": address_data.get("state") or "NA",
+        "zipcode": address_data.get("zipcode") or "00000",
+        "lat": _decimal_or_none(address_data.get("lat")),
+        "long": _decimal_or_none(address_data.get("long")),
+    }
+
+
+def _lead_values(payload: Dict[str, object]) -> Dict[str, object]:
+    return {
+        "person_type": payload.get("person_type"),
+        "business": payload.get("business"),
+        "website": payload.get("website"),
+        "license_num": payload.get("license_num"),
+        "notes": payload.get("notes"),
+    }
+
+
+def _create_contact_from_payload(
+    db: Session, payload: Dict[str, object]
+) -> Optional[Contact]:
+    values = _contact_values(payload)
+    if not values:
+        return None
+
+    email_norm = _normalize_str(values["email"])
+    phone_digits = _normalize_phone(values["phone"])
 
     existing_contact = None
     if email_norm:
         existing_contact = (
-            db.query(Contact).filter(func.lower(Contact.email) == email_norm).first()
+            db.query(Contact).filter(Contact.email_normalized == email_norm).first()
         )
     if not existing_contact and phone_digits:
         existing_contact = (
             db.query(Contact)
-            .filter(func.regexp_replace(Contact.phone, r"\D", "", "g") == phone_digits)
+            .filter(Contact.phone_digits == phone_digits)
             .first()
         )
     if existing_contact:
         return existing_contact
 
-    first_name = (
-        contact_data.get("first_name")
-        or contact_data.get("last_name")
-        or payload.get("business")
-        or "Unknown"
-    )
-    contact = Contact(
-        first_name=first_name,
-        last_name=contact_data.get("last_name"),
-        email=contact_data.get("email"),
-        phone=contact_data.get("phone"),
-    )
+    contact = Contact(**values)
     db.add(contact)
     db.flush()
     return contact
@@ -468,29 +563,11 @@ def _create_contact_from_payload(
 def _create_address_from_payload(
     db: Session, payload: Dict[str, object]
 ) -> Optional[Address]:
-    address_data = _as_address_dict(payload.get("address"))
-    if not address_data:
+    values = _address_values(payload)
+    if not values:
         return None
 
-    street_1 = (
-        address_data.get("street_1")
-        or address_data.get("city")
-        or payload.get("business")
-        or "Unknown"
-    )
-    city = address_data.get("city") or street_1 or "Unknown"
-    state = address_data.get("state") or "NA"
-    zipcode = address_data.get("zipcode") or "00000"
-
-    address = Address(
-        street_1=street_1,
-        street_2=address_data.get("street_2"),
-        city=city,
-        state=state,
-        zipcode=zipcode,
-        lat=_decimal_or_none(address_data.get("lat")),
-        long=_decimal_or_none(address_data.get("long")),
-    )
+    address = Address(**values)
     db.add(address)
     db.flush()
     return address
@@ -503,17 +580,17 @@ def _create_lead_from_payload(
         contact = _create_contact_from_payload(db, payload)
         address = _create_address_from_payload(db, payload)
         db_lead = Lead(
-            person_type=payload.get("person_type"),
-            business=payload.get("business"),
-            website=payload.get("website"),
-            license_num=payload.get("license_num"),
-            notes=payload.get("notes"),
+            **_lead_values(payload),
             contact_id=contact.contact_id if contact else None,
             address_id=address.address_id if address else None,
         )
         db.add(db_lead)
         db.commit()
         db.refresh(db_lead)
+        if address and address.lat is not None and address.long is not None:
+            point = (float(address.lat), float(address.long))
+            lead_index.replace_lead(db_lead.lead_id, [point])
+            search_cache.invalidate_points([point])
         return db_lead
     except IntegrityError:
         db.rollback()
@@ -523,21 +600,28 @@ def _create_lead_from_payload(
         raise
 
 
-def _persist_external_leads(
-    db: Session, leads: List[Dict[str, object]]
+def _persist_external_leads_rowwise(
+    db: Session,
+    candidates: List[Dict[str, object]],
+    inserted_ids: Optional[List[int]] = None,
 ) -> Dict[str, int]:
+    """
+    One lead at a time, each in its own transaction. Used as the fallback when the
+    batch path hits a database error.
+    """
     inserted = 0
     duplicates = 0
     failed = 0
 
-    for lead in leads or []:
-        candidate = lead if isinstance(lead, dict) else _model_to_dict(lead)
+    for candidate in candidates:
         if _find_existing_lead(db, candidate):
             duplicates += 1
             continue
         created = _create_lead_from_payload(db, candidate)
         if created:
             inserted += 1
+            if inserted_ids is not None:
+                inserted_ids.append(created.lead_id)
         else:
             failed += 1
 
@@ -548,16 +632,350 @@ def _persist_external_leads(
     }
 
 
+BusinessKey = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+def _business_key(
+    business: object, address: Optional[Dict[str, object]]
+) -> Optional[BusinessKey]:
+    business_norm = _normalize_str(business if isinstance(business, str) else None)
+    if not business_norm or not address:
+        return None
+    return (
+        business_norm,
+        _normalize_str(address.get("street_1")),
+        _normalize_str(address.get("city")),
+        _normalize_str(address.get("state")),
+    )
+
+
+def _business_key_matches(candidate: BusinessKey, existing: BusinessKey) -> bool:
+    # Missing candidate parts match anything, like the optional filters of
+    # _find_existing_lead.
+    if candidate[0] != existing[0]:
+        return False
+    return all(
+        part is None or part == other for part, other in zip(candidate[1:], existing[1:])
+    )
+
+
+def _allocate_ids(db: Session, table: str, column: str, count: int) -> List[int]:
+    """
+    Reserve `count` primary keys from the table's serial sequence in one round trip,
+    so rows can be linked before they are inserted.
+    """
+    if not count:
+        return []
+    return list(
+        db.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence(:table, :column)) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"table": table, "column": column, "count": count},
+        ).scalars()
+    )
+
+
+def _persist_external_leads(
+    db: Session,
+    leads: List[Dict[str, object]],
+    inserted_ids: Optional[List[int]] = None,
+) -> Dict[str, int]:
+    """
+    Persist a provider batch with set-based queries in a single transaction.
+
+    Existing contacts and leads are resolved with two lookups (emails/phone digits and
+    business/address keys), duplicates inside the batch are detected in memory with the
+    same rules as `_find_existing_lead`, and the new contacts, addresses and leads are
+    bulk-inserted. Rows that lose a race with a concurrent writer are skipped by
+    ON CONFLICT DO NOTHING and counted as failed.
+    """
+    candidates = [
+        lead if isinstance(lead, dict) else _model_to_dict(lead) for lead in leads or []
+    ]
+    if not candidates:
+        return {"inserted": 0, "duplicates": 0, "failed": 0}
+
+    try:
+        return _persist_external_leads_batch(db, candidates, inserted_ids)
+    except SQLAlchemyError as exc:
+        db.rollback()
+        print(f"Batch lead persistence failed, retrying row by row: {exc}")
+        return _persist_external_leads_rowwise(db, candidates, inserted_ids)
+
+
+def _persist_external_leads_batch(
+    db: Session,
+    candidates: List[Dict[str, object]],
+    inserted_ids: Optional[List[int]] = None,
+) -> Dict[str, int]:
+    contact_keys = [
+        (
+            _normalize_str(contact.get("email")),
+            _normalize_phone(contact.get("phone")),
+        )
+        for contact in (_extract_contact_dict(c) or {} for c in candidates)
+    ]
+    emails = {email for email, _ in contact_keys if email}
+    phones = {phone for _, phone in contact_keys if phone}
+    businesses = {
+        key[0]
+        for key in (
+            _business_key(c.get("business"), _as_address_dict(c.get("address")))
+            for c in candidates
+        )
+        if key
+    }
+
+    # Contacts are indexed by normalized email / phone digits. Each entry is a dict
+    # shared by both maps: {"contact_id", "email", "phone", "has_lead", "values"}.
+    contacts_by_email: Dict[str, Dict[str, Any]] = {}
+    contacts_by_phone: Dict[str, Dict[str, Any]] = {}
+    if emails or phones:
+        predicates = []
+        if emails:
+            predicates.append(Contact.email_normalized.in_(emails))
+        if phones:
+            predicates.append(Contact.phone_digits.in_(phones))
+        rows = db.execute(
+            select(
+                Contact.contact_id,
+                Contact.email_normalized,
+                Contact.phone_digits,
+                Lead.lead_id,
+            )
+            .outerjoin(Lead, Lead.contact_id == Contact.contact_id)
+            .where(or_(*predicates))
+            .order_by(Contact.contact_id)
+        ).all()
+        for contact_id, email, phone, lead_id in rows:
+            entry = {
+                "contact_id": contact_id,
+                "email": email or None,
+                "phone": phone or None,
+                "has_lead": lead_id is not None,
+                "values": None,
+            }
+            if entry["email"]:
+                existing = contacts_by_email.setdefault(entry["email"], entry)
+                existing["has_lead"] = existing["has_lead"] or entry["has_lead"]
+            if entry["phone"]:
+                existing = contacts_by_phone.setdefault(entry["phone"], entry)
+                existing["has_lead"] = existing["has_lead"] or entry["has_lead"]
+
+    business_rows: List[BusinessKey] = []
+    if businesses:
+        business_rows = [
+            tuple(row)
+            for row in db.execute(
+                select(
+                    func.lower(Lead.business),
+                    func.lower(Address.street_1),
+                    func.lower(Address.city),
+                    func.lower(Address.state),
+                )
+                .outerjoin(Address, Lead.address_id == Address.address_id)
+                .where(func.lower(Lead.business).in_(businesses))
+            ).all()
+        ]
+
+    duplicates = 0
+    plans: List[Dict[str, Any]] = []
+    for candidate, (email, phone) in zip(candidates, contact_keys):
+        email_entry = contacts_by_email.get(email) if email else None
+        phone_entry = contacts_by_phone.get(phone) if phone else None
+        if (email_entry and email_entry["has_lead"]) or (
+            phone_entry and phone_entry["has_lead"]
+        ):
+            duplicates += 1
+            continue
+        business_key = _business_key(
+            candidate.get("business"), _as_address_dict(candidate.get("address"))
+        )
+        if business_key and any(
+            _business_key_matches(business_key, row) for row in business_rows
+        ):
+            duplicates += 1
+            continue
+
+        contact_entry = None
+        contact_values = _contact_values(candidate)
+        if contact_values:
+            contact_entry = email_entry or phone_entry
+            if contact_entry is None:
+                contact_entry = {
+                    "contact_id": None,
+                    "email": email,
+                    "phone": phone,
+                    "has_lead": False,
+                    "values": contact_values,
+                }
+            # Later candidates sharing this contact's email or phone are duplicates.
+            contact_entry["has_lead"] = True
+            if contact_entry["email"]:
+                contacts_by_email.setdefault(contact_entry["email"], contact_entry)
+            if contact_entry["phone"]:
+                contacts_by_phone.setdefault(contact_entry["phone"], contact_entry)
+
+        address_values = _address_values(candidate)
+        inserted_key = _business_key(candidate.get("business"), address_values)
+        if inserted_key:
+            business_rows.append(inserted_key)
+        plans.append(
+            {
+                "contact": contact_entry,
+                "address": address_values,
+                "lead": _lead_values(candidate),
+            }
+        )
+
+    failed = 0
+    new_contacts = [
+        plan["contact"]
+        for plan in plans
+        if plan["contact"] is not None and plan["contact"]["contact_id"] is None
+    ]
+    for entry, contact_id in zip(
+        new_contacts, _allocate_ids(db, "contacts", "contact_id", len(new_contacts))
+    ):
+        entry["contact_id"] = contact_id
+    landed_contacts = set()
+    if new_contacts:
+        landed_contacts = set(
+            db.execute(
+                pg_insert(Contact)
+                .values(
+                    [{"contact_id": e["contact_id"], **e["values"]} for e in new_contacts]
+                )
+                .on_conflict_do_nothing()
+                .returning(Contact.contact_id)
+            ).scalars()
+        )
+    new_contact_ids = {entry["contact_id"] for entry in new_contacts}
+
+    surviving = []
+    for plan in plans:
+        entry = plan["contact"]
+        if (
+            entry is not None
+            and entry["contact_id"] in new_contact_ids
+            and entry["contact_id"] not in landed_contacts
+        ):
+            failed += 1
+        else:
+            surviving.append(plan)
+
+    with_address = [plan for plan in surviving if plan["address"] is not None]
+    for plan, address_id in zip(
+        with_address, _allocate_ids(db, "addresses", "address_id", len(with_address))
+    ):
+        plan["address_id"] = address_id
+    if with_address:
+        db.execute(
+            pg_insert(Address).values(
+                [{"address_id": p["address_id"], **p["address"]} for p in with_address]
+            )
+        )
+
+    for plan, lead_id in zip(
+        surviving, _allocate_ids(db, "leads", "lead_id", len(surviving))
+    ):
+        plan["lead_id"] = lead_id
+    landed_leads = set()
+    if surviving:
+        landed_leads = set(
+            db.execute(
+                pg_insert(Lead)
+                .values(
+                    [
+                        {
+                            "lead_id": plan["lead_id"],
+                            **plan["lead"],
+                            "contact_id": (
+                                plan["contact"]["contact_id"] if plan["contact"] else None
+                            ),
+                            "address_id": plan.get("address_id"),
+                        }
+                        for plan in surviving
+                    ]
+                )
+                .on_conflict_do_nothing()
+                .returning(Lead.lead_id)
+            ).scalars()
+        )
+
+    lost = [plan for plan in surviving if plan["lead_id"] not in landed_leads]
+    if lost:
+        # A concurrent writer claimed the contact or address first; drop what this
+        # batch created for those leads so nothing is left orphaned.
+        failed += len(lost)
+        orphan_addresses = [p["address_id"] for p in lost if p.get("address_id")]
+        orphan_contacts = [
+            p["contact"]["contact_id"]
+            for p in lost
+            if p["contact"] and p["contact"]["contact_id"] in landed_contacts
+        ]
+        if orphan_addresses:
+            db.execute(delete(Address).where(Address.address_id.in_(orphan_addresses)))
+        if orphan_contacts:
+            db.execute(delete(Contact).where(Contact.contact_id.in_(orphan_contacts)))
+
+    db.commit()
+
+    points = []
+    for plan in surviving:
+        if plan["lead_id"] not in landed_leads:
+            continue
+        if inserted_ids is not None:
+            inserted_ids.append(plan["lead_id"])
+        address = plan["address"]
+        if address and address["lat"] is not None and address["long"] is not None:
+            point = (float(address["lat"]), float(address["long"]))
+            lead_index.replace_lead(plan["lead_id"], [point])
+            points.append(point)
+    if points:
+        search_cache.invalidate_points(points)
+
+    return {
+        "inserted": len(landed_leads),
+        "duplicates": duplicates,
+        "failed": failed,
+    }
+
+
+def _external_search_key(request: LeadSearchRequest, source: DataSource) -> str:
+    return (
+        f"{source.value}:{normalize_query(request.location_text)}"
+        f"|{request.radius_miles:g}"
+    )
+
+
 def _search_and_persist_external_source(
     request: LeadSearchRequest, source: DataSource
-) -> Dict[str, int]:
+) -> Tuple[Dict[str, int], List[int]]:
     """
     Fetch leads from an external provider and persist them using an isolated DB session.
+    Returns the persistence counts and the ids of the newly inserted leads. Concurrent
+    calls for the same location and source share a single execution.
     """
+    return external_search_flight.do(
+        _external_search_key(request, source),
+        lambda: _run_external_source(request, source),
+    )
+
+
+def _run_external_source(
+    request: LeadSearchRequest, source: DataSource
+) -> Tuple[Dict[str, int], List[int]]:
     ext_result = _perform_external_search(request, source)
     session = SessionLocal()
+    inserted_ids: List[int] = []
     try:
-        return _persist_external_leads(session, ext_result.get("leads", []))
+        persistence = _persist_external_leads(
+            session, ext_result.get("leads", []), inserted_ids
+        )
+        return persistence, inserted_ids
     except Exception:
         session.rollback()
         raise
@@ -566,56 +984,92 @@ def _search_and_persist_external_source(
 
 
 def _background_source_search(request: LeadSearchRequest, source: DataSource) -> None:
+    if external_search_flight.in_flight(_external_search_key(request, source)):
+        # Another request is already fetching this location from the same provider.
+        external_search_flight.record_skip()
+        return
     try:
         _search_and_persist_external_source(request, source)
     except Exception as exc:
         print(f"Background fetch for {source.value} failed: {exc}")
 
 
-def _perform_db_search(filter: LocationFilter, db: Session) -> Dict[str, object]:
-    lat, lon, normalized_location, _ = _resolve_location(filter, DataSource.db.value)
-    radius_miles = 50.0
+def _decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    """
+    Turn a search cursor back into the (distance, lead_id) key of the last lead served.
+    """
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return float(values["distance"]), int(values["lead_id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
 
-    lat_delta = radius_miles / 69.0
-    lon_denominator = max(0.0001, cos(radians(lat)) * 69.172)
-    lon_delta = radius_miles / lon_denominator
 
-    lat_min = lat - lat_delta
-    lat_max = lat + lat_delta
-    lon_min = lon - lon_delta
-    lon_max = lon + lon_delta
+def _validate_search_cursor(request: LeadSearchRequest) -> None:
+    try:
+        _decode_search_cursor(request.cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
-    candidate_ids: Set[int] = set()
 
-    lead_rows = (
-        db.query(Lead.lead_id)
-        .join(Address, Lead.address_id == Address.address_id)
-        .filter(Address.lat.isnot(None), Address.long.isnot(None))
-        .filter(Address.lat.between(lat_min, lat_max))
-        .filter(Address.long.between(lon_min, lon_max))
-        .all()
+async def _perform_db_search(
+    filter: LeadSearchRequest, db: AsyncSession
+) -> Dict[str, object]:
+    radius_miles = filter.radius_miles
+    page_size = filter.page_size
+    cache_key = search_key(filter.location_text, radius_miles, page_size, filter.cursor)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    after = _decode_search_cursor(filter.cursor)
+    generation = search_cache.generation
+    lat, lon, normalized_location, _ = await _resolve_location_async(
+        filter, DataSource.db.value
     )
-    candidate_ids.update(row[0] for row in lead_rows)
-
-    property_rows = (
-        db.query(Property.lead_id)
-        .join(Address, Property.address_id == Address.address_id)
-        .filter(Address.lat.isnot(None), Address.long.isnot(None))
-        .filter(Address.lat.between(lat_min, lat_max))
-        .filter(Address.long.between(lon_min, lon_max))
-        .all()
+
+    # Hits are ordered by (distance, lead_id), which is also the keyset of the cursor.
+    hits = (await ensure_lead_index_async()).query_radius(lat, lon, radius_miles)
+    start = bisect_right(hits, after, key=lambda hit: (hit[1], hit[0])) if after else 0
+    page = hits[start:start + page_size]
+    next_cursor = None
+    if start + page_size < len(hits):
+        last_id, last_distance = page[-1]
+        next_cursor = encode_cursor({"distance": last_distance, "lead_id": last_id})
+
+    nearby_leads = await _serialize_hits(db, page)
+    result = {
+        "leads": nearby_leads,
+        "normalized_location": normalized_location,
+        "radius_miles": radius_miles,
+        "total_in_radius": len(hits),
+        "next_cursor": next_cursor,
+    }
+    search_cache.put(
+        cache_key,
+        (lat, lon),
+        radius_miles,
+        [lead["lead_id"] for lead in nearby_leads],
+        result,
+        generation,
     )
-    candidate_ids.update(row[0] for row in property_rows if row[0] is not None)
+    return result
 
-    if not candidate_ids:
-        return {
-            "leads": [],
-            "normalized_location": normalized_location,
-            "radius_miles": radius_miles,
-        }
 
-    leads = (
-        db.query(Lead)
+async def _serialize_hits(
+    db: AsyncSession, hits: List[Tuple[int, float]]
+) -> List[Dict[str, object]]:
+    """
+    Hydrate and serialize (lead_id, distance) index hits, keeping their order.
+    """
+    if not hits:
+        return []
+
+    # Only the final hits are hydrated; distances come straight from the index.
+    result = await db.execute(
+        select(Lead)
         .options(
             joinedload(Lead.address),
             joinedload(Lead.contact),
@@ -623,47 +1077,23 @@ def _perform_db_search(filter: LocationFilter, db: Session) -> Dict[str, object]
             selectinload(Lead.properties).joinedload(Property.address),
             selectinload(Lead.properties).selectinload(Property.units),
         )
-        .filter(Lead.lead_id.in_(list(candidate_ids)))
-        .all()
+        .where(Lead.lead_id.in_([lead_id for lead_id, _ in hits]))
     )
+    leads = result.unique().scalars().all()
+    leads_by_id = {lead.lead_id: lead for lead in leads}
 
-    nearby_leads: List[Dict[str, object]] = []
-    for lead in leads:
-        candidate_distances: List[float] = []
-
-        if getattr(lead, "address", None):
-            addr = lead.address
-            if addr.lat is not None and addr.long is not None:
-                candidate_distances.append(
-                    haversine(lat, lon, float(addr.lat), float(addr.long))
-                )
-
-        for prop in getattr(lead, "properties", []) or []:
-            prop_addr = getattr(prop, "address", None)
-            if prop_addr and prop_addr.lat is not None and prop_addr.long is not None:
-                candidate_distances.append(
-                    haversine(lat, lon, float(prop_addr.lat), float(prop_addr.long))
-                )
-
-        if not candidate_distances:
-            continue
-
-        best_distance = min(candidate_distances)
-        if best_distance <= radius_miles:
-            nearby_leads.append(_serialize_lead(lead, round(best_distance, 2)))
-
-    return {
-        "leads": nearby_leads,
-        "normalized_location": normalized_location,
-        "radius_miles": radius_miles,
-    }
+    return [
+        _serialize_lead(leads_by_id[lead_id], round(distance, 2))
+        for lead_id, distance in hits
+        if lead_id in leads_by_id
+    ]
 
 
 def _perform_external_search(
-    filter: LocationFilter, source: DataSource
+    filter: LeadSearchRequest, source: DataSource
 ) -> Dict[str, object]:
-    radius_miles = 50.0
-    max_results = 50
+    radius_miles = filter.radius_miles
+    max_results = _PROVIDER_MAX_RESULTS
     gpt_max_searches = 10
 
     filter_for_location, dynamic_filter = _prepare_external_filter(filter)
@@ -740,6 +1170,8 @@ def _perform_external_search(
     if geocode_targets:
         _bulk_geocode_strings(geocode_targets, geo_cache)
 
+    point_lats: List[Optional[float]] = []
+    point_lons: List[Optional[float]] = []
     for entry in processed_entries:
         lead_dict = entry["lead_dict"]
         address_value = entry["address_value"]
@@ -748,7 +1180,8 @@ def _perform_external_search(
         geocode_key = entry.get("geocode_key")
         geocoded_address = geo_cache.get(geocode_key) if geocode_key else None
 
-        distance: Optional[float] = None
+        point_lat: Optional[float] = None
+        point_lon: Optional[float] = None
 
         if isinstance(address_value, dict):
             if (addr_lat is None or addr_lon is None) and geocoded_address:
@@ -768,42 +1201,32 @@ def _perform_external_search(
                     address_value["state"] = geocoded_address["state"]
 
             if addr_lat is not None and addr_lon is not None:
-                distance = haversine(lat, lon, addr_lat, addr_lon)
-                geocoded_address = geocoded_address or {
-                    "latitude": addr_lat,
-                    "longitude": addr_lon,
-                    "city": address_value.get("city"),
-                    "state": address_value.get("state"),
-                    "zip": address_value.get("zipcode"),
-                }
+                point_lat, point_lon = addr_lat, addr_lon
 
             lead_dict["address"] = address_value
         elif geocoded_address:
             geocoded_lat = _coerce_float(geocoded_address.get("latitude"))
             geocoded_lon = _coerce_float(geocoded_address.get("longitude"))
             if geocoded_lat is not None and geocoded_lon is not None:
-                distance = haversine(lat, lon, geocoded_lat, geocoded_lon)
+                point_lat, point_lon = geocoded_lat, geocoded_lon
 
-        if distance is not None and distance > radius_miles:
-            continue
+        lead_dict.pop("geocoded_address", None)
+        lead_dict["source"] = source.value
+        point_lats.append(point_lat)
+        point_lons.append(point_lon)
 
+    # Leads without coordinates are kept and ranked after every located lead.
+    ranking = rank_by_distance(
+        lat, lon, point_lats, point_lons, radius_miles, keep_missing=True
+    )
+    for idx in ranking.order:
+        lead_dict = processed_entries[idx]["lead_dict"]
+        distance = ranking.distances[idx]
         lead_dict["distance_miles"] = (
-            round(distance, 2) if distance is not None else None
+            None if np.isnan(distance) else round(float(distance), 2)
         )
-        lead_dict.pop("geocoded_address", None)
-        lead_dict["source"] = source.value
         response_leads.append(lead_dict)
 
-    response_leads.sort(
-        key=lambda item: (
-            item.get("distance_miles") is None,
-            (
-                item.get("distance_miles")
-                if item.get("distance_miles") is not None
-                else float("inf")
-            ),
-        )
-    )
     trimmed_leads = response_leads[:max_results]
 
     response: Dict[str, object] = {
@@ -816,86 +1239,268 @@ def _perform_external_search(
     return response
 
 
+def _plan_external_sources(
+    request: LeadSearchRequest, db_has_results: bool
+) -> Tuple[List[DataSource], List[DataSource]]:
+    """
+    Split the external sources into ones the request waits on and ones fetched in the
+    background. GPT is always backgrounded; the rest only block when the DB had nothing.
+    Follow-up pages (requests with a cursor) don't query providers again.
+    """
+    blocking_sources: List[DataSource] = []
+    background_sources: List[DataSource] = []
+    if request.cursor:
+        return blocking_sources, background_sources
+    for source in _DEFAULT_EXTERNAL_SOURCES:
+        if source not in _ALLOWED_EXTERNAL_SOURCES:
+            continue
+        if source == DataSource.gpt or db_has_results:
+            background_sources.append(source)
+        else:
+            blocking_sources.append(source)
+    return blocking_sources, background_sources
+
+
+def _external_error_message(exc: Exception) -> str:
+    if isinstance(exc, LocationResolutionError):
+        return exc.message
+    if isinstance(exc, ExternalProviderError):
+        return f"External provider request failed: {exc.message}"
+    return f"Unexpected error: {exc}"
+
+
+def _queue_background_sources(
+    request: LeadSearchRequest,
+    sources: List[DataSource],
+    background_tasks: BackgroundTasks,
+    external_persistence: Dict[str, Dict[str, object]],
+) -> None:
+    for source in sources:
+        if external_search_flight.in_flight(_external_search_key(request, source)):
+            external_search_flight.record_skip()
+            external_persistence[source.value] = {"status": "in_progress"}
+            continue
+        background_tasks.add_task(_background_source_search, request, source)
+        external_persistence[source.value] = {"status": "queued"}
+
+
+def _blocking_calls(
+    request: LeadSearchRequest, sources: List[DataSource]
+) -> Dict[str, Any]:
+    return {
+        source.value: (
+            lambda source=source: _search_and_persist_external_source(request, source)
+        )
+        for source in sources
+    }
+
+
+def _record_outcome(
+    outcome: ProviderOutcome,
+    external_persistence: Dict[str, Dict[str, object]],
+    errors: Dict[str, str],
+) -> List[int]:
+    """
+    Fold a provider outcome into the response maps; returns the inserted lead ids.
+    """
+    if outcome.status == COMPLETED:
+        persistence, inserted_ids = outcome.result
+        external_persistence[outcome.name] = persistence
+        return inserted_ids
+    if outcome.error is not None:
+        errors[outcome.name] = _external_error_message(outcome.error)
+    else:
+        external_persistence[outcome.name] = {"status": "in_progress"}
+    return []
+
+
 @router.post("/searchLeads", summary="Search Lead Combined", tags=["Search Lead"])
-def search_leads(
+async def search_leads(
     request: LeadSearchRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
+    _validate_search_cursor(request)
     errors: Dict[str, str] = {}
     external_persistence: Dict[str, Dict[str, object]] = {}
+    provider_deadlines: Dict[str, Dict[str, object]] = {}
 
     aggregated_leads: List[Dict[str, object]] = []
+    next_cursor: Optional[str] = None
     try:
-        db_result = _perform_db_search(request, db)
+        db_result = await _perform_db_search(request, db)
         aggregated_leads = db_result.get("leads", [])
+        next_cursor = db_result.get("next_cursor")
     except LocationResolutionError as exc:
         errors[DataSource.db.value] = exc.message
     except Exception as exc:
         errors[DataSource.db.value] = f"Unexpected error: {exc}"
 
-    db_has_results = bool(aggregated_leads)
-
-    external_sources = [
-        src for src in _DEFAULT_EXTERNAL_SOURCES if src in _ALLOWED_EXTERNAL_SOURCES
-    ]
-    blocking_sources: List[DataSource] = []
-    background_sources: List[DataSource] = []
-    for source in external_sources:
-        if source not in _ALLOWED_EXTERNAL_SOURCES:
-            errors[source.value] = "Unsupported source requested."
-            continue
-        if source == DataSource.gpt:
-            background_sources.append(source)
-            continue
-        if db_has_results:
-            background_sources.append(source)
-        else:
-            blocking_sources.append(source)
+    blocking_sources, background_sources = _plan_external_sources(
+        request, bool(aggregated_leads)
+    )
 
     if blocking_sources:
-        max_workers = max(1, min(len(blocking_sources), len(_ALLOWED_EXTERNAL_SOURCES)))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {
-                executor.submit(
-                    _search_and_persist_external_source, request, source
-                ): source
-                for source in blocking_sources
-            }
-            for future in as_completed(future_map):
-                source = future_map[future]
-                try:
-                    persistence = future.result()
-                    external_persistence[source.value] = persistence
-                except LocationResolutionError as exc:
-                    errors[source.value] = exc.message
-                except ExternalProviderError as exc:
-                    errors[source.value] = (
-                        f"External provider request failed: {exc.message}"
-                    )
-                except Exception as exc:
-                    errors[source.value] = f"Unexpected error: {exc}"
+        outcomes = await fan_out(
+            _blocking_calls(request, blocking_sources),
+            _SEARCH_DEADLINE_SECONDS,
+            _PROVIDER_BUDGET_SECONDS,
+        )
+        for outcome in outcomes.values():
+            _record_outcome(outcome, external_persistence, errors)
+            provider_deadlines[outcome.name] = outcome.summary()
 
+        # The providers just wrote to the primary; a replica may not have their leads yet.
         try:
-            db_result = _perform_db_search(request, db)
+            async with AsyncSessionLocal() as primary_db:
+                db_result = await _perform_db_search(request, primary_db)
             aggregated_leads = db_result.get("leads", [])
+            next_cursor = db_result.get("next_cursor")
         except LocationResolutionError as exc:
             errors[DataSource.db.value] = exc.message
         except Exception as exc:
             errors[DataSource.db.value] = f"Unexpected error: {exc}"
 
     if background_sources:
-        for source in background_sources:
-            background_tasks.add_task(_background_source_search, request, source)
-            external_persistence[source.value] = {"status": "queued"}
+        _queue_background_sources(
+            request, background_sources, background_tasks, external_persistence
+        )
 
     response: Dict[str, object] = {
         "aggregated_leads": aggregated_leads,
+        "next_cursor": next_cursor,
     }
     if external_persistence:
         response["external_persistence"] = external_persistence
 
+    if provider_deadlines:
+        response["provider_deadlines"] = provider_deadlines
+
     if errors:
         response["errors"] = errors
 
     return response
+
+
+def _ndjson_event(event: Dict[str, object]) -> str:
+    return json.dumps(jsonable_encoder(event)) + "\n"
+
+
+async def _new_leads_in_radius(
+    db: AsyncSession, db_result: Dict[str, object], inserted_ids: List[int]
+) -> List[Dict[str, object]]:
+    location = db_result.get("normalized_location") or {}
+    center_lat = _coerce_float(location.get("latitude"))
+    center_lon = _coerce_float(location.get("longitude"))
+    if not inserted_ids or center_lat is None or center_lon is None:
+        return []
+    inserted = set(inserted_ids)
+    hits = [
+        hit
+        for hit in (await ensure_lead_index_async()).query_radius(
+            center_lat, center_lon, db_result["radius_miles"]
+        )
+        if hit[0] in inserted
+    ]
+    return await _serialize_hits(db, hits)
+
+
+async def _stream_search_events(
+    request: LeadSearchRequest, background_tasks: BackgroundTasks
+) -> AsyncIterator[str]:
+    """
+    Yield the NDJSON events of a streaming search: the DB hits first, one event per
+    blocking provider as it completes or runs out of budget (with the leads it newly
+    persisted inside the search radius), then a summary.
+    """
+    errors: Dict[str, str] = {}
+    external_persistence: Dict[str, Dict[str, object]] = {}
+    provider_deadlines: Dict[str, Dict[str, object]] = {}
+    # DB hits come from a read replica; newly persisted provider leads from the primary.
+    async with async_read_session_factory()() as db, AsyncSessionLocal() as primary_db:
+        db_result: Dict[str, object] = {}
+        try:
+            db_result = await _perform_db_search(request, db)
+        except LocationResolutionError as exc:
+            errors[DataSource.db.value] = exc.message
+        except Exception as exc:
+            errors[DataSource.db.value] = f"Unexpected error: {exc}"
+
+        db_leads = db_result.get("leads", [])
+        yield _ndjson_event(
+            {
+                "event": "db",
+                "leads": db_leads,
+                "normalized_location": db_result.get("normalized_location"),
+                "radius_miles": db_result.get("radius_miles"),
+                "total_in_radius": db_result.get("total_in_radius"),
+                "next_cursor": db_result.get("next_cursor"),
+            }
+        )
+
+        blocking_sources, background_sources = _plan_external_sources(
+            request, bool(db_leads)
+        )
+
+        async for outcome in fan_out_as_completed(
+            _blocking_calls(request, blocking_sources),
+            _SEARCH_DEADLINE_SECONDS,
+            _PROVIDER_BUDGET_SECONDS,
+        ):
+            inserted_ids = _record_outcome(outcome, external_persistence, errors)
+            provider_deadlines[outcome.name] = outcome.summary()
+            event: Dict[str, object] = {
+                "event": "provider",
+                "source": outcome.name,
+                **outcome.summary(),
+            }
+            if outcome.name in errors:
+                event["error"] = errors[outcome.name]
+            else:
+                event["persistence"] = external_persistence[outcome.name]
+            event["leads"] = await _new_leads_in_radius(primary_db, db_result, inserted_ids)
+            yield _ndjson_event(event)
+
+        if background_sources:
+            _queue_background_sources(
+                request, background_sources, background_tasks, external_persistence
+            )
+
+        yield _ndjson_event(
+            {
+                "event": "summary",
+                "external_persistence": external_persistence,
+                "provider_deadlines": provider_deadlines,
+                "errors": errors,
+            }
+        )
+
+
+@router.post(
+    "/searchLeads/stream",
+    summary="Search Lead Combined (streaming)",
+    tags=["Search Lead"],
+    response_class=StreamingResponse,
+)
+def search_leads_stream(
+    request: LeadSearchRequest,
+    background_tasks: BackgroundTasks,
+):
+    """
+    Streaming variant of /searchLeads. Emits newline-delimited JSON events so the DB
+    hits arrive immediately instead of after the slowest provider:
+
+    - `{"event": "db", "leads": [...], "normalized_location": ..., "radius_miles": ...,
+      "total_in_radius": ..., "next_cursor": ...}`
+    - `{"event": "provider", "source": ..., "status": ..., "met_deadline": ...,
+      "persistence": {...}, "leads": [...]}` per blocking provider as it completes or
+      runs out of budget (`error` instead of `persistence` on failure)
+    - `{"event": "summary", "external_persistence": {...}, "provider_deadlines": {...},
+      "errors": {...}}`
+    """
+    _validate_search_cursor(request)
+    return StreamingResponse(
+        _stream_search_events(request, background_tasks),
+        media_type="application/x-ndjson",
+        background=background_tasks,
+    )
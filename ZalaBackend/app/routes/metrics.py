@@ -0,0 +1,89 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.db.slow_queries import slow_query_log
+from app.db.session import async_engine, async_replica_engines, engine, replica_engines
+from app.routes.location_filter import external_search_flight
+from app.services.search_cache import search_cache
+from app.utils.geocode import geocode_flight
+from app.utils.geocode_cache import geocode_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# The slow query log holds SQL text (and, if enabled, bound parameters), so it is only
+# served when an admin token is configured and sent as X-Admin-Token.
+METRICS_ADMIN_TOKEN = os.getenv("METRICS_ADMIN_TOKEN", "")
+
+
+def _require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    if not METRICS_ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, METRICS_ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.get("/geocode-cache", summary="Geocode Cache Stats")
+def geocode_cache_stats():
+    """
+    Hit/miss counters and size of the shared geocode cache for this worker.
+    """
+    return geocode_cache.stats()
+
+
+@router.get("/search-cache", summary="Search Result Cache Stats")
+def search_cache_stats():
+    """
+    Hit ratio, invalidation counts and approximate memory use of the DB search cache.
+    """
+    return search_cache.stats()
+
+
+@router.get("/single-flight", summary="Single-Flight Stats")
+def single_flight_stats():
+    """
+    Executed vs coalesced counts for the geocode and external search single-flight groups.
+    """
+    return [geocode_flight.stats(), external_search_flight.stats()]
+
+
+@router.get("/db-pool", summary="Database Pool Stats")
+def db_pool_stats():
+    """
+    Checked-out connections, overflow use and checkout wait histogram for this worker's
+    sync and async engines, on the primary and on each read replica.
+    """
+    return {
+        "sync": engine.pool.stats(),
+        "async": async_engine.pool.stats(),
+        "replicas": [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "sync": replica.pool.stats(),
+                "async": async_replica.pool.stats(),
+            }
+            for replica, async_replica in zip(replica_engines, async_replica_engines)
+        ],
+    }
+
+
+@router.get("/slow-queries", summary="Slow Query Log", dependencies=[Depends(_require_admin_token)])
+def slow_queries():
+    """
+    Statements slower than SLOW_QUERY_MS in this worker, newest first, with the route
+    that ran them and their captured EXPLAIN plan. Requires X-Admin-Token.
+    """
+    return {"stats": slow_query_log.stats(), "entries": slow_query_log.entries()}
+
+
+@router.delete(
+    "/slow-queries",
+    summary="Clear Slow Query Log",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(_require_admin_token)],
+)
+def clear_slow_queries():
+    slow_query_log.clear()
+    return None
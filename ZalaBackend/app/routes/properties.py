@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.db.crud import property as property_crud
 from app.schemas.property import PropertyCreate, PropertyUpdate, PropertyPublic
 
@@ -15,12 +15,12 @@ def create_property(address_id: int, property_in: PropertyCreate, db: Session =
 
 
 @router.get("/", response_model=List[PropertyPublic])
-def read_properties(address_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_properties(address_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     return property_crud.get_properties(db=db, address_id=address_id, skip=skip, limit=limit)
 
 
 @router.get("/{property_id}", response_model=PropertyPublic)
-def read_property(address_id: int, property_id: int, db: Session = Depends(get_db)):
+def read_property(address_id: int, property_id: int, db: Session = Depends(get_read_db)):
     db_property = property_crud.get_property(db=db, address_id=address_id, property_id=property_id)
     if not db_property:
         raise HTTPException(status_code=404, detail="Property not found")
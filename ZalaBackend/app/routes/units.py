@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.db.crud import unit as unit_crud
 from app.schemas.unit import UnitCreate, UnitUpdate, UnitPublic
 
@@ -17,12 +17,12 @@ def create_unit(property_id: int, unit_in: UnitCreate, db: Session = Depends(get
 
 
 @router.get("/", response_model=List[UnitPublic])
-def read_units(property_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_units(property_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     return unit_crud.get_units(db=db, property_id=property_id, skip=skip, limit=limit)
 
 
 @router.get("/{unit_id}", response_model=UnitPublic)
-def read_unit(property_id: int, unit_id: int, db: Session = Depends(get_db)):
+def read_unit(property_id: int, unit_id: int, db: Session = Depends(get_read_db)):
     db_unit = unit_crud.get_unit(db=db, property_id=property_id, unit_id=unit_id)
     if not db_unit:
         raise HTTPException(status_code=404, detail="Unit not found")
@@ -1,11 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.query_stats import sql_budget
 from app.db.crud import user as user_crud
 from app.db.crud import contact as contact_crud
 from app import schemas
+from app.utils.pagination import CURSOR_DESCRIPTION, page_response
 from typing import List
 from app import schemas as _schemas
 
@@ -56,22 +58,25 @@ def signup_user(
 
 
 @router.get("/",tags=["Users"], response_model=List[schemas.UserPublic])
+@sql_budget(2)
 def read_users(
+        response: Response,
         skip: int = 0,
         limit: int = 100,
-        db: Session = Depends(get_db)
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+        db: Session = Depends(get_read_db)
 ):
     """
-    Retrieve a list of users.
+    Retrieve a list of users in id order. The next page's cursor is in X-Next-Cursor.
     """
-    users = user_crud.get_users(db, skip=skip, limit=limit)
-    return users
+    page = user_crud.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page)
 
 
 @router.get("/batch", tags=["Users"], response_model=List[schemas.UserPublic])
 def read_users_by_ids(
         ids: List[int] = Query(..., description="List of user IDs to retrieve"),
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
 ):
     """
     Retrieve multiple users by providing a list of IDs.
@@ -99,7 +104,7 @@ def read_users_by_ids(
 @router.get("/{user_id}", tags=["Users"], response_model=schemas.UserPublic)
 def read_user_by_id(
         user_id: int,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db)
 ):
     """
     Retrieve a single user by their ID, including their leads and properties.
@@ -132,7 +137,7 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     return None
 
 @router.get("/{user_id}/contact", response_model=_schemas.ContactPublic, summary="Read Contact for User By Id", tags=["User Contact Link"])
-def read_user_contact(user_id: int, db: Session = Depends(get_db)):
+def read_user_contact(user_id: int, db: Session = Depends(get_read_db)):
     """Get the contact record associated with a user."""
     contact = user_crud.get_contact_for_user(db, user_id=user_id)
     if contact is None:
@@ -161,7 +166,7 @@ def unlink_contact(user_id: int, contact_id: int, db: Session = Depends(get_db))
     return db_user
 
 @router.get("/{user_id}/properties", response_model=List[schemas.PropertyPublic], summary="Read Properties Linked To User By Id", tags=["User Properties Link"])
-def read_user_properties(user_id: int, db: Session = Depends(get_db)):
+def read_user_properties(user_id: int, db: Session = Depends(get_read_db)):
     """Return the list of properties assigned to a user (agent)."""
     db_user = user_crud.get_user_by_id(db, user_id=user_id)
     if db_user is None:
@@ -9,7 +9,16 @@ from .user import (
     UserSummary
 )
 from .unit import UnitBase, UnitCreate, UnitUpdate, UnitPublic
-from .lead import LeadBase, LeadCreate, LeadUpdate, LeadPublic
+from .lead import (
+    LeadBase,
+    LeadCreate,
+    LeadCompositeCreate,
+    LeadBatchCreate,
+    LeadUpdate,
+    LeadPublic,
+    LeadListItem,
+    LeadView,
+)
 from .login import Login, GoogleLogin
 from .campaign import CampaignBase, CampaignCreate, CampaignUpdate, CampaignPublic
 from .campaign_email import (
@@ -21,6 +30,8 @@ from .campaign_email import (
     CampaignEmailUpdate,
     CampaignEmailPublic,
     CampaignEmailStatus,
+    CampaignMessageDailyStats,
+    CampaignMessageStats,
     ContactMethod,
 )
 from .gmail import GmailSendRequest, GmailSendResponse
@@ -29,6 +40,9 @@ from .campaign_lead import (
     CampaignLeadCreate,
     CampaignLeadUpdate,
     CampaignLeadPublic,
+    CampaignLeadsBulkAdd,
+    CampaignLeadsBulkResult,
+    LeadRadiusFilter,
     CampaignLeadDetailedPublic,
 )
 from .location import LocationFilter, DataSource
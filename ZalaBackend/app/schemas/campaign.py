@@ -38,7 +38,14 @@ class CampaignPublic(CampaignBase):
 
     campaign_id: int
     user: Optional[UserPublic] = None
-    leads: List["CampaignLeadPublic"] = []
+
+    # Membership totals; the members themselves are paged from
+    # GET /campaigns/{campaign_id}/leads.
+    lead_count: int = 0
+    contacted_count: int = 0
+    email_contacted_count: int = 0
+    phone_contacted_count: int = 0
+    sms_contacted_count: int = 0
 
     class Config:
         from_attributes = True
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import List, Optional
 
@@ -102,3 +102,29 @@ class CampaignEmailSendResult(BaseModel):
 class CampaignEmailSendResponse(BaseModel):
     campaign: CampaignPublic
     results: List[CampaignEmailSendResult]
+
+
+class CampaignMessageDailyStats(BaseModel):
+    """
+    Message counts of one campaign on one UTC day.
+    """
+
+    day: date
+    total_count: int
+    sent_count: int
+    failed_count: int
+
+    class Config:
+        from_attributes = True
+
+
+class CampaignMessageStats(BaseModel):
+    """
+    Message counts of a campaign over a date range, from the daily rollups.
+    """
+
+    campaign_id: int
+    total_count: int
+    sent_count: int
+    failed_count: int
+    days: List[CampaignMessageDailyStats]
@@ -1,6 +1,6 @@
 from typing import Optional, List
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, Field, computed_field, model_validator
 
 from .campaign import CampaignPublic
 from .lead import LeadPublic
@@ -23,6 +23,48 @@ class CampaignLeadCreate(BaseModel):
     lead_id: int
 
 
+class LeadRadiusFilter(BaseModel):
+    """
+    Leads with a point within `radius_miles` of a place: `location_text` is geocoded
+    like a lead search, or pass `lat`/`lon` directly.
+    """
+    location_text: Optional[str] = None
+    lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    lon: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius_miles: float = Field(..., gt=0, le=250)
+
+    @model_validator(mode="after")
+    def _require_center(self):
+        if not self.location_text and (self.lat is None or self.lon is None):
+            raise ValueError("Either location_text or both lat and lon must be provided.")
+        return self
+
+
+class CampaignLeadsBulkAdd(BaseModel):
+    """
+    Schema for adding many leads to a campaign at once. Leads must match every given
+    filter.
+    """
+    lead_ids: Optional[List[int]] = None
+    within: Optional[LeadRadiusFilter] = None
+
+    @model_validator(mode="after")
+    def _require_filter(self):
+        if self.lead_ids is None and self.within is None:
+            raise ValueError("Either lead_ids or within must be provided.")
+        return self
+
+
+class CampaignLeadsBulkResult(BaseModel):
+    """
+    Outcome of a bulk add: leads matching the filters and how many were new to the
+    campaign.
+    """
+    campaign_id: int
+    matched: int
+    added: int
+
+
 class CampaignLeadUpdate(BaseModel):
     """
     Schema for update a CampaignLead
@@ -1,9 +1,10 @@
+from enum import Enum
 from typing import Optional, List
 
 from pydantic import BaseModel, Field
 
-from app.schemas.address import AddressPublic
-from app.schemas.contact import ContactPublic
+from app.schemas.address import AddressCreate, AddressPublic
+from app.schemas.contact import ContactCreate, ContactPublic
 from app.schemas.summaries import UserSummary
 from app.schemas.property import PropertyPublic
 
@@ -18,10 +19,37 @@ class LeadBase(BaseModel):
     notes: Optional[str] = None
 
 
+class LeadView(str, Enum):
+    """
+    Shape of the rows returned by GET /leads.
+    """
+    full = "full"
+    summary = "summary"
+
+
 class LeadCreate(LeadBase):
     """
     Schema for Create a Lead.
     """
+
+
+class LeadCompositeCreate(LeadBase):
+    """
+    Schema for creating a Lead together with its new contact and address, linked to
+    its creator, in one request (POST /leads/composite).
+    """
+    contact: Optional[ContactCreate] = None
+    address: Optional[AddressCreate] = None
+    created_by: Optional[int] = None
+
+
+class LeadBatchCreate(BaseModel):
+    """
+    Schema for creating many composite Leads in one transaction (POST /leads/batch).
+    """
+    leads: List[LeadCompositeCreate] = Field(..., min_length=1, max_length=500)
+
+
 class LeadUpdate(BaseModel):
     """
     Schema for Updating a Lead
@@ -54,3 +82,26 @@ class LeadPublic(LeadBase):
     class Config:
         from_attributes = True
 
+
+class LeadListItem(BaseModel):
+    """
+    Flat lead row for list views (GET /leads?view=summary): the lead, its contact and
+    its city, read with a single column-only query.
+    """
+    lead_id: int
+    person_type: Optional[str] = None
+    business: Optional[str] = None
+    website: Optional[str] = None
+    created_by: Optional[int] = None
+    contact_id: Optional[int] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    address_id: Optional[int] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zipcode: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,6 @@
 from enum import Enum
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -16,5 +18,10 @@ class LocationFilter(BaseModel):
 class LeadSearchRequest(LocationFilter):
     """
     Combined lead search request supporting multiple data sources.
+
+    DB results are returned nearest first, `page_size` at a time; pass the previous
+    response's `next_cursor` as `cursor` to fetch the next page.
     """
-    pass
+    radius_miles: float = Field(default=50.0, gt=0, le=250)
+    page_size: int = Field(default=100, ge=1, le=500)
+    cursor: Optional[str] = None
@@ -0,0 +1,262 @@
+"""
+In-process spatial index of lead coordinates.
+
+Every lead contributes one point per geocoded address it owns (its own address plus
+the address of each linked property). Points are bucketed into a fixed-degree grid so
+radius queries only look at the handful of cells around the search center instead of
+running bounding-box scans against `addresses` on every search.
+"""
+import asyncio
+import os
+import time
+from math import floor
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.address import Address
+from app.models.lead import Lead
+from app.models.property import Property
+from app.services.search_cache import search_cache
+from app.utils.distance import bounding_box, rank_by_distance
+
+Point = Tuple[float, float]
+Cell = Tuple[int, int]
+
+_CELL_DEGREES = float(os.getenv("LEAD_INDEX_CELL_DEGREES", "0.25"))
+# Each uvicorn worker keeps its own copy; a periodic reload picks up writes made by
+# other workers or directly in the database.
+_REFRESH_SECONDS = float(os.getenv("LEAD_INDEX_REFRESH_SECONDS", "300"))
+
+
+class LeadSpatialIndex:
+    """
+    Fixed-degree grid of (lead_id, lat, lon) points.
+    """
+
+    def __init__(self, cell_degrees: float = _CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Cell, Set[Tuple[int, float, float]]] = {}
+        self._points: Dict[int, List[Point]] = {}
+        self._lock = Lock()
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def is_stale(self, max_age_seconds: float = _REFRESH_SECONDS) -> bool:
+        if self.loaded_at is None:
+            return True
+        return time.monotonic() - self.loaded_at > max_age_seconds
+
+    def _cell_for(self, lat: float, lon: float) -> Cell:
+        return (floor(lat / self.cell_degrees), floor(lon / self.cell_degrees))
+
+    def load(self, rows: Iterable[Tuple[int, float, float]]) -> None:
+        """
+        Replace the whole index with the given (lead_id, lat, lon) rows.
+        """
+        cells: Dict[Cell, Set[Tuple[int, float, float]]] = {}
+        points: Dict[int, List[Point]] = {}
+        for lead_id, lat, lon in rows:
+            entry = (lead_id, float(lat), float(lon))
+            cells.setdefault(self._cell_for(entry[1], entry[2]), set()).add(entry)
+            points.setdefault(lead_id, []).append((entry[1], entry[2]))
+
+        with self._lock:
+            self._cells = cells
+            self._points = points
+            self.loaded_at = time.monotonic()
+
+    def _discard_locked(self, lead_id: int) -> None:
+        for lat, lon in self._points.pop(lead_id, []):
+            cell = self._cell_for(lat, lon)
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                continue
+            bucket.discard((lead_id, lat, lon))
+            if not bucket:
+                del self._cells[cell]
+
+    def replace_lead(self, lead_id: int, points: Sequence[Point]) -> None:
+        """
+        Set the points of a single lead, dropping whatever was indexed for it before.
+        """
+        with self._lock:
+            self._discard_locked(lead_id)
+            if not points:
+                return
+            normalized = [(float(lat), float(lon)) for lat, lon in points]
+            self._points[lead_id] = normalized
+            for lat, lon in normalized:
+                self._cells.setdefault(self._cell_for(lat, lon), set()).add(
+                    (lead_id, lat, lon)
+                )
+
+    def remove_lead(self, lead_id: int) -> None:
+        with self._lock:
+            self._discard_locked(lead_id)
+
+    def query_radius(
+        self, lat: float, lon: float, radius_miles: float
+    ) -> List[Tuple[int, float]]:
+        """
+        Return (lead_id, distance_miles) for every lead with at least one point inside
+        the radius, using the closest point per lead, ordered by (distance, lead_id).
+        """
+        lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_miles)
+        row_min, col_min = self._cell_for(lat_min, lon_min)
+        row_max, col_max = self._cell_for(lat_max, lon_max)
+
+        candidates: List[Tuple[int, float, float]] = []
+        with self._lock:
+            for row in range(row_min, row_max + 1):
+                for col in range(col_min, col_max + 1):
+                    bucket = self._cells.get((row, col))
+                    if bucket:
+                        candidates.extend(bucket)
+
+        if not candidates:
+            return []
+
+        lead_ids, lats, lons = zip(*candidates)
+        ranking = rank_by_distance(lat, lon, lats, lons, radius_miles, groups=lead_ids)
+        return [
+            (int(ranking.groups[idx]), float(ranking.distances[idx]))
+            for idx in ranking.order
+        ]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "leads": len(self._points),
+                "points": sum(len(points) for points in self._points.values()),
+                "cells": len(self._cells),
+                "cell_degrees": self.cell_degrees,
+                "age_seconds": (
+                    round(time.monotonic() - self.loaded_at, 1)
+                    if self.loaded_at is not None
+                    else None
+                ),
+            }
+
+
+lead_index = LeadSpatialIndex()
+_reload_lock = Lock()
+
+
+def _point_rows(
+    db: Session, lead_ids: Optional[Sequence[int]] = None
+) -> List[Tuple[int, float, float]]:
+    lead_points = (
+        select(Lead.lead_id, Address.lat, Address.long)
+        .join(Address, Lead.address_id == Address.address_id)
+        .where(Address.lat.isnot(None), Address.long.isnot(None))
+    )
+    property_points = (
+        select(Property.lead_id, Address.lat, Address.long)
+        .join(Address, Property.address_id == Address.address_id)
+        .where(
+            Property.lead_id.isnot(None),
+            Address.lat.isnot(None),
+            Address.long.isnot(None),
+        )
+    )
+    if lead_ids is not None:
+        lead_points = lead_points.where(Lead.lead_id.in_(lead_ids))
+        property_points = property_points.where(Property.lead_id.in_(lead_ids))
+
+    return [
+        (row[0], float(row[1]), float(row[2]))
+        for row in db.execute(union_all(lead_points, property_points)).all()
+    ]
+
+
+def load_lead_index(db: Session) -> None:
+    """
+    Bulk-load every lead point from the database.
+    """
+    lead_index.load(_point_rows(db))
+
+
+def warm_lead_index() -> None:
+    """
+    Load the index with a dedicated session (used on application startup).
+    """
+    session = SessionLocal()
+    try:
+        load_lead_index(session)
+    finally:
+        session.close()
+
+
+def ensure_lead_index(db: Session) -> LeadSpatialIndex:
+    """
+    Return the index, loading it on first use and reloading it once it goes stale.
+    """
+    if not lead_index.is_loaded:
+        with _reload_lock:
+            if not lead_index.is_loaded:
+                load_lead_index(db)
+    elif lead_index.is_stale() and _reload_lock.acquire(blocking=False):
+        # Serve from the current snapshot while a single caller reloads.
+        try:
+            load_lead_index(db)
+        finally:
+            _reload_lock.release()
+    return lead_index
+
+
+async def ensure_lead_index_async() -> LeadSpatialIndex:
+    """
+    ensure_lead_index for async routes: a (re)load runs on a worker thread with its
+    own sync session instead of blocking the event loop.
+    """
+    if lead_index.is_loaded and not lead_index.is_stale():
+        return lead_index
+
+    def _ensure() -> LeadSpatialIndex:
+        session = SessionLocal()
+        try:
+            return ensure_lead_index(session)
+        finally:
+            session.close()
+
+    return await asyncio.to_thread(_ensure)
+
+
+def refresh_leads(db: Session, lead_ids: Iterable[Optional[int]]) -> None:
+    """
+    Re-read the points of the given leads after a write touched their addresses, and
+    drop cached searches that contained them or now cover their new points.
+    """
+    ids = sorted({lead_id for lead_id in lead_ids if lead_id is not None})
+    if not ids:
+        return
+    search_cache.invalidate_leads(ids)
+    if not lead_index.is_loaded:
+        return
+
+    grouped: Dict[int, List[Point]] = {lead_id: [] for lead_id in ids}
+    for lead_id, lat, lon in _point_rows(db, ids):
+        grouped[lead_id].append((lat, lon))
+    for lead_id, points in grouped.items():
+        lead_index.replace_lead(lead_id, points)
+    search_cache.invalidate_points(
+        [point for points in grouped.values() for point in points]
+    )
+
+
+def leads_for_address(db: Session, address_id: int) -> List[int]:
+    """
+    Lead ids whose indexed points depend on the given address.
+    """
+    lead_ids = select(Lead.lead_id).where(Lead.address_id == address_id)
+    property_lead_ids = select(Property.lead_id).where(
+        Property.address_id == address_id, Property.lead_id.isnot(None)
+    )
+    return [row[0] for row in db.execute(union_all(lead_ids, property_lead_ids)).all()]
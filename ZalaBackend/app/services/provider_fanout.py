@@ -0,0 +1,127 @@
+"""
+Deadline-aware fan-out of blocking provider calls.
+
+Each provider call runs on a dedicated thread pool and is awaited with asyncio for at
+most its own budget, capped by the overall request deadline. Calls that miss their
+budget are not cancelled: they keep running (and persisting) on the pool, and their
+eventual outcome is only logged.
+
+Each call runs in a copy of the caller's context, so the request's SQL accounting
+(`app.db.query_stats`) and slow query log see the statements the providers issue.
+Statements a straggler runs after its request has responded are not in that request's
+headers or budget check.
+"""
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PROVIDER_FANOUT_WORKERS", "16")),
+    thread_name_prefix="provider-fanout",
+)
+
+COMPLETED = "completed"
+FAILED = "failed"
+DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+class ProviderOutcome:
+    """
+    What a single provider call produced by the time it was awaited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        elapsed_seconds: float,
+        budget_seconds: float,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ):
+        self.name = name
+        self.status = status
+        self.elapsed_seconds = elapsed_seconds
+        self.budget_seconds = budget_seconds
+        self.result = result
+        self.error = error
+
+    @property
+    def met_deadline(self) -> bool:
+        return self.status != DEADLINE_EXCEEDED
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "status": self.status,
+            "met_deadline": self.met_deadline,
+            "elapsed_ms": int(self.elapsed_seconds * 1000),
+            "budget_ms": int(self.budget_seconds * 1000),
+        }
+
+
+def _log_straggler(name: str, started: float) -> Callable[[Future], None]:
+    # Runs on the worker thread, so it fires even if the request's event loop is gone.
+    def _done(future: Future) -> None:
+        elapsed = time.monotonic() - started
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Provider {name} failed after missing its deadline ({elapsed:.1f}s): {error}")
+        else:
+            print(f"Provider {name} finished after missing its deadline ({elapsed:.1f}s)")
+
+    return _done
+
+
+async def fan_out_as_completed(
+    calls: Dict[str, Callable[[], Any]],
+    deadline_seconds: float,
+    budgets: Optional[Dict[str, float]] = None,
+) -> AsyncIterator[ProviderOutcome]:
+    """
+    Start every call at once and yield a ProviderOutcome for each as soon as it
+    completes, fails, or runs out of budget.
+    """
+    if not calls:
+        return
+
+    started = time.monotonic()
+    budgets = budgets or {}
+
+    async def _await(name: str, future: Future) -> ProviderOutcome:
+        budget = min(budgets.get(name, deadline_seconds), deadline_seconds)
+        try:
+            # shield() keeps the underlying call alive when wait_for times out.
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), budget)
+            return ProviderOutcome(name, COMPLETED, time.monotonic() - started, budget, result=result)
+        except asyncio.TimeoutError:
+            future.add_done_callback(_log_straggler(name, started))
+            return ProviderOutcome(name, DEADLINE_EXCEEDED, time.monotonic() - started, budget)
+        except Exception as exc:
+            return ProviderOutcome(name, FAILED, time.monotonic() - started, budget, error=exc)
+
+    # One context copy per call: a Context cannot be entered by two threads at once.
+    waiters = [
+        asyncio.ensure_future(_await(name, _executor.submit(contextvars.copy_context().run, call)))
+        for name, call in calls.items()
+    ]
+    for waiter in asyncio.as_completed(waiters):
+        yield await waiter
+
+
+async def fan_out(
+    calls: Dict[str, Callable[[], Any]],
+    deadline_seconds: float,
+    budgets: Optional[Dict[str, float]] = None,
+) -> Dict[str, ProviderOutcome]:
+    """
+    Run every call concurrently and return once each has completed or hit its budget.
+    """
+    return {
+        outcome.name: outcome
+        async for outcome in fan_out_as_completed(calls, deadline_seconds, budgets)
+    }
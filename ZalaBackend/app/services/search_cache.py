@@ -0,0 +1,208 @@
+"""
+In-process cache of serialized DB search results.
+
+Entries are keyed by the normalized location text, radius and page, and remember the
+search center plus the ids of the leads they contain. Writes invalidate precisely: a change to
+a lead drops only the entries that contain it, and a new or moved lead point drops only
+the entries whose circle covers it. A TTL bounds staleness from writes made by other
+workers, and the cache is bounded by entry count and approximate payload bytes.
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.utils.distance import haversine
+from app.utils.geocode_cache import normalize_query
+
+Point = Tuple[float, float]
+
+
+class _Entry:
+    __slots__ = ("center", "radius_miles", "lead_ids", "payload", "size_bytes", "expires_at")
+
+    def __init__(self, center, radius_miles, lead_ids, payload, size_bytes, expires_at):
+        self.center = center
+        self.radius_miles = radius_miles
+        self.lead_ids = lead_ids
+        self.payload = payload
+        self.size_bytes = size_bytes
+        self.expires_at = expires_at
+
+
+def search_key(
+    location_text: str,
+    radius_miles: float,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> str:
+    return (
+        f"{normalize_query(location_text)}|{float(radius_miles):g}"
+        f"|{page_size}|{cursor or ''}"
+    )
+
+
+class SearchResultCache:
+    """
+    LRU of search payloads with lead- and point-based invalidation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 300,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_lead: Dict[int, Set[str]] = {}
+        self._bytes = 0
+        # Bumped by every invalidation so results computed across a write are not stored.
+        self._generation = 0
+        self._lock = Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "stale_stores_skipped": 0,
+            "invalidations": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size_bytes
+        for lead_id in entry.lead_ids:
+            keys = self._by_lead.get(lead_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_lead[lead_id]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at < time.monotonic():
+                self._drop_locked(key)
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return dict(entry.payload)
+
+    def put(
+        self,
+        key: str,
+        center: Point,
+        radius_miles: float,
+        lead_ids: Iterable[int],
+        payload: Dict[str, Any],
+        generation: int,
+    ) -> None:
+        """
+        Store a payload computed while the cache was at `generation`; the store is
+        skipped if anything was invalidated in the meantime.
+        """
+        size_bytes = len(json.dumps(payload, default=str))
+        if size_bytes > self.max_bytes:
+            return
+        entry = _Entry(
+            center,
+            radius_miles,
+            frozenset(lead_ids),
+            payload,
+            size_bytes,
+            time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            if generation != self._generation:
+                self._counters["stale_stores_skipped"] += 1
+                return
+            self._drop_locked(key)
+            self._entries[key] = entry
+            self._bytes += size_bytes
+            for lead_id in entry.lead_ids:
+                self._by_lead.setdefault(lead_id, set()).add(key)
+            self._counters["stores"] += 1
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._drop_locked(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate_leads(self, lead_ids: Iterable[Optional[int]]) -> None:
+        """
+        Drop every entry that contains one of the given leads.
+        """
+        with self._lock:
+            self._generation += 1
+            keys: Set[str] = set()
+            for lead_id in lead_ids:
+                if lead_id is not None:
+                    keys |= self._by_lead.get(lead_id, set())
+            for key in keys:
+                self._drop_locked(key)
+            self._counters["invalidations"] += len(keys)
+
+    def invalidate_points(self, points: Iterable[Point]) -> None:
+        """
+        Drop every entry whose search circle covers one of the given points.
+        """
+        points = [(float(lat), float(lon)) for lat, lon in points]
+        with self._lock:
+            self._generation += 1
+            if not points:
+                return
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if any(
+                    haversine(entry.center[0], entry.center[1], lat, lon)
+                    <= entry.radius_miles
+                    for lat, lon in points
+                )
+            ]
+            for key in keys:
+                self._drop_locked(key)
+            self._counters["invalidations"] += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_lead.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+            size_bytes = self._bytes
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else None,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "bytes": size_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+search_cache = SearchResultCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300")),
+)
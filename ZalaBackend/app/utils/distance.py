@@ -0,0 +1,113 @@
+from math import atan2, cos, radians, sin, sqrt
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, cast, func
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Compute miles between two lat/long pairs."""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = (
+        sin(dlat / 2) ** 2
+        + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    )
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return EARTH_RADIUS_MILES * c
+
+
+def bounding_box(
+    lat: float, lon: float, radius_miles: float
+) -> Tuple[float, float, float, float]:
+    """
+    Return (lat_min, lat_max, lon_min, lon_max) for a square that encloses the radius.
+    """
+    lat_delta = radius_miles / 69.0
+    lon_denominator = max(0.0001, cos(radians(lat)) * 69.172)
+    lon_delta = radius_miles / lon_denominator
+    return lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta
+
+
+class DistanceRanking(NamedTuple):
+    """
+    Result of a batched distance pass.
+
+    `distances` and `groups` are aligned (one entry per candidate, or per group when
+    candidates were reduced by owner); `order` holds the indices of the entries that
+    passed the radius filter, nearest first.
+    """
+
+    distances: np.ndarray
+    within_radius: np.ndarray
+    order: np.ndarray
+    groups: Optional[np.ndarray] = None
+
+
+def haversine_many(
+    lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]
+) -> np.ndarray:
+    """
+    Vectorized haversine from one origin to many points. Missing coordinates (None/NaN)
+    produce NaN distances.
+    """
+    lat_arr = np.radians(np.asarray(lats, dtype=np.float64))
+    lon_arr = np.radians(np.asarray(lons, dtype=np.float64))
+    origin_lat = radians(lat)
+    dlat = lat_arr - origin_lat
+    dlon = lon_arr - radians(lon)
+    a = np.sin(dlat / 2) ** 2 + cos(origin_lat) * np.cos(lat_arr) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def rank_by_distance(
+    lat: float,
+    lon: float,
+    lats: Sequence[float],
+    lons: Sequence[float],
+    radius_miles: float,
+    groups: Optional[Sequence[int]] = None,
+    keep_missing: bool = False,
+) -> DistanceRanking:
+    """
+    Compute distances, the radius mask and the nearest-first order in one pass.
+
+    When `groups` is given (e.g. the owning lead id of each point) the distances are
+    reduced to the minimum per group before filtering, and ties are ordered by group.
+    With `keep_missing`, entries without coordinates pass the filter and sort last.
+    """
+    distances = haversine_many(lat, lon, lats, lons)
+    unique_groups = None
+    if groups is not None:
+        unique_groups, inverse = np.unique(np.asarray(groups), return_inverse=True)
+        reduced = np.full(len(unique_groups), np.nan)
+        # fmin ignores NaN, so a group only stays NaN when none of its points has coordinates.
+        np.fmin.at(reduced, inverse, distances)
+        distances = reduced
+
+    missing = np.isnan(distances)
+    within = np.zeros(len(distances), dtype=bool)
+    within[~missing] = distances[~missing] <= radius_miles
+    if keep_missing:
+        within |= missing
+
+    # A stable sort keeps input (or group id) order for ties and puts NaN last.
+    order = np.argsort(distances, kind="stable")
+    order = order[within[order]]
+    return DistanceRanking(distances, within, order, unique_groups)
+
+
+def haversine_sql(lat_column, lon_column, lat: float, lon: float):
+    """
+    SQL expression for the miles from (lat, lon) to each row's coordinates, matching
+    `haversine`, so radius predicates can run inside the database.
+    """
+    row_lat = func.radians(cast(lat_column, Float))
+    dlat = row_lat - radians(lat)
+    dlon = func.radians(cast(lon_column, Float)) - radians(lon)
+    a = func.power(func.sin(dlat / 2), 2) + cos(radians(lat)) * func.cos(row_lat) * func.power(
+        func.sin(dlon / 2), 2
+    )
+    return EARTH_RADIUS_MILES * 2 * func.asin(func.least(1.0, func.sqrt(a)))
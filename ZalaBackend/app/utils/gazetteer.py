@@ -0,0 +1,169 @@
+"""
+Offline ZIP-code and city/state centroid lookups.
+
+Both tables ship as NumPy structured arrays in `app/data` and are memory-mapped on
+first use, so resolving "77002" or "Houston, TX" costs a binary search and no network
+I/O. Regenerate them with `python scripts/build_gazetteer.py`.
+"""
+import re
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ZIP_TABLE_PATH = DATA_DIR / "zip_centroids.npy"
+CITY_TABLE_PATH = DATA_DIR / "city_centroids.npy"
+
+ZIP_DTYPE = np.dtype([("zip", "S5"), ("lat", "<f4"), ("lon", "<f4"), ("city", "<u4")])
+CITY_DTYPE = np.dtype(
+    [
+        ("key", "S32"),
+        ("city", "S32"),
+        ("state", "S2"),
+        ("lat", "<f4"),
+        ("lon", "<f4"),
+    ]
+)
+
+STATE_NAMES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
+    "california": "CA", "colorado": "CO", "connecticut": "CT", "delaware": "DE",
+    "district of columbia": "DC", "florida": "FL", "georgia": "GA", "hawaii": "HI",
+    "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA", "kansas": "KS",
+    "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK",
+    "oregon": "OR", "pennsylvania": "PA", "puerto rico": "PR", "rhode island": "RI",
+    "south carolina": "SC", "south dakota": "SD", "tennessee": "TN", "texas": "TX",
+    "utah": "UT", "vermont": "VT", "virginia": "VA", "washington": "WA",
+    "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+_STATE_CODES = set(STATE_NAMES.values()) | {"AS", "GU", "MP", "VI", "AA", "AE", "AP"}
+
+_ZIP_RE = re.compile(r"^\s*(\d{5})(?:-\d{4})?\s*$")
+_COUNTRY_SUFFIX_RE = re.compile(r"[,\s]\s*(?:usa|us|united states)\.?\s*$", re.IGNORECASE)
+_CITY_PREFIXES = (("st ", "saint "), ("ste ", "sainte "), ("ft ", "fort "), ("mt ", "mount "))
+
+_tables: Optional[Tuple[np.ndarray, np.ndarray]] = None
+_tables_lock = Lock()
+
+
+def city_key(city: str, state: str) -> str:
+    """
+    Normalized "<city>|<st>" key used to sort and search the city table.
+    """
+    name = re.sub(r"[.']", "", city.lower())
+    name = re.sub(r"[\s\-]+", " ", name).strip()
+    for short, full in _CITY_PREFIXES:
+        if name.startswith(short):
+            name = full + name[len(short):]
+            break
+    return f"{name}|{state.strip().lower()}"
+
+
+def normalize_state(value: str) -> Optional[str]:
+    cleaned = re.sub(r"[.]", "", value).strip()
+    if cleaned.upper() in _STATE_CODES:
+        return cleaned.upper()
+    return STATE_NAMES.get(re.sub(r"\s+", " ", cleaned.lower()))
+
+
+def _split_city_state(text: str) -> Optional[Tuple[str, str]]:
+    if "," in text:
+        city, state = text.rsplit(",", 1)
+        return city.strip(), state.strip()
+    tokens = text.split()
+    # State names run up to three words ("district of columbia").
+    for size in (3, 2, 1):
+        if len(tokens) > size and normalize_state(" ".join(tokens[-size:])):
+            return " ".join(tokens[:-size]), " ".join(tokens[-size:])
+    return None
+
+
+def _load_tables() -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                if not ZIP_TABLE_PATH.exists() or not CITY_TABLE_PATH.exists():
+                    return None
+                _tables = (
+                    np.load(ZIP_TABLE_PATH, mmap_mode="r"),
+                    np.load(CITY_TABLE_PATH, mmap_mode="r"),
+                )
+    return _tables
+
+
+def _search(column: np.ndarray, value: bytes) -> Optional[int]:
+    idx = int(np.searchsorted(column, value))
+    if idx < len(column) and column[idx] == value:
+        return idx
+    return None
+
+
+def _as_location(row, zip_code: Optional[str]) -> Dict[str, object]:
+    return {
+        "latitude": round(float(row["lat"]), 6),
+        "longitude": round(float(row["lon"]), 6),
+        "city": row["city"].decode(),
+        "state": row["state"].decode(),
+        "zip": zip_code,
+    }
+
+
+def lookup_zip(zip_code: str) -> Optional[Dict[str, object]]:
+    """
+    Centroid of a 5-digit ZIP code, shaped like `geocode_location` results.
+    """
+    tables = _load_tables()
+    match = _ZIP_RE.match(zip_code or "")
+    if tables is None or not match:
+        return None
+    zips, cities = tables
+    idx = _search(zips["zip"], match.group(1).encode())
+    if idx is None:
+        return None
+    row = zips[idx]
+    location = _as_location(cities[int(row["city"])], match.group(1))
+    # ZIP centroids are more precise than the city centroid they belong to.
+    location["latitude"] = round(float(row["lat"]), 6)
+    location["longitude"] = round(float(row["lon"]), 6)
+    return location
+
+
+def lookup_city(city: str, state: str) -> Optional[Dict[str, object]]:
+    """
+    Centroid of a city, averaged over its ZIP codes.
+    """
+    tables = _load_tables()
+    state_code = normalize_state(state)
+    if tables is None or not state_code:
+        return None
+    cities = tables[1]
+    key = city_key(city, state_code).encode()
+    if len(key) > CITY_DTYPE["key"].itemsize:
+        return None
+    idx = _search(cities["key"], key)
+    if idx is None:
+        return None
+    return _as_location(cities[idx], None)
+
+
+def resolve(text: Optional[str]) -> Optional[Dict[str, object]]:
+    """
+    Resolve a bare ZIP or a "City, ST" / "City, State" string offline; returns None
+    for anything else (street addresses, free-form text) so callers can fall back to
+    a network geocoder.
+    """
+    if not text:
+        return None
+    if _ZIP_RE.match(text):
+        return lookup_zip(text)
+    parts = _split_city_state(_COUNTRY_SUFFIX_RE.sub("", text.strip()))
+    if not parts or not parts[0]:
+        return None
+    return lookup_city(*parts)
@@ -1,14 +1,45 @@
 import requests
 import os
 
+from app.utils.geocode_cache import cache_key, geocode_cache
+from app.utils.single_flight import SingleFlight
+
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-def geocode_location(text: str):
+# Concurrent cache misses for the same query share one upstream request.
+geocode_flight = SingleFlight("geocode")
+
+class GeocodeUnavailable(RuntimeError):
+    """
+    Geocoding failed for a reason other than the address not existing (quota, auth,
+    server error, missing key). Raised inside the cache fetch so it is never cached.
+    """
+
+def _request_geocode(params: dict):
+    """
+    Return the Geocoding API response, or None for ZERO_RESULTS (cached as a failure).
+    """
+    if not GOOGLE_API_KEY:
+        raise GeocodeUnavailable("GOOGLE_API_KEY is not set")
     url = f"https://maps.googleapis.com/maps/api/geocode/json"
-    params = {"address": text, "key": GOOGLE_API_KEY}
-    response = requests.get(url, params=params).json()
+    response = requests.get(url, params={**params, "key": GOOGLE_API_KEY}).json()
 
+    if response["status"] == "ZERO_RESULTS":
+        return None
     if response["status"] != "OK":
+        raise GeocodeUnavailable(response.get("error_message") or f"Geocoding status={response['status']}")
+    return response
+
+def _cached_geocode(key: str, fetch):
+    try:
+        return geocode_flight.do(key, lambda: geocode_cache.get_or_fetch(key, fetch))
+    except GeocodeUnavailable as exc:
+        print(f"Geocoding unavailable for {key}: {exc}")
+        return None
+
+def _fetch_geocode(text: str):
+    response = _request_geocode({"address": text})
+    if response is None:
         return None
 
     result = response["results"][0]
@@ -23,12 +54,13 @@ def geocode_location(text: str):
         "zip": components.get("postal_code")
     }
 
-def reverse_geocode(lat: float, lng: float):
-    url = f"https://maps.googleapis.com/maps/api/geocode/json"
-    params = {"latlng": f"{lat},{lng}", "key": GOOGLE_API_KEY}
-    response = requests.get(url, params=params).json()
+def geocode_location(text: str):
+    key = cache_key("address", text)
+    return _cached_geocode(key, lambda: _fetch_geocode(text))
 
-    if response["status"] != "OK":
+def _fetch_reverse_geocode(lat: float, lng: float):
+    response = _request_geocode({"latlng": f"{lat},{lng}"})
+    if response is None:
         return None
 
     result = response["results"][0]
@@ -40,4 +72,8 @@ def reverse_geocode(lat: float, lng: float):
         "city": components.get("locality"),
         "state": components.get("administrative_area_level_1"),
         "zip": components.get("postal_code")
-    }
\ No newline at end of file
+    }
+
+def reverse_geocode(lat: float, lng: float):
+    key = cache_key("reverse", f"{lat:.5f},{lng:.5f}")
+    return _cached_geocode(key, lambda: _fetch_reverse_geocode(lat, lng))
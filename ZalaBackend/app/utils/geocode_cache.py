@@ -0,0 +1,193 @@
+"""
+Two-tier cache shared by every geocoder in the app.
+
+Lookups go to an in-memory LRU first and then to a SQLite file, so results survive
+restarts and are shared between uvicorn workers on the same host. Successful results
+live for GEOCODE_CACHE_TTL_SECONDS; addresses the geocoder found nothing for (a `None`
+value) are remembered for the much shorter GEOCODE_CACHE_NEGATIVE_TTL_SECONDS so a bad
+query is not retried on every request. Transient and auth failures must be raised by
+the fetch instead, so they are not cached.
+
+The SQLite file defaults to the system temp directory, outside the source tree.
+"""
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_DEFAULT_PATH = Path(tempfile.gettempdir()) / "zala_geocode_cache.sqlite3"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_COMMA_RE = re.compile(r"\s*,\s*")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize free-form location text so trivially different spellings share a key.
+    """
+    normalized = _WHITESPACE_RE.sub(" ", (text or "").strip().lower())
+    normalized = _COMMA_RE.sub(", ", normalized)
+    return normalized.strip(" ,.")
+
+
+def cache_key(namespace: str, text: str) -> str:
+    return f"{namespace}:{normalize_query(text)}"
+
+
+class GeocodeCache:
+    """
+    In-memory LRU in front of an on-disk SQLite store, with TTLs and negative caching.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = _DEFAULT_PATH,
+        max_memory_entries: int = 2048,
+        ttl_seconds: float = 30 * 24 * 3600,
+        negative_ttl_seconds: float = 600,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_disabled = path is None
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "disk_errors": 0,
+        }
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._disk_disabled:
+            return None
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM geocode_cache WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _disk_failed(self, exc: sqlite3.Error) -> None:
+        # A broken cache file must never break geocoding; fall back to memory only.
+        self._counters["disk_errors"] += 1
+        self._disk_disabled = True
+        print(f"Geocode cache disk tier disabled: {exc}")
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """
+        Return (found, value). A found `None` value is a cached failure.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] >= now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    if entry[1] is None:
+                        self._counters["negative_hits"] += 1
+                    return True, entry[1]
+                del self._memory[key]
+
+            try:
+                conn = self._connection()
+                row = (
+                    conn.execute(
+                        "SELECT value, expires_at FROM geocode_cache WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                    if conn
+                    else None
+                )
+            except sqlite3.Error as exc:
+                self._disk_failed(exc)
+                row = None
+
+            if row is not None and row[1] >= now:
+                value = json.loads(row[0]) if row[0] is not None else None
+                self._remember(key, row[1], value)
+                self._counters["disk_hits"] += 1
+                if value is None:
+                    self._counters["negative_hits"] += 1
+                return True, value
+
+            self._counters["misses"] += 1
+            return False, None
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Cache a result; `None` records a failure with the negative TTL.
+        """
+        ttl = self.negative_ttl_seconds if value is None else self.ttl_seconds
+        expires_at = time.time() + ttl
+        encoded = json.dumps(value) if value is not None else None
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._counters["stores"] += 1
+            try:
+                conn = self._connection()
+                if conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO geocode_cache (key, value, expires_at) "
+                        "VALUES (?, ?, ?)",
+                        (key, encoded, expires_at),
+                    )
+                    conn.commit()
+            except sqlite3.Error as exc:
+                self._disk_failed(exc)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached value or call `fetch` and cache what it returns. Exceptions
+        raised by `fetch` (network errors, timeouts) are not cached.
+        """
+        found, value = self.lookup(key)
+        if found:
+            return value
+        value = fetch()
+        self.store(key, value)
+        return value
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": memory_entries,
+            "disk_enabled": not self._disk_disabled,
+        }
+
+
+geocode_cache = GeocodeCache(
+    path=Path(os.getenv("GEOCODE_CACHE_PATH", str(_DEFAULT_PATH))),
+    max_memory_entries=int(os.getenv("GEOCODE_CACHE_MEMORY_ENTRIES", "2048")),
+    ttl_seconds=float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600))),
+    negative_ttl_seconds=float(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", "600")),
+)
@@ -0,0 +1,98 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the URL-safe base64 of a small JSON object holding the sort key of the
+last row a client has seen; the next page starts strictly after that key.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import DateTime, Integer, tuple_
+
+# List endpoints keep returning plain JSON arrays and hand out the cursor here.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+CURSOR_DESCRIPTION = (
+    "Opaque cursor from the previous page's X-Next-Cursor header; "
+    "omit it for the first page. When a cursor is given, skip is ignored"
+)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that was not produced by encode_cursor."""
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+    if not isinstance(values, dict):
+        raise InvalidCursorError("Malformed pagination cursor")
+    return values
+
+
+class KeysetPage(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def _cursor_value(key, value):
+    if isinstance(key.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(key.type, Integer):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(f"Expected an integer for {key.key}")
+    return value
+
+
+def keyset_filter(query, keys: Sequence[Any], cursor: Optional[str], skip: int = 0):
+    """
+    Order a Query or select() by `keys` (mapped attributes, unique together) and
+    restrict it to rows after `cursor`, or skip the first `skip` rows when there is no
+    cursor; the cursor already says where the page starts, so the two never stack.
+    Callers fetch `limit + 1` rows and pass them to keyset_page, which uses the extra
+    row to decide whether there is a next page.
+    """
+    query = query.order_by(*keys)
+    if not cursor:
+        return query.offset(skip) if skip else query
+
+    values = decode_cursor(cursor)
+    try:
+        after = [_cursor_value(key, values[key.key]) for key in keys]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+    if len(keys) == 1:
+        return query.where(keys[0] > after[0])
+    return query.where(tuple_(*keys) > tuple_(*after))
+
+
+def keyset_page(rows: Sequence[Any], keys: Sequence[Any], limit: int) -> KeysetPage:
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return KeysetPage(items, None)
+
+    last = items[-1]
+    values = {}
+    for key in keys:
+        value = getattr(last, key.key)
+        values[key.key] = value.isoformat() if isinstance(value, datetime) else value
+    return KeysetPage(items, encode_cursor(values))
+
+
+def page_response(response, page: KeysetPage) -> List[Any]:
+    """
+    Put the page's next cursor (if any) in the response headers and return its rows.
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
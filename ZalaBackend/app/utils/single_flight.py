@@ -0,0 +1,81 @@
+"""
+Coalesce identical concurrent calls into a single execution.
+
+The first caller for a key runs the function; callers that arrive while it is still
+running block until it finishes and receive the same result (or the same exception).
+Nothing is cached once the call completes.
+"""
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-based single-flight group keyed by strings.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._lock = Lock()
+        self._counters = {"executions": 0, "coalesced": 0, "skipped": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` for `key`, or wait for the in-flight run and share its outcome.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._counters["executions"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def record_skip(self) -> None:
+        """
+        Count a caller that chose not to start or join a run because one was in flight.
+        """
+        with self._lock:
+            self._counters["skipped"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "name": self.name,
+                **self._counters,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,73 @@
+"""
+Streaming row readers for uploaded CSV and XLSX files.
+
+Both readers yield lists of at most `batch_size` row dicts keyed by normalized header,
+so the caller holds one batch at a time no matter how large the upload is. CSV goes
+through pandas' chunked parser, XLSX through openpyxl's read-only row iterator. Cells
+are read as text (CSV) or as stored (XLSX) instead of having pandas infer a dtype per
+chunk, so a phone or ZIP column never turns into floats in some batches and not others.
+Blank rows are skipped, as pandas does for CSV.
+"""
+import io
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from openpyxl import load_workbook
+
+Row = Dict[str, Any]
+
+
+def normalize_header(name: Any) -> str:
+    return str(name if name is not None else "").strip().lower().replace(" ", "_")
+
+
+def _is_blank(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    return isinstance(value, float) and pd.isna(value)
+
+
+def iter_csv_batches(fileobj: IO[bytes], batch_size: int) -> Iterator[List[Row]]:
+    # utf-8-sig drops the byte order mark Excel puts in front of the first header.
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        with pd.read_csv(text, dtype=str, chunksize=batch_size) as chunks:
+            for chunk in chunks:
+                chunk.columns = [normalize_header(col) for col in chunk.columns]
+                yield chunk.to_dict(orient="records")
+    finally:
+        # Leave the upload open for its owner.
+        text.detach()
+
+
+def iter_xlsx_batches(fileobj: IO[bytes], batch_size: int) -> Iterator[List[Row]]:
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers: Optional[Sequence[str]] = None
+        batch: List[Row] = []
+        for values in rows:
+            if headers is None:
+                headers = [normalize_header(value) for value in values]
+                continue
+            if all(_is_blank(value) for value in values):
+                continue
+            batch.append(dict(zip(headers, values)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        workbook.close()
+
+
+def iter_row_batches(fileobj: IO[bytes], filename: str, batch_size: int) -> Iterator[List[Row]]:
+    """
+    Batches of row dicts from an uploaded .csv or .xlsx file.
+    """
+    if filename.lower().endswith(".xlsx"):
+        return iter_xlsx_batches(fileobj, batch_size)
+    return iter_csv_batches(fileobj, batch_size)
@@ -0,0 +1,77 @@
+"""
+Rebuild the bundled ZIP and city/state centroid tables in app/data.
+
+The source dataset comes from the `zipcodes` package (MIT licensed), which is only
+needed to run this script:
+
+    pip install zipcodes
+    python scripts/build_gazetteer.py
+"""
+import sys
+import os
+from collections import defaultdict
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+import numpy as np
+import zipcodes
+
+from app.utils.gazetteer import (
+    CITY_DTYPE,
+    CITY_TABLE_PATH,
+    DATA_DIR,
+    ZIP_DTYPE,
+    ZIP_TABLE_PATH,
+    city_key,
+)
+
+
+def main():
+    records = []
+    for entry in zipcodes.list_all():
+        try:
+            lat = float(entry["lat"])
+            lon = float(entry["long"])
+        except (TypeError, ValueError):
+            continue
+        if lat == 0 and lon == 0:
+            continue
+        records.append((entry, lat, lon))
+
+    # City centroids average the city's standard (street delivery) ZIPs, falling back
+    # to every ZIP type for places that only have PO boxes.
+    grouped = defaultdict(lambda: {"standard": [], "all": [], "names": defaultdict(int)})
+    for entry, lat, lon in records:
+        key = city_key(entry["city"], entry["state"])
+        group = grouped[key]
+        group["all"].append((lat, lon))
+        if entry["zip_code_type"] == "STANDARD":
+            group["standard"].append((lat, lon))
+        group["names"][(entry["city"], entry["state"])] += 1
+
+    city_keys = sorted(grouped)
+    cities = np.zeros(len(city_keys), dtype=CITY_DTYPE)
+    city_index = {}
+    for idx, key in enumerate(city_keys):
+        group = grouped[key]
+        points = np.array(group["standard"] or group["all"])
+        city, state = max(group["names"].items(), key=lambda item: item[1])[0]
+        cities[idx] = (key.encode(), city.encode(), state.encode(), *points.mean(axis=0))
+        city_index[key] = idx
+
+    records.sort(key=lambda item: item[0]["zip_code"])
+    zips = np.zeros(len(records), dtype=ZIP_DTYPE)
+    for idx, (entry, lat, lon) in enumerate(records):
+        key = city_key(entry["city"], entry["state"])
+        zips[idx] = (entry["zip_code"].encode(), lat, lon, city_index[key])
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    np.save(ZIP_TABLE_PATH, zips)
+    np.save(CITY_TABLE_PATH, cities)
+    print(f"Wrote {len(zips)} ZIP codes to {ZIP_TABLE_PATH}")
+    print(f"Wrote {len(cities)} cities to {CITY_TABLE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Verify that the hot lookup queries can be served by their indexes.
+
+Runs EXPLAIN for each query with sequential scans disabled (small development tables
+would otherwise always be scanned) and fails if the expected index does not appear in
+the plan. Run after `scripts/initialize_db.py`; exits non-zero on any miss.
+"""
+import sys
+import os
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+CHECKS = [
+    (
+        "Bounding-box lead search",
+        "SELECT address_id FROM addresses "
+        "WHERE lat BETWEEN 29.5 AND 30.1 AND long BETWEEN -95.8 AND -95.0",
+        "ix_addresses_lat_long",
+    ),
+    (
+        "Properties of a lead",
+        "SELECT property_id FROM properties WHERE lead_id = 1",
+        "ix_properties_lead_id",
+    ),
+    (
+        "Leads created by a user",
+        "SELECT lead_id FROM leads WHERE created_by = 1",
+        "ix_leads_created_by",
+    ),
+    (
+        "Campaigns of a lead",
+        "SELECT campaign_id FROM campaign_leads WHERE lead_id = 1",
+        "ix_campaign_leads_lead_id",
+    ),
+    (
+        "Messages sent to a lead in a campaign",
+        "SELECT message_id FROM campaign_messages WHERE campaign_id = 1 AND lead_id = 1",
+        # Either campaign_id-leading index is a good plan for this lookup.
+        ("ix_campaign_messages_campaign_id_lead_id", "ix_campaign_messages_campaign_id_timestamp"),
+    ),
+    (
+        "Campaign message history page",
+        "SELECT message_id FROM campaign_messages WHERE campaign_id = 1 "
+        "AND (timestamp, message_id) > ('2024-01-01', 1) "
+        "ORDER BY timestamp, message_id LIMIT 101",
+        "ix_campaign_messages_campaign_id_timestamp",
+    ),
+    (
+        "Contact dedupe by email",
+        "SELECT contact_id FROM contacts WHERE email_normalized = 'owner@example.com'",
+        "ix_contacts_email_normalized",
+    ),
+    (
+        "Contact dedupe by phone",
+        "SELECT contact_id FROM contacts WHERE phone_digits = '5551234567'",
+        "ix_contacts_phone_digits",
+    ),
+]
+
+
+def _index_names(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+def _parent_index_names(connection, names: set) -> set:
+    """
+    Map indexes of partitions (e.g. of campaign_messages) to the partitioned index they
+    were created from, which is the name the checks expect.
+    """
+    if not names:
+        return names
+    parents = connection.execute(
+        text(
+            "SELECT child.relname, parent.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE child.relname = ANY(:names)"
+        ),
+        {"names": list(names)},
+    ).all()
+    mapped = dict(parents)
+    return {mapped.get(name, name) for name in names}
+
+
+def main():
+    failures = 0
+    with engine.connect() as connection:
+        connection.execute(text("SET enable_seqscan = off"))
+        for description, query, expected in CHECKS:
+            expected = (expected,) if isinstance(expected, str) else expected
+            plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}")).scalar()[0]["Plan"]
+            used = _parent_index_names(connection, _index_names(plan))
+            ok = bool(used.intersection(expected))
+            failures += not ok
+            found = ", ".join(sorted(used)) or plan["Node Type"]
+            print(
+                f"[{'ok' if ok else 'MISSING'}] {description}: "
+                f"expected {' or '.join(expected)}, plan uses {found}"
+            )
+        connection.rollback()
+
+    if failures:
+        print(f"{failures} quer{'y' if failures == 1 else 'ies'} not using the expected index.")
+        sys.exit(1)
+    print("All query plans use their indexes.")
+
+
+if __name__ == "__main__":
+    main()
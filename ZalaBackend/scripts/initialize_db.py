@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 
@@ -8,8 +9,16 @@ from app.db.session import init_db
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Create or upgrade the database schema.")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Drop every table before migrating (deletes all data).",
+    )
+    args = parser.parse_args()
+
     print("Initializing database...")
-    init_db()
+    init_db(reset=args.reset)
     print("Database initialization complete.")
 
 
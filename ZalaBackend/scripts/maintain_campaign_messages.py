@@ -0,0 +1,52 @@
+"""
+Create upcoming campaign_messages partitions and archive expired ones.
+
+Run daily (e.g. from cron); it is idempotent. The API also creates upcoming partitions at
+startup, so archiving is the part that needs the schedule.
+"""
+import argparse
+import sys
+import os
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from app.db.partitions import (
+    MONTHS_AHEAD,
+    RETENTION_MONTHS,
+    archive_message_partitions,
+    ensure_message_partitions,
+)
+from app.db.session import engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the monthly campaign message partitions.")
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=MONTHS_AHEAD,
+        help=f"Months of partitions to keep ready beyond the current one (default {MONTHS_AHEAD}).",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=RETENTION_MONTHS,
+        help=f"Months kept in the live table before archiving (default {RETENTION_MONTHS}).",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Only create upcoming partitions.",
+    )
+    args = parser.parse_args()
+
+    created = ensure_message_partitions(engine, months_ahead=args.months_ahead)
+    archived = [] if args.no_archive else archive_message_partitions(
+        engine, retention_months=args.retention_months
+    )
+    print(f"Created {len(created)} partition(s), archived {len(archived)}.")
+
+
+if __name__ == "__main__":
+    main()
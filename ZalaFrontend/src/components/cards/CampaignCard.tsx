@@ -10,9 +10,6 @@ type CampaignCardProps = {
 
 export const CampaignCard = ({ campaign, onClick }: CampaignCardProps) => {
   const [_isHovered, hoverProps] = useHover({ onClick });
-  const contactedLeads = campaign.leads.filter(
-    (lead) => lead.contactMethods.length > 0
-  );
   return (
     <div
       {...hoverProps}
@@ -25,20 +22,16 @@ export const CampaignCard = ({ campaign, onClick }: CampaignCardProps) => {
       <div>
         <p className="text-xl font-bold">{campaign.campaignName}</p>
         <p className="text-base text-secondary-50">
-          {contactedLeads.length} of {campaign.leads.length} Leads Contacted
+          {campaign.contactedCount} of {campaign.leadCount} Leads Contacted
         </p>
       </div>
       <div className="w-full h-[15px] rounded-[15px] bg-offwhite flex flex-row overflow-hidden">
-        {campaign.leads
-          .sort((a, b) => b.contactMethods.length - a.contactMethods.length)
-          .map((lead) => (
-            <div
-              style={{ flex: 1 / campaign.leads.length }}
-              className={clsx(
-                lead.contactMethods.length > 0 ? "bg-accent h-full" : ""
-              )}
-            />
-          ))}
+        {campaign.contactedCount > 0 && (
+          <div
+            style={{ flex: campaign.contactedCount / campaign.leadCount }}
+            className="bg-accent h-full"
+          />
+        )}
       </div>
     </div>
   );
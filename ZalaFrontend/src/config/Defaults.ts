@@ -4,6 +4,8 @@ const DEFAULT_CAMPAIGN: ICampaign = {
   campaignId: 0,
   userId: 0,
   campaignName: "",
+  leadCount: 0,
+  contactedCount: 0,
   leads: [],
 };
 
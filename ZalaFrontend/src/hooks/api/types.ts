@@ -3,6 +3,8 @@ import type { AContact, ILead } from "../../interfaces";
 export type APIResponse<T> = {
   data: T | null;
   err: string | null;
+  // Response headers of a successful request (e.g. X-Next-Cursor).
+  headers?: Headers;
 };
 
 export type SearchLeadsProps = {
@@ -1,12 +1,11 @@
 import {
   CampaignContactMethod,
-  type AAddress,
   type ACampaign,
   type ACampaignLead,
+  type ACampaignWithLeads,
   type AContact,
   type ALead,
   type AUser,
-  type IAddress,
   type ACampaignEmail,
   type ACampaignEmailSendResponse,
   type ACampaignSummary,
@@ -86,101 +85,72 @@ export const useApi = () => {
     });
   };
 
-  const createAddress = async ({ address }: { address: IAddress }) => {
-    return await post<AAddress>(
-      `/api/addresses/`,
-      {
-        street_1: address.street1,
-        street_2: address.street2,
-        city: address.city,
-        state: address.state,
-        zipcode: address.zipcode,
-        lat: address.lat,
-        long: address.long,
-      },
-      { isFormData: false, signal: getSignal("createAddress") }
-    );
-  };
-
   const createLead = async ({
     lead,
     createdById: _userId,
   }: CreateLeadProps): Promise<APIResponse<{ lead: ALead }>> => {
-    const errorOut = (msg: string | null, backup: string) => {
-      throw new Error(msg ?? backup);
-    };
-
-    const createData = async (): Promise<[ALead, AContact, AAddress]> => {
-      const leadRes = await post<ALead>(
-        `/api/leads`,
-        {
-          person_type: "person",
-          business: lead.buisness,
-          website: lead.website,
-          license_num: lead.licenseNum,
-          notes: lead.notes,
+    // One request: the backend creates the lead, contact and address and links
+    // them in a single transaction.
+    const res = await post<ALead>(
+      `/api/leads/composite`,
+      {
+        person_type: "person",
+        business: lead.buisness,
+        website: lead.website,
+        license_num: lead.licenseNum,
+        notes: lead.notes,
+        contact: {
+          ...lead.contact,
+          first_name: lead.contact.firstName,
+          last_name: lead.contact.lastName,
         },
-        { isFormData: false, signal: getSignal("createData") }
-      );
-      if (leadRes.err || !leadRes.data)
-        return errorOut(leadRes.err, "Creating lead api failed");
-      const apiLead = leadRes.data;
-
-      const contactRes = await createContact({
-        ...lead.contact,
-        first_name: lead.contact.firstName,
-        last_name: lead.contact.lastName,
-      });
-      if (contactRes.err || !contactRes.data)
-        return errorOut(contactRes.err, "Creating contact api failed");
-      const apiContact = contactRes.data;
-
-      const addressRes = await createAddress({ address: lead.address });
-      if (addressRes.err || !addressRes.data)
-        return errorOut(addressRes.err, "Creating address api failed");
-      const apiAddress = addressRes.data;
-
-      return [apiLead, apiContact, apiAddress];
-    };
+        address: {
+          street_1: lead.address.street1,
+          street_2: lead.address.street2,
+          city: lead.address.city,
+          state: lead.address.state,
+          zipcode: lead.address.zipcode,
+          lat: lead.address.lat,
+          long: lead.address.long,
+        },
+      },
+      { isFormData: false, signal: getSignal("createLead") }
+    );
+    if (res.err || !res.data)
+      return { err: res.err ?? "Internal error creating lead", data: null };
+    return { data: { lead: res.data }, err: null };
+  };
 
-    const connectData = async ([apiLead, apiContact, apiAddress]: [
-      ALead,
-      AContact,
-      AAddress
-    ]) => {
-      const contactRes = await linkContactToLead({
-        leadId: apiLead.lead_id,
-        contactId: apiContact.contact_id,
-      });
-      if (contactRes.err || !contactRes.data)
-        return errorOut(contactRes.err, "Contact link to lead api failed");
-
-      const addressRes = await linkAddressToLead({
-        leadId: apiLead.lead_id,
-        addressId: apiAddress.address_id,
-      });
-      if (addressRes.err || !addressRes.data)
-        return errorOut(addressRes.err, "Address link to lead api failed");
-
-      // const userRes = await linkUserToLead({
-      //   leadId: apiLead.lead_id,
-      //   userId: createdById,
-      // });
-      // if (userRes.err || !userRes.data)
-      //   return errorOut(contactRes.err, "User link to lead api failed");
-
-      return addressRes.data;
-    };
+  // Campaign responses only carry member counts; the campaign page needs every
+  // membership, so they are paged in from /api/campaigns/{id}/leads. Following
+  // X-Next-Cursor keeps each page an index seek, unlike ever deeper skips.
+  const getCampaignLeads = async (
+    campaignId: number | string
+  ): Promise<APIResponse<ACampaignLead[]>> => {
+    const pageSize = 1000;
+    const campaignLeads: ACampaignLead[] = [];
+    let cursor: string | null = null;
+    do {
+      const res: APIResponse<ACampaignLead[]> = await get<ACampaignLead[]>(
+        `/api/campaigns/${campaignId}/leads?limit=${pageSize}` +
+          (cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""),
+        getSignal("getCampaignLeads")
+      );
+      if (res.err || !res.data)
+        return { data: null, err: res.err ?? "Getting campaign leads failed" };
+      campaignLeads.push(...res.data);
+      cursor = res.headers?.get("X-Next-Cursor") ?? null;
+    } while (cursor);
+    return { data: campaignLeads, err: null };
+  };
 
-    try {
-      const createdParts = await createData();
-      const createdLead = await connectData(createdParts);
-      return { data: { lead: createdLead }, err: null };
-    } catch (e) {
-      if (e instanceof Error) return { err: e.message, data: null };
-      if (typeof e === "string") return { err: e, data: null };
-      return { err: "Internal error creating lead", data: null };
-    }
+  const withCampaignLeads = async (
+    res: APIResponse<ACampaign>
+  ): Promise<APIResponse<ACampaignWithLeads>> => {
+    if (res.err || !res.data) return { data: null, err: res.err };
+    const leadsRes = await getCampaignLeads(res.data.campaign_id);
+    if (leadsRes.err || !leadsRes.data) return { data: null, err: leadsRes.err };
+    return { data: { ...res.data, leads: leadsRes.data }, err: null };
   };
 
   const createCampaign = async ({
@@ -207,34 +177,6 @@ export const useApi = () => {
     );
   };
 
-  const linkContactToLead = async ({
-    leadId,
-    contactId,
-  }: {
-    leadId: number;
-    contactId: number;
-  }) => {
-    return await post<ALead>(
-      `/api/leads/${leadId}/contacts/${contactId}`,
-      {},
-      { isFormData: false, signal: getSignal("linkContactToLead") }
-    );
-  };
-
-  const linkAddressToLead = async ({
-    leadId,
-    addressId,
-  }: {
-    leadId: number;
-    addressId: number;
-  }) => {
-    return await post<ALead>(
-      `/api/leads/${leadId}/addresses/${addressId}`,
-      {},
-      { isFormData: false, signal: getSignal("linkAddressToLead") }
-    );
-  };
-
   const linkUserToLead = async ({
     leadId,
     userId,
@@ -311,9 +253,11 @@ export const useApi = () => {
     campaignId: number | string,
     _userId: number | string
   ) => {
-    return await get<ACampaign>(
-      `/api/campaigns/${campaignId}`,
-      getSignal("getCampaign")
+    return await withCampaignLeads(
+      await get<ACampaign>(
+        `/api/campaigns/${campaignId}`,
+        getSignal("getCampaign")
+      )
     );
   };
 
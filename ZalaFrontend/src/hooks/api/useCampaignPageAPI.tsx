@@ -3,6 +3,7 @@ import React, { useRef, useState } from "react";
 import {
   CampaignContactMethod,
   type ACampaign,
+  type ICampaign,
   type ILead,
 } from "../../interfaces";
 import { Normalizer } from "../../utils";
@@ -53,7 +54,13 @@ export const useCampaignPageAPI = ({
 
   useTimeoutEffect(
     () => {
-      if (campaign.campaignId === -1 && campaignId) {
+      // Campaigns handed over from other pages carry counts but no memberships;
+      // those are only paged in here.
+      if (
+        campaignId &&
+        (campaign.campaignId !== Number(campaignId) ||
+          campaign.leads.length !== campaign.leadCount)
+      ) {
         getCampaign();
       } else setCampaignLoading(false);
     },
@@ -119,7 +126,8 @@ export const useCampaignPageAPI = ({
     if (res.err || !res.data)
       return apiResponseError("updating campaign", res.err);
 
-    apiCampaignResponse(res.data);
+    // The title update does not change memberships; keep the loaded ones.
+    apiCampaignResponse(res.data, campaign.leads);
   };
 
   const updateLeadContactMethod = async (
@@ -133,7 +141,7 @@ export const useCampaignPageAPI = ({
 
     if (contactMethods.includes(method))
       contactMethods = contactMethods.filter((existing) => existing !== method);
-    else contactMethods.push(method);
+    else contactMethods = [...contactMethods, method];
 
     const res = await updateCampaignLead({
       campaignId: campaign.campaignId,
@@ -145,7 +153,20 @@ export const useCampaignPageAPI = ({
     if (res.err || !res.data)
       return apiResponseError("updating campaign lead", res.err);
 
-    await getCampaign(true);
+    // Patch the one membership instead of re-paging the whole campaign. Read
+    // the store directly: several of these run concurrently after a send.
+    const updated = Normalizer.APINormalizer.campaignLead(res.data);
+    const latest = useCampaignStore.getState().campaign;
+    const campaignLeads = latest.leads.map((lead) =>
+      lead.leadId === updated.leadId ? updated : lead
+    );
+    setCampaign({
+      ...latest,
+      leads: campaignLeads,
+      contactedCount: campaignLeads.filter(
+        (lead) => lead.contactMethods.length > 0
+      ).length,
+    });
   };
 
   const updateLeadNotes = async () => {
@@ -179,10 +200,13 @@ export const useCampaignPageAPI = ({
     );
   };
 
-  const apiCampaignResponse = (campaign: ACampaign) => {
+  const apiCampaignResponse = (
+    campaign: ACampaign,
+    leads?: ICampaign["leads"]
+  ) => {
     const apiCampaign = Normalizer.APINormalizer.campaign(campaign);
 
-    setCampaign(apiCampaign);
+    setCampaign(leads ? { ...apiCampaign, leads } : apiCampaign);
     setTitle(apiCampaign.campaignName);
   };
 
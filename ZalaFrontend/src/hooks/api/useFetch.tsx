@@ -19,9 +19,13 @@ export const useFetch = () => {
     Accept: "application/json",
   };
 
-  const requestSuccess = <T,>(json: unknown): APIResponse<T> => ({
+  const requestSuccess = <T,>(
+    json: unknown,
+    headers: Headers
+  ): APIResponse<T> => ({
     data: json as T,
     err: null,
+    headers,
   });
 
   const requestError = <T,>(err: unknown): APIResponse<T> => ({
@@ -74,7 +78,7 @@ export const useFetch = () => {
           parsed?.err ?? parsed?.error ?? "Error communicating with API"
         );
 
-      return requestSuccess<T>(parsed as T);
+      return requestSuccess<T>(parsed as T, response.headers);
     } catch (err) {
       return requestError<T>(err);
     }
@@ -1,5 +1,9 @@
 import { useState } from "react";
-import type { ILead, IUser } from "../../../interfaces";
+import {
+  CampaignContactMethod,
+  type ILead,
+  type IUser,
+} from "../../../interfaces";
 import { useAuthStore, useCampaignStore } from "../../../stores";
 import { contactFullName, Normalizer } from "../../../utils";
 import { useApi } from "../../api";
@@ -66,12 +70,33 @@ export const useEmailModal = ({ leads, onSendEmail }: UseEmailModalProps) => {
     if (res.err || !res.data)
       return apiResponseError("sending campaign email", res.err);
 
-    const campaign = Normalizer.APINormalizer.campaign(res.data.campaign);
-    setCampaign(campaign);
-
     const emailResults = res.data.results.map(
       Normalizer.APINormalizer.campaignEmailSendResult
     );
+
+    // The response only carries counts; mark the delivered leads as emailed
+    // in the memberships already loaded rather than re-paging them all.
+    const emailed = new Set(
+      emailResults
+        .filter((email) => email.status !== "failed")
+        .map((email) => email.leadId)
+    );
+    const campaign = Normalizer.APINormalizer.campaign(res.data.campaign);
+    setCampaign({
+      ...campaign,
+      leads: globalCampaign.leads.map((lead) =>
+        emailed.has(lead.leadId) &&
+        !lead.contactMethods.includes(CampaignContactMethod.Email)
+          ? {
+              ...lead,
+              contactMethods: [
+                ...lead.contactMethods,
+                CampaignContactMethod.Email,
+              ],
+            }
+          : lead
+      ),
+    });
     const failedResults = emailResults.filter(
       (email) => email.status === "failed"
     );
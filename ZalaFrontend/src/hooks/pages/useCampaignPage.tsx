@@ -88,7 +88,6 @@ export const useCampaignPage = () => {
       );
       setShowEmail(false);
       successMsg(`Email${leads.length > 1 ? "s" : ""} delivered successfully!`);
-      await getCampaign(true);
     })();
 
   const selectAll = () => {
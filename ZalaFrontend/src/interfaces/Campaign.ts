@@ -25,9 +25,16 @@ export type ACampaign = {
   user_id: number;
   campaign_id: number;
   user: AUser;
-  leads: ACampaignLead[]; // define separately if leads have structure
+  lead_count: number;
+  contacted_count: number;
+  email_contacted_count: number;
+  phone_contacted_count: number;
+  sms_contacted_count: number;
 };
 
+// A campaign with its memberships, paged in from /api/campaigns/{id}/leads.
+export type ACampaignWithLeads = ACampaign & { leads: ACampaignLead[] };
+
 export type ICampaignLead = {
   leadId: number;
   campaignId: number;
@@ -42,6 +49,8 @@ export type ICampaign = {
   user?: IUser;
 
   campaignName: string;
+  leadCount: number;
+  contactedCount: number;
   leads: ICampaignLead[];
 };
 
@@ -56,5 +65,7 @@ export const DEFAULT_CAMPAIGN: ICampaign = {
   userId: -1,
 
   campaignName: "",
+  leadCount: 0,
+  contactedCount: 0,
   leads: [],
 };
@@ -89,12 +89,16 @@ const campaignLead = (data: ACampaignLead): ICampaignLead => {
   };
 };
 
-const campaign = (data: ACampaign): ICampaign => {
+const campaign = (
+  data: ACampaign & { leads?: ACampaignLead[] }
+): ICampaign => {
   return {
     campaignId: data["campaign_id"],
     userId: data["user_id"],
     campaignName: data["campaign_name"],
-    leads: data["leads"].map(campaignLead),
+    leadCount: data["lead_count"],
+    contactedCount: data["contacted_count"],
+    leads: (data["leads"] ?? []).map(campaignLead),
   };
 };
 
@@ -148,6 +152,7 @@ export const APINormalizer = {
   lead,
   sourceLead,
   campaign,
+  campaignLead,
   campaignEmail,
   campaignEmailSendResult,
 };